@@ -0,0 +1,66 @@
+"""
+CPU cost of decoding OpenGIN relation responses.
+
+Compares the old path (stdlib json + Relation.model_validate per item) with the fast
+decoder, trusted model_construct, and the raw-bytes batch validation OpenGINService uses.
+
+Run from the repository root:
+
+    BASE_URL_QUERY=http://localhost python -m benchmarks.decode_benchmark [relations] [repeats]
+"""
+import json
+import sys
+import time
+from src.models.organisation_schemas import Relation
+from src.services.opengin_service import OpenGINService
+from src.utils.json_codec import JSON_DECODER, json_loads
+
+
+def make_payload(count: int) -> bytes:
+    relations = [
+        {
+            "id": f"relation_{index}",
+            "relatedEntityId": f"entity_{index}",
+            "name": "AS_MINISTER",
+            "startTime": "2019-12-10T00:00:00Z",
+            "endTime": "2022-07-22T00:00:00Z",
+            "direction": "OUTGOING",
+            "activeAt": "",
+        }
+        for index in range(count)
+    ]
+    return json.dumps(relations).encode()
+
+
+def measure(name: str, decode, payload: bytes, repeats: int, count: int) -> float:
+    started_at = time.process_time()
+    for _ in range(repeats):
+        decode(payload)
+    cpu_ms = (time.process_time() - started_at) * 1000 / repeats / (count / 1000)
+    print(f"{name:<45} {cpu_ms:8.3f} ms CPU per 1k relations")
+    return cpu_ms
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    payload = make_payload(count)
+
+    print(f"{count} relations, {repeats} repeats, fast decoder: {JSON_DECODER}")
+    baseline = measure("json + model_validate per item", lambda data: [Relation.model_validate(item) for item in json.loads(data)], payload, repeats, count)
+    results = {
+        name: measure(name, decode, payload, repeats, count)
+        for name, decode in [
+            ("fast decoder + model_validate per item", lambda data: [Relation.model_validate(item) for item in json_loads(data)]),
+            ("fast decoder + trusted model_construct", lambda data: [Relation.model_construct(**item) for item in json_loads(data)]),
+            ("validate_json on raw bytes (OpenGINService)", OpenGINService._decode_relations),
+        ]
+    }
+
+    print()
+    for name, cpu_ms in results.items():
+        print(f"{name:<45} saves {baseline - cpu_ms:8.3f} ms CPU per 1k relations ({1 - cpu_ms / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
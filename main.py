@@ -1,14 +1,46 @@
+import asyncio
+import contextlib
 from fastapi import FastAPI
-from src.routers import organisation_router, data_router, search_router, person_router
+from src.routers import organisation_router, data_router, search_router, person_router, metrics_router, admin_router
 from fastapi.middleware.cors import CORSMiddleware
 from src.middleware.throttling import ThrottlingMiddleware
+from src.middleware.deadline import DeadlineMiddleware
+from src.middleware.request_scope import RequestScopeMiddleware
 from src.utils.http_client import http_client
+from src.utils.load_balancer import opengin_balancer
+from src.utils.disk_cache import disk_store
+from src.utils.readiness import readiness
+from src.services.opengin_service import OpenGINService
+from src.services.warmup_service import WarmupService
+from src.enums import PriorityEnum
+from src.core.config import settings
 from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await http_client.start()
+    if disk_store is not None:
+        # index the persistent cache in the background, entries are served before it is done
+        asyncio.get_running_loop().run_in_executor(None, disk_store.load_index)
+    for base_url in opengin_balancer.urls:
+        await http_client.prewarm(base_url, settings.HTTP_PREWARM_CONNECTIONS, settings.HTTP_PREWARM_TIMEOUT)
+
+    warmup_task = None
+    warmup_service = WarmupService(OpenGINService())
+    if settings.WARMUP_MODE == "foreground":
+        await warmup_service.run()
+    elif settings.WARMUP_MODE == "background":
+        # traffic is already served, user requests go first
+        warmup_task = asyncio.create_task(warmup_service.run(PriorityEnum.BACKGROUND))
+    else:
+        readiness.mark_ready()
+
     yield
+
+    if warmup_task is not None:
+        warmup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warmup_task
     await http_client.close()
 
 app = FastAPI(
@@ -26,9 +58,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Innermost, the request loaders only live while the request is being handled
+app.add_middleware(RequestScopeMiddleware)
+
 app.add_middleware(ThrottlingMiddleware)
 
+# Added last so that it is the outermost, the deadline also covers the time spent waiting for a throttling slot
+app.add_middleware(DeadlineMiddleware)
+
 app.include_router(organisation_router)
 app.include_router(data_router)
 app.include_router(search_router)
 app.include_router(person_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
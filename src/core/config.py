@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -9,8 +10,76 @@ class Settings(BaseSettings):
     HTTP_TIMEOUT_CONNECT: int = 30
     HTTP_TIMEOUT_SOCK_CONNECT: int = 30
     HTTP_TIMEOUT_SOCK_READ: int = 90
+    HTTP_BULK_POOL_SIZE: int = 10
+    HTTP_BULK_POOL_SIZE_PER_HOST: int = 8
+    HTTP_BULK_TIMEOUT_TOTAL: int = 300
+    HTTP_BULK_TIMEOUT_SOCK_READ: int = 120
+    HTTP_PREWARM_CONNECTIONS: int = 10
+    HTTP_PREWARM_TIMEOUT: float = 5
     THROTTLING_MAX_CONCURRENT: int = 200
     THROTTLING_TIMEOUT: int = 30
+    REQUEST_DEADLINE_DEFAULT: float = 30
+    REQUEST_DEADLINE_MAX: float = 120
+    REQUEST_DEADLINE_HEADER: str = "X-Request-Timeout"
+    REQUEST_DEADLINE_ROUTES: dict[str, float] = {
+        "/v1/person/all-presidents": 60,
+        "/v1/organisation/department-history": 60,
+    }
+    OPENGIN_REPLICAS: list[str] = []
+    OPENGIN_EJECTION_THRESHOLD: int = 5
+    OPENGIN_EJECTION_SECONDS: float = 30
+    OPENGIN_BATCH_CONCURRENCY: int = 10
+    FAN_OUT_CONCURRENCY: int = 10
+    OPENGIN_STRICT_VALIDATION: bool = False
+    OPENGIN_STREAM_CHUNK_SIZE: int = 65536
+    OPENGIN_ACCEPT_ENCODING: str = "gzip, deflate"
+    RETRY_INITIAL_BACKOFF: float = 1.0
+    RETRY_MAX_BACKOFF: float = 6.0
+    RETRY_MULTIPLIER: float = 2.0
+    RETRY_TIMEOUT: float = 10.0
+    RETRY_BUDGET_RATIO: float = 0.1
+    RETRY_BUDGET_MAX_TOKENS: float = 10
+    CONCURRENCY_LIMIT_INITIAL: int = 20
+    CONCURRENCY_LIMIT_MIN: int = 5
+    CONCURRENCY_LIMIT_MAX: int = 40
+    CONCURRENCY_LIMIT_BACKOFF_RATIO: float = 0.9
+    CONCURRENCY_LIMIT_LATENCY_TOLERANCE: float = 2.0
+    CONCURRENCY_BACKGROUND_RESERVED: int = 2
+    CONCURRENCY_BULK_LIMIT_INITIAL: int = 4
+    CONCURRENCY_BULK_LIMIT_MIN: int = 1
+    CONCURRENCY_BULK_LIMIT_MAX: int = 8
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    CIRCUIT_BREAKER_WINDOW_SIZE: int = 20
+    CIRCUIT_BREAKER_MINIMUM_CALLS: int = 10
+    CIRCUIT_BREAKER_OPEN_SECONDS: int = 30
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS: int = 3
+    HEDGING_ENABLED: bool = False
+    HEDGING_PERCENTILE: float = 95
+    HEDGING_MAX_EXTRA_LOAD: float = 0.05
+    HEDGING_MIN_SAMPLES: int = 50
+    CACHE_ENABLED: bool = True
+    CACHE_ENTITY_TTL: int = 3600
+    CACHE_ENTITY_MAX_ENTRIES: int = 10000
+    CACHE_RELATION_TTL: int = 300
+    CACHE_RELATION_HISTORICAL_TTL: int = 86400
+    CACHE_RELATION_MAX_ENTRIES: int = 20000
+    CACHE_NOT_FOUND_TTL: int = 60
+    CACHE_NOT_FOUND_MAX_ENTRIES: int = 5000
+    CACHE_DATASET_TTL: int = 3600
+    CACHE_DATASET_MAX_ENTRIES: int = 200
+    CACHE_BACKEND: Literal["memory", "sqlite"] = "memory"
+    CACHE_SQLITE_PATH: str = "/tmp/gi-service/cache.sqlite3"
+    CACHE_SQLITE_BUSY_TIMEOUT: float = 0.1
+    CACHE_DISK_PATH: str = ""
+    CACHE_DISK_MAX_BYTES: int = 536870912
+    RESPONSE_CACHE_ROUTES: dict[str, dict[str, float]] = {
+        "/v1/person/all-presidents": {"soft_ttl": 300, "hard_ttl": 86400},
+        "/v1/organisation/department-history": {"soft_ttl": 600, "hard_ttl": 86400},
+    }
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    WARMUP_MODE: Literal["off", "foreground", "background"] = "background"
+    WARMUP_TIMEOUT: float = 120
+    ADMIN_TOKEN: str = ""
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,6 +1,9 @@
 from src.enums.kindEnum import KindMajorEnum, KindMinorEnum
 from src.enums.relationEnum import RelationNameEnum, RelationDirectionEnum
 from src.enums.idEnum import EntityIdEnum
+from src.enums.circuitStateEnum import CircuitStateEnum
+from src.enums.priorityEnum import PriorityEnum
+from src.enums.poolEnum import PoolEnum
 
 __all__ = [
     "KindMajorEnum",
@@ -8,4 +11,7 @@ __all__ = [
     "RelationNameEnum",
     "RelationDirectionEnum",
     "EntityIdEnum",
+    "CircuitStateEnum",
+    "PriorityEnum",
+    "PoolEnum",
 ]
\ No newline at end of file
@@ -0,0 +1,7 @@
+from enum import Enum
+
+# circuit breaker states
+class CircuitStateEnum(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+# connection pools of the HTTP client, isolating heavy downloads from small lookups
+class PoolEnum(Enum):
+    LOOKUP = "lookup"
+    BULK = "bulk"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+# priority classes of outbound OpenGIN requests
+class PriorityEnum(Enum):
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
@@ -19,3 +19,11 @@ class ServiceUnavailableError(HTTPException):
 class GatewayTimeoutError(HTTPException):
     def __init__(self, message: str):
         super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=message)
+
+class UnauthorizedError(HTTPException):
+    def __init__(self, message: str):
+        super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=message)
+
+class ForbiddenError(HTTPException):
+    def __init__(self, message: str):
+        super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=message)
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.core.config import settings
+from src.utils.deadline import start_deadline, reset_deadline
+
+logger = logging.getLogger(__name__)
+
+class DeadlineMiddleware:
+    """
+    Deadline middleware that bounds how long a request may take end to end.
+
+    The deadline is REQUEST_DEADLINE_DEFAULT seconds, or the value of the longest matching
+    path prefix in REQUEST_DEADLINE_ROUTES. Clients can ask for a different deadline with the
+    REQUEST_DEADLINE_HEADER header (in seconds), capped at REQUEST_DEADLINE_MAX.
+
+    The deadline is carried to the OpenGIN calls through a context variable, so they never
+    wait longer than the time left. If the request is still running when it expires, it is
+    cancelled and a 504 Gateway Timeout is returned, unless the response had already started.
+
+    It is a plain ASGI middleware rather than a BaseHTTPMiddleware, whose call_next runs the
+    rest of the stack in a task of its own that a timeout around it would not cancel.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.default_seconds = settings.REQUEST_DEADLINE_DEFAULT
+        self.max_seconds = settings.REQUEST_DEADLINE_MAX
+        self.header = settings.REQUEST_DEADLINE_HEADER
+        # longest prefixes first so the most specific route wins
+        self.route_seconds = sorted(settings.REQUEST_DEADLINE_ROUTES.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def deadline_for(self, request: Request) -> float:
+        """Return the deadline in seconds for the request"""
+        requested = request.headers.get(self.header)
+        if requested:
+            try:
+                seconds = float(requested)
+                if seconds > 0:
+                    return min(seconds, self.max_seconds)
+            except ValueError:
+                pass
+            logger.warning(f"Ignoring invalid {self.header} header value: {requested}")
+
+        for prefix, seconds in self.route_seconds:
+            if request.url.path.startswith(prefix):
+                return min(seconds, self.max_seconds)
+        return min(self.default_seconds, self.max_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        seconds = self.deadline_for(request)
+        response_started = False
+
+        async def send_tracking_start(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = start_deadline(seconds)
+        try:
+            async with asyncio.timeout(seconds):
+                await self.app(scope, receive, send_tracking_start)
+        except TimeoutError:
+            logger.warning(f"Request deadline of {seconds}s exceeded: {request.method} {request.url.path}")
+            if response_started:
+                # too late for a 504, the client gets a truncated response
+                raise
+            response = JSONResponse(
+                status_code=504,
+                content={"detail": "The request took too long to complete. Please try again shortly."}
+            )
+            await response(scope, receive, send)
+        finally:
+            reset_deadline(token)
@@ -0,0 +1,16 @@
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from src.utils.data_loader import request_scope
+
+class RequestScopeMiddleware(BaseHTTPMiddleware):
+    """
+    Request scope middleware giving every request its own entity and relation loaders.
+
+    The loaders are carried to the services through a context variable, so the OpenGIN
+    lookups made while serving the request are batched per event loop tick and memoized
+    until the response is sent, without the services passing anything around.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        with request_scope():
+            return await call_next(request)
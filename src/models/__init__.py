@@ -1,6 +1,8 @@
 from .person_schemas import PersonSource, PersonResponse
+from .projection import EntityProjection
 
 __all__ = [
     "PersonSource",
-    "PersonResponse"
+    "PersonResponse",
+    "EntityProjection"
 ]
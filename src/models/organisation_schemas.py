@@ -29,6 +29,10 @@ class Relation(BaseModel):
     id: str = ""
     direction: str = ""
 
+class EntitySearchResult(BaseModel):
+    """EntitySearchResult refers to the response of an entity search in the OpenGIN Specification"""
+    body: Optional[list[Entity]] = None
+
 class Category(BaseModel):
     """Category refers to the parent/child category in the OpenGIN Specification"""
     id: str = ""
@@ -0,0 +1,107 @@
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model, field_validator
+from src.models.organisation_schemas import Entity
+
+
+class EntityProjection(BaseModel):
+    """
+    EntityProjection describes which entity fields a caller needs, as dotted paths such as "kind.minor".
+
+    Entities read through a projection are decoded into a compact model holding only those
+    fields (plus the id), every other field in the response is skipped while decoding.
+    The descriptor is a plain, hashable value so it can also be sent upstream (see
+    as_query_params) once OpenGIN supports field selection.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    fields: tuple[str, ...]
+
+    @field_validator("fields")
+    @classmethod
+    def normalise_fields(cls, fields: tuple[str, ...]) -> tuple[str, ...]:
+        for path in fields:
+            _resolve_path(path)
+        return tuple(sorted({"id", *fields}))
+
+    @classmethod
+    def of(cls, *fields: str) -> "EntityProjection":
+        return cls(fields=fields)
+
+    @property
+    def key(self) -> str:
+        """Canonical form of the projection, e.g. "id,kind.minor,name" """
+        return ",".join(self.fields)
+
+    def as_query_params(self) -> dict[str, str]:
+        """The projection as an upstream request parameter"""
+        return {"fields": self.key}
+
+    @property
+    def model(self) -> type[BaseModel]:
+        """The compact model entities are decoded into"""
+        return _projected_model(self.fields)
+
+    def decode_search(self, data: bytes, strict: bool = False) -> list[BaseModel]:
+        """Decode the projected fields of the entities in a raw entity search response"""
+        return _projected_search_adapter(self.fields).validate_json(data, strict=strict).body or []
+
+    def project(self, entity: Entity) -> BaseModel:
+        """Reduce an already decoded entity to the projection"""
+        return self.model.model_validate(entity.model_dump(include=_field_tree(self.fields)))
+
+
+def _resolve_path(path: str):
+    """Check that a dotted path points at an Entity field"""
+    model = Entity
+    for part in path.split("."):
+        if model is None or part not in model.model_fields:
+            raise ValueError(f"Unknown entity field '{path}'")
+        annotation = model.model_fields[part].annotation
+        model = annotation if isinstance(annotation, type) and issubclass(annotation, BaseModel) else None
+
+
+def _field_tree(fields: tuple[str, ...]) -> dict:
+    """Turn dotted paths into the nested include dict used by pydantic, e.g. {"kind": {"minor": True}}"""
+    tree: dict = {}
+    # shorter paths first, so a whole field selected alongside one of its subfields wins
+    for path in sorted(fields, key=lambda field: field.count(".")):
+        *parents, leaf = path.split(".")
+        node = tree
+        for part in parents:
+            node = node.setdefault(part, {})
+            if node is True:
+                break
+        else:
+            node.setdefault(leaf, True)
+    return tree
+
+
+def _build_model(model: type[BaseModel], tree: dict, name: str) -> type[BaseModel]:
+    definitions = {}
+    for field_name, subtree in tree.items():
+        field_info = model.model_fields[field_name]
+        if subtree is True:
+            definitions[field_name] = (field_info.annotation, field_info.default)
+        else:
+            nested = _build_model(field_info.annotation, subtree, f"{name}{field_name.capitalize()}")
+            definitions[field_name] = (nested, nested())
+    return create_model(name, **definitions)
+
+
+@lru_cache(maxsize=None)
+def _projected_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    model = _build_model(Entity, _field_tree(fields), "ProjectedEntity")
+    # lets a serialised projected entity be rebuilt into the same model (see shared_cache)
+    model.__projection_fields__ = fields
+    return model
+
+
+@lru_cache(maxsize=None)
+def _projected_search_adapter(fields: tuple[str, ...]) -> TypeAdapter:
+    search_result = create_model("ProjectedEntitySearchResult", body=(Optional[list[_projected_model(fields)]], None))
+    return TypeAdapter(search_result)
+
+
+# Commonly used projections
+NAME_PROJECTION = EntityProjection.of("name")
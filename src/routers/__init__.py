@@ -2,10 +2,14 @@ from .data_router import router as data_router
 from .organisation_router import router as organisation_router
 from .search_router import router as search_router
 from .person_router import router as person_router
+from .metrics_router import router as metrics_router
+from .admin_router import router as admin_router
 
 __all__ = [
     "data_router",
     "organisation_router",
     "search_router",
-    "person_router"
+    "person_router",
+    "metrics_router",
+    "admin_router"
 ]
@@ -0,0 +1,43 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Path, Query
+from src.core.config import settings
+from src.exception.exceptions import ForbiddenError, UnauthorizedError
+from src.services.cache_admin_service import CacheAdminService
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None, description="The ADMIN_TOKEN of the service")):
+    if not settings.ADMIN_TOKEN:
+        raise ForbiddenError("Admin endpoints are disabled, set ADMIN_TOKEN to enable them")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise UnauthorizedError("Invalid admin token")
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin_token)])
+
+def get_cache_admin_service():
+    return CacheAdminService()
+
+@router.get('/caches', summary="Get cache statistics.", description="Returns the size, hit ratio, evictions, a memory estimate and the most hit keys of every cache, as seen by the worker answering.")
+async def cache_stats(
+    top: int = Query(10, ge=0, le=1000, description="Number of most hit keys to list per cache"),
+    service: CacheAdminService = Depends(get_cache_admin_service)
+):
+    return await service.cache_stats(top)
+
+@router.delete('/caches/entity/{entity_id}', summary="Purge an entity.", description="Removes the cached entity, the relations queried from or pointing at it, and the datasets and responses mentioning it.")
+async def purge_entity(
+    entity_id: str = Path(..., description="ID of the entity"),
+    service: CacheAdminService = Depends(get_cache_admin_service)
+):
+    return await service.purge_entity(entity_id)
+
+@router.delete('/caches/prefix', summary="Purge by key prefix.", description="Removes the entries whose key starts with the prefix, in one cache or in all of them.")
+async def purge_prefix(
+    prefix: str = Query(..., min_length=1, description="Key prefix, e.g. an entity id or a route path"),
+    cache: Optional[str] = Query(None, description="Limit the purge to one cache: entities, relations, datasets, not_found or responses"),
+    service: CacheAdminService = Depends(get_cache_admin_service)
+):
+    return await service.purge_prefix(prefix, cache)
+
+@router.delete('/caches', summary="Purge every cache.", description="Removes every cache entry.")
+async def purge_all(service: CacheAdminService = Depends(get_cache_admin_service)):
+    return await service.purge_all()
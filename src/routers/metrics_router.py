@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from src.utils.metrics import metrics
+from src.utils.readiness import readiness
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get('/metrics', summary="Get service metrics.", description="Returns the in-process counters of the OpenGIN client, such as call coalescing, cache statistics and circuit breaker states.")
+async def get_metrics():
+    return metrics.snapshot()
+
+@router.get('/ready', summary="Get worker readiness.", description="Returns 200 once the cache warm-up of this worker is over (see WARMUP_MODE), 503 before, with the duration and outcome of each warm-up step.")
+async def get_readiness():
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=readiness.stats())
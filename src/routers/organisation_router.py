@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, Query, Body, Path
+from fastapi import APIRouter, Depends, Query, Body, Path, Request, Response
+from functools import partial
 from src.models.organisation_schemas import Date
 from src.services import OpenGINService, OrganisationService
+from src.utils.response_cache import response_cache
 from typing import Sequence
 
 router = APIRouter(prefix="/v1/organisation", tags=["Organisation"])
@@ -44,10 +46,12 @@ async def cabinet_flow(
     service_response = await service.fetch_cabinet_flow(president_id=president_id, dates=dates)
     return service_response 
 
-@router.get('/department-history/{department_id}', summary="Get department history timeline.", description="Returns a timeline of a department including ministry relations and ministers.")
+@router.get('/department-history/{department_id}', summary="Get department history timeline.", description="Returns a timeline of a department including ministry relations and ministers. May be served from the response cache, see the Age and X-Cache-Status headers.")
 async def department_history_timeline(
+    request: Request,
+    response: Response,
     department_id: str = Path(..., description="ID of the department"),
     service: OrganisationService = Depends(get_organisation_service)
 ):
-    service_response = await service.department_history_timeline(department_id=department_id)
+    service_response = await response_cache.serve(request, response, partial(service.department_history_timeline, department_id=department_id))
     return service_response
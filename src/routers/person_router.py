@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response
 from src.services import OpenGINService, PersonService
+from src.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/v1/person", tags=["Person"])
 
@@ -36,8 +37,8 @@ async def person_profile(
 @router.get(
     "/all-presidents",
     summary="Get all presidents.",
-    description="Returns a list of all presidents with their tenures and gazettes published under each.",
+    description="Returns a list of all presidents with their tenures and gazettes published under each. May be served from the response cache, see the Age and X-Cache-Status headers.",
 )
-async def all_presidents(service: PersonService = Depends(get_person_service)):
-    service_response = await service.fetch_all_presidents()
+async def all_presidents(request: Request, response: Response, service: PersonService = Depends(get_person_service)):
+    service_response = await response_cache.serve(request, response, service.fetch_all_presidents)
     return service_response
@@ -0,0 +1,87 @@
+import os
+import re
+from typing import Any, Callable, Hashable, Optional
+from pydantic_core import to_json
+from src.exception.exceptions import BadRequestError
+from src.utils.cache import dataset_cache, entity_cache, not_found_cache, relation_cache
+from src.utils.response_cache import response_cache
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CacheAdminService:
+    """
+    This service is responsible for inspecting and purging the caches of the service.
+
+    Purges act on the caches as seen by the worker answering: entries of the shared (sqlite)
+    backend and of the persistent disk cache are removed for every worker, entries of the
+    in-memory backend only in this worker until they expire elsewhere. The shared and disk
+    backends are walked in a thread, not on the event loop.
+    """
+
+    def __init__(self, caches: Optional[dict[str, Any]] = None):
+        self.caches = caches if caches is not None else {
+            "entities": entity_cache,
+            "relations": relation_cache,
+            "datasets": dataset_cache,
+            "not_found": not_found_cache,
+            "responses": response_cache.cache,
+        }
+
+    async def cache_stats(self, top: int = 10) -> dict:
+        """
+        Per-cache statistics with a memory estimate and the most hit keys.
+
+        The memory estimate walks every entry, it is only computed here and not in /metrics.
+        """
+        return {
+            "worker": os.getpid(),
+            "caches": {
+                name: {**await cache.astats(), "memory_bytes": await cache.amemory_bytes(), "top_keys": cache.top_keys(top)}
+                for name, cache in self.caches.items()
+            },
+        }
+
+    async def purge_entity(self, entity_id: str) -> dict:
+        """
+        Remove everything cached about an entity: its own entries, the relations queried from it
+        or pointing at it, and the datasets and responses that mention its id.
+        """
+        if not entity_id or not entity_id.strip():
+            raise BadRequestError("Entity ID is required")
+
+        # the id as a whole token, so purging "dep_1" leaves "dep_10" alone
+        mention = re.compile(rf"(?<![\w.-]){re.escape(entity_id.strip())}(?![\w.-])")
+
+        def references(key: Hashable, value: Any) -> bool:
+            return bool(mention.search(str(key)) or mention.search(to_json(value, fallback=str).decode()))
+
+        return await self._purge(references)
+
+    async def purge_prefix(self, prefix: str, cache_name: Optional[str] = None) -> dict:
+        """Remove the entries whose key starts with the prefix, in one cache or in all of them"""
+        if not prefix:
+            raise BadRequestError("Prefix is required")
+        if cache_name is not None and cache_name not in self.caches:
+            raise BadRequestError(f"Unknown cache '{cache_name}', expected one of {', '.join(self.caches)}")
+
+        return await self._purge(lambda key, value: str(key).startswith(prefix), cache_name)
+
+    async def purge_all(self) -> dict:
+        removed = {}
+        for name, cache in self.caches.items():
+            removed[name] = await cache.asize()
+            await cache.aclear()
+        logger.warning(f"Purged every cache: {removed}")
+        return {"worker": os.getpid(), "removed": removed}
+
+    async def _purge(self, predicate: Callable[[Hashable, Any], bool], cache_name: Optional[str] = None) -> dict:
+        removed = {}
+        for name, cache in self.caches.items():
+            if cache_name is None or name == cache_name:
+                removed[name] = [str(key) for key in await cache.adelete_where(predicate)]
+        counts = {name: len(keys) for name, keys in removed.items()}
+        logger.warning(f"Purged cache entries: {counts}")
+        return {"worker": os.getpid(), "removed": removed}
@@ -4,8 +4,10 @@ from typing import Dict
 from src.enums import KindMajorEnum, KindMinorEnum, RelationNameEnum, RelationDirectionEnum
 from src.exception.exceptions import InternalServerError, NotFoundError
 from src.exception.exceptions import BadRequestError
+from src.exception.exceptions import GatewayTimeoutError
 from src.models.organisation_schemas import Relation
 from src.utils.util_functions import Util
+from src.utils.fan_out import fan_out
 from src.models.organisation_schemas import Kind
 from src.models.organisation_schemas import Entity
 from aiohttp import ClientSession
@@ -60,7 +62,7 @@ class DataService:
             async with self.lock:
                 dataset_dictionary.setdefault(actual_name_title_case, set()).add(dataset.id)
 
-        except (BadRequestError):
+        except (BadRequestError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"failed to enrich dataset {e}")
@@ -97,7 +99,7 @@ class DataService:
             async with self.lock:
                 categories_dictionary.setdefault(actual_name_title_case, set()).add(category.id)
         
-        except (BadRequestError):
+        except (BadRequestError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"failed to enrich category {e}")
@@ -151,8 +153,7 @@ class DataService:
                 entity = Entity(kind=Kind(major=KindMajorEnum.CATEGORY.value, minor=KindMinorEnum.PARENT_CATEGORY.value))
                 parentCategories = await self.opengin_service.get_entities(entity=entity)
 
-                enrich_category_task = [self.enrich_category(categories_dictionary=categories_dictionary, category=category) for category in parentCategories]
-                await asyncio.gather(*enrich_category_task)
+                await fan_out(parentCategories, lambda category: self.enrich_category(categories_dictionary=categories_dictionary, category=category))
 
                 categories = self.convert_dict_to_list(categories_dictionary,"name","categoryIds")
 
@@ -165,29 +166,21 @@ class DataService:
                 category_relation_instance = Relation(name=RelationNameEnum.AS_CATEGORY.value, direction=RelationDirectionEnum.OUTGOING.value)
                 dataset_relation_instance = Relation(name=RelationNameEnum.IS_ATTRIBUTE.value, direction=RelationDirectionEnum.OUTGOING.value)
                 
-                fetch_category_relation_tasks = [self.opengin_service.fetch_relation(entityId=category_id, relation=category_relation_instance) for category_id in category_ids]
-                fetch_dataset_relation_tasks = [self.opengin_service.fetch_relation(entityId=category_id, relation=dataset_relation_instance) for category_id in category_ids]
                 category_relations, dataset_relations = await asyncio.gather(
-                    asyncio.gather(*fetch_category_relation_tasks), 
-                    asyncio.gather(*fetch_dataset_relation_tasks),
+                    fan_out(category_ids, lambda category_id: self.opengin_service.fetch_relation(entityId=category_id, relation=category_relation_instance)),
+                    fan_out(category_ids, lambda category_id: self.opengin_service.fetch_relation(entityId=category_id, relation=dataset_relation_instance)),
                 )
 
-                # tasks for parallel execution
-                category_enrich_tasks = [
-                    self.enrich_category(category_relation=relation, categories_dictionary=categories_dictionary) 
-                    for sublist in category_relations 
-                    for relation in sublist
-                    ]
-                dataset_enrich_tasks = [
-                    self.enrich_dataset(dataset_relation=relation, dataset_dictionary=dataset_dictionary)
-                    for sublist in dataset_relations
-                    for relation in sublist
-                    ]
-
                 # parallel execution of tasks
                 await asyncio.gather(
-                    asyncio.gather(*category_enrich_tasks),
-                    asyncio.gather(*dataset_enrich_tasks)
+                    fan_out(
+                        [relation for sublist in category_relations for relation in sublist],
+                        lambda relation: self.enrich_category(category_relation=relation, categories_dictionary=categories_dictionary)
+                    ),
+                    fan_out(
+                        [relation for sublist in dataset_relations for relation in sublist],
+                        lambda relation: self.enrich_dataset(dataset_relation=relation, dataset_dictionary=dataset_dictionary)
+                    )
                 )
 
                 # Convert the categories_dictionary and dataset_dictionary to the format required
@@ -199,7 +192,7 @@ class DataService:
                     "datasets": datasets
                 }
                 
-        except (BadRequestError):
+        except (BadRequestError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"failed to fetch data catalog {e}")
@@ -224,12 +217,8 @@ class DataService:
             if not dataset_ids:
                 raise BadRequestError("Dataset ID list is required")
 
-            # prepare the dataset entities
-            dataset_entities = [Entity(id=dataset_id) for dataset_id in dataset_ids]
-
             # parallel execution of tasks
-            dataset_entity_tasks = [self.opengin_service.get_entities(entity=entity) for entity in dataset_entities]
-            dataset_entities = await asyncio.gather(*dataset_entity_tasks)
+            dataset_entities = await fan_out(dataset_ids, lambda dataset_id: self.opengin_service.get_entities(entity=Entity(id=dataset_id)))
 
             # get the dataset name task
             dataset_first_datum = dataset_entities[0][0]
@@ -260,7 +249,7 @@ class DataService:
                 "years": dataset_years
             }
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"failed to fetch dataset available years {e}")
@@ -316,7 +305,7 @@ class DataService:
             
             return formatted_attributes
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"failed to fetch data attributes {e}")
@@ -378,7 +367,7 @@ class DataService:
             
             return root_entity_data
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Failed to fetch dataset root for dataset {dataset_id}: {e}")
@@ -444,7 +433,7 @@ class DataService:
                 "categories": categories
             }
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Failed to fetch categories for dataset {dataset_id}: {e}")
@@ -543,7 +532,7 @@ class DataService:
             parent_category_id = parent_relations[0].relatedEntityId
             return await self.find_root_department_or_minister(parent_category_id)
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Failed to find root department, state minister or cabinet minister for category {category_id}: {e}")
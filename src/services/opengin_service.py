@@ -1,41 +1,91 @@
-from asyncio import timeout
-from google.api_core.exceptions import GoogleAPICallError
-from google.api_core.retry import if_transient_error
-from src.models.organisation_schemas import Entity, Relation
+import asyncio
+import time
+from functools import partial
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+from pydantic import TypeAdapter
+from src.models.organisation_schemas import Entity, EntitySearchResult, Relation
+from src.models.projection import EntityProjection
 from src.exception.exceptions import BadRequestError
 from src.exception.exceptions import InternalServerError
 from src.exception.exceptions import NotFoundError
-from google.api_core import retry_async
-from google.api_core import exceptions
+from src.exception.exceptions import ServiceUnavailableError
+from src.exception.exceptions import GatewayTimeoutError
 from aiohttp import ClientSession
+from src.enums.poolEnum import PoolEnum
 from src.utils.http_client import http_client
+from src.utils.single_flight import single_flight
+from src.utils.cache import dataset_cache, entity_cache, not_found_cache, relation_cache
+from src.utils.disk_cache import disk_store
+from src.utils.circuit_breaker import circuit_breakers
+from src.utils.hedging import hedger
+from src.utils.retry import retry_policy
+from src.utils.concurrency_limiter import AdaptiveConcurrencyLimiter, opengin_bulk_limiter, opengin_limiter
+from src.utils.load_balancer import opengin_balancer
+from src.utils.fan_out import fan_out, fan_out_stats
+from src.utils.data_loader import current_loaders, loader_stats
+from src.utils.deadline import DEADLINE_EXCEEDED_MESSAGE, deadline_expired, remaining_time, run_within_deadline
+from src.utils.compression import Decompressor, decompress, payload_stats
+from src.utils.json_codec import json_loads
+from src.utils.json_stream import JsonArrayStreamParser
+from src.utils.metrics import metrics
 from src.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
-def custom_retry_predicate(exception: Exception) -> bool:
-    """
-    Determine if the request should be retried based on the exception type.
-    Returns False for BadRequestError to skip retries.
-    """
-    if isinstance(exception, (BadRequestError, NotFoundError)):
-        return False
-    
-    if isinstance(exception, (InternalServerError)):
-        return True
+# Operations routed to a pool other than the lookup pool, whole datasets are downloaded as attributes
+OPERATION_POOLS = {"attributes": PoolEnum.BULK}
 
-api_retry_decorator = retry_async.AsyncRetry(
-    predicate=custom_retry_predicate,
-    initial=1.0,
-    maximum=6.0,
-    multiplier=2.0,
-    timeout=10.0 # retry for 10 seconds
-)
+metrics.register("http_pools", http_client.stats)
+metrics.register("upstreams", opengin_balancer.stats)
+metrics.register("single_flight", single_flight.stats)
+metrics.register("entity_cache", entity_cache.stats)
+metrics.register("relation_cache", relation_cache.stats)
+metrics.register("dataset_cache", dataset_cache.stats)
+metrics.register("not_found_cache", not_found_cache.stats)
+if disk_store is not None:
+    metrics.register("disk_cache", disk_store.stats)
+metrics.register("circuit_breakers", circuit_breakers.stats)
+metrics.register("hedging", hedger.stats)
+metrics.register("retries", retry_policy.stats)
+metrics.register("concurrency_limiter", opengin_limiter.stats)
+metrics.register("bulk_concurrency_limiter", opengin_bulk_limiter.stats)
+metrics.register("payloads", payload_stats.stats)
+metrics.register("data_loaders", loader_stats.stats)
+metrics.register("fan_out", fan_out_stats.stats)
+
+_relation_list_adapter = TypeAdapter(list[Relation])
 
 class OpenGINService:
     """
     The OpenGINService directly interfaces with the OpenGIN APIs to retrieve data.
+
+    Identical calls that are in flight at the same time are coalesced through the
+    single-flight layer, so concurrent callers share one upstream request (and its retries).
+    Id-only entity lookups are served from the entity cache while their entry is fresh,
+    relation lookups from the relation cache, where queries for a past activeAt are kept
+    much longer since historical relations do not change, and datasets (attributes) from the
+    dataset cache. With CACHE_BACKEND=sqlite these caches are shared by all workers of the
+    host, with CACHE_DISK_PATH they are persisted and survive restarts. Entity, metadata and
+    attribute calls that answered 404 are remembered for a short while in the not-found cache.
+    While a request is served (see request_scope), id lookups and relation queries issued
+    in the same event loop tick are batched, and each one is made at most once per request.
+
+    Transient failures (connection errors, timeouts, 429/502/503/504) are retried with
+    jittered backoff within a process-wide retry budget, other failures are not retried.
+    Every upstream request goes through the circuit breaker of its operation (entities,
+    relations, metadata, attributes), which fails fast while OpenGIN is degraded, and
+    through the adaptive concurrency limiter, which queues requests above the number
+    OpenGIN currently handles without its latency going up. Calls made inside
+    request_priority(PriorityEnum.BACKGROUND) only get the capacity interactive calls leave.
+    With HEDGING_ENABLED, slow entity and metadata reads are hedged with a duplicate request.
+    Each attempt is sent to the least loaded OpenGIN replica (OPENGIN_REPLICAS), so retries
+    and hedges can land on a different replica than the first attempt.
+
+    Inside a request with a deadline (see DeadlineMiddleware) every upstream call gets at most
+    the remaining time, no retry is attempted once it has passed and callers stop waiting when
+    it expires. An expired deadline surfaces as GatewayTimeoutError.
     """
     def __init__(self):
         pass
@@ -43,43 +93,319 @@ class OpenGINService:
     @property
     def session(self) -> ClientSession:
         return http_client.session
-    
-    @api_retry_decorator
-    async def get_entities(self,entity: Entity):
 
+    @staticmethod
+    def _pool_for(operation: str) -> PoolEnum:
+        return OPERATION_POOLS.get(operation, PoolEnum.LOOKUP)
+
+    @staticmethod
+    def _limiter_for(pool: PoolEnum) -> AdaptiveConcurrencyLimiter:
+        return opengin_bulk_limiter if pool == PoolEnum.BULK else opengin_limiter
+
+    @staticmethod
+    def _deadline_request_kwargs(pool: PoolEnum = PoolEnum.LOOKUP) -> dict:
+        """Return the request options capping the call to what is left of the request deadline"""
+        budget = remaining_time()
+        if budget is None:
+            return {}
+        if budget <= 0:
+            raise GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE)
+        return {"timeout": http_client.timeout_within(budget, pool)}
+
+    async def _send_request(self, operation: str, method: str, path: str, payload: Optional[dict], not_found_message: str, bad_request_message: str, decode: Callable[[bytes], Any] = json_loads, latency_class: Optional[str] = None):
+        """
+        Send a single request for `path` to an OpenGIN replica chosen by the load balancer, over the
+        operation's connection pool, through its circuit breaker and the adaptive concurrency limiter of that pool,
+        and return the body decoded by `decode` (plain JSON by default). The limiter compares the latency
+        with calls of the same `latency_class`, the operation unless given.
+        """
+        headers = {"Content-Type": "application/json", "Accept-Encoding": settings.OPENGIN_ACCEPT_ENCODING}
+        pool = self._pool_for(operation)
+        session = http_client.session_for(pool)
+
+        if deadline_expired():
+            raise GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE)
+
+        with circuit_breakers.get(operation).protect():
+            async with self._limiter_for(pool).slot(latency_class or operation):
+                with opengin_balancer.request() as base_url:
+                    url = f"{base_url}{path}"
+                    request_kwargs = self._deadline_request_kwargs(pool)
+                    if method == "POST":
+                        request = session.post(url, json=payload, headers=headers, **request_kwargs)
+                    else:
+                        request = session.get(url, headers=headers, **request_kwargs)
+
+                    try:
+                        async with request as response:
+                            if response.status == 404:
+                                raise NotFoundError(not_found_message)
+                            if response.status == 400:
+                                raise BadRequestError(bad_request_message)
+                            response.raise_for_status()
+                            encoding = response.headers.get("Content-Encoding")
+                            body = await response.read()
+                    except asyncio.TimeoutError as e:
+                        if deadline_expired():
+                            raise GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE) from e
+                        raise
+
+        # decode once the slot is released, a malformed body says nothing about the upstream health
+        started_at = time.perf_counter()
+        data = decompress(body, encoding)
+        decompressed_at = time.perf_counter()
+        result = decode(data)
+        payload_stats.record(operation, encoding, len(body), len(data), decompressed_at - started_at, time.perf_counter() - decompressed_at)
+        return result
+
+    @staticmethod
+    async def _call_remembering_not_found(operation: str, key: tuple, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run fn through the single-flight layer within the request deadline, answering calls that
+        recently raised NotFoundError from the not-found cache instead of asking OpenGIN again
+        """
+        not_found_cache.check(operation, key)
+        try:
+            return await run_within_deadline(single_flight.do, key, fn, *args)
+        except NotFoundError as e:
+            not_found_cache.remember(operation, key, e)
+            raise
+
+    @staticmethod
+    def _decode_entities(data: bytes) -> list[Entity]:
+        """
+        Validate an entity search response straight from its raw bytes.
+
+        The JSON is parsed and validated in one pass by pydantic-core, which is cheaper than
+        decoding it to dicts first and validating every item on its own.
+        """
+        return EntitySearchResult.model_validate_json(data, strict=settings.OPENGIN_STRICT_VALIDATION).body or []
+
+    @staticmethod
+    def _decode_relations(data: bytes) -> list[Relation]:
+        """Validate a relations response straight from its raw bytes, see _decode_entities"""
+        return _relation_list_adapter.validate_json(data, strict=settings.OPENGIN_STRICT_VALIDATION)
+
+    @staticmethod
+    def _entity_cache_key(entity: Entity) -> Optional[str]:
+        """Return the cache key for id-only lookups, None for searches that must not be cached"""
+        if not settings.CACHE_ENABLED or not entity.id:
+            return None
+        if entity != Entity(id=entity.id):
+            return None
+        return entity.id
+
+    async def get_entities(self,entity: Entity, projection: Optional[EntityProjection] = None):
+        """
+        Search entities, optionally decoding only the fields named by `projection`.
+
+        With a projection the result holds compact projected models instead of full entities.
+        A cached full entity is projected locally, otherwise projected results are cached
+        under their own key so they never stand in for a full entity.
+        """
+
+        if not entity:
+            raise BadRequestError("Entity is required")
+
+        loaders = current_loaders()
+        if loaders is not None and entity.id and entity == Entity(id=entity.id):
+            # id lookups made while serving a request are batched and memoized for the whole request
+            result = await loaders.get("entities", self._load_entities).load((entity.id, projection))
+            return list(result)
+
+        cache_key = self._entity_cache_key(entity)
+        if cache_key:
+            cached = await entity_cache.aget(cache_key)
+            if cached is not None:
+                return list(cached) if projection is None else [projection.project(item) for item in cached]
+            if projection is not None:
+                cache_key = f"{cache_key}#{projection.key}"
+                cached = await entity_cache.aget(cache_key)
+                if cached is not None:
+                    return list(cached)
+
+        path = "/v1/entities/search"
+        payload = entity.model_dump(mode="json")
+
+        key = single_flight.make_key("POST", path, payload) + ((projection.key,) if projection else ())
+        result = await self._call_remembering_not_found("entities", key, self._search_entities, entity, path, payload, projection)
+
+        if cache_key:
+            await entity_cache.aset(cache_key, result)
+        return list(result)
+
+    async def _load_entities(self, keys: list[tuple[str, Optional[EntityProjection]]]) -> list:
+        """Batch function of the request-scoped entity loader"""
+        return await fan_out(keys, lambda key: self.get_entities(Entity(id=key[0]), key[1]), limit=settings.OPENGIN_BATCH_CONCURRENCY, return_exceptions=True)
+
+    async def iter_entities(self, entity: Entity) -> AsyncIterator[Entity]:
+        """
+        Stream the entities matching a search, yielding each one as soon as it is read from the socket.
+
+        Unlike get_entities, the response is never held in memory as a whole, only the entity
+        being parsed is, so callers can aggregate very large searches with bounded memory.
+        An empty result yields nothing. Streams go through the circuit breaker, the concurrency
+        limiter and the request deadline, but are not retried, hedged, coalesced or cached
+        since the caller may already have consumed part of them.
+
+        Args:
+            entity (Entity): The search, typically by kind only.
+
+        Yields:
+            Entity: The matching entities in the order OpenGIN returns them.
+        """
         if not entity:
             raise BadRequestError("Entity is required")
 
-        url = f"{settings.BASE_URL_QUERY}/v1/entities/search"
-        headers = {"Content-Type":"application/json"}      
+        path = "/v1/entities/search"
         payload = entity.model_dump(mode="json")
+        headers = {"Content-Type": "application/json", "Accept-Encoding": settings.OPENGIN_ACCEPT_ENCODING}
+
+        if deadline_expired():
+            raise GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE)
 
         try:
-            async with self.session.post(url, json=payload, headers=headers) as response:
-                if response.status == 404:
-                    raise NotFoundError(f"Read API Error: Entity not found for id {entity.id}")
-                if response.status == 400:
-                    raise BadRequestError(f"Read API Error: Bad request for id {entity.id}")
-                
-                response.raise_for_status()
-                res_json = await response.json()
-                response_list = res_json.get("body", [])
+            with circuit_breakers.get("entities").protect():
+                # the slot is held while the caller consumes the stream, its duration is not a latency
+                async with opengin_limiter.slot("entity_searches", sample_latency=False):
+                    with opengin_balancer.request() as base_url:
+                        request_kwargs = self._deadline_request_kwargs()
+                        try:
+                            async with self.session.post(f"{base_url}{path}", json=payload, headers=headers, **request_kwargs) as response:
+                                if response.status == 404:
+                                    raise NotFoundError(f"Read API Error: Entities not found for kind {entity.kind.major}/{entity.kind.minor}")
+                                if response.status == 400:
+                                    raise BadRequestError(f"Read API Error: Bad request for kind {entity.kind.major}/{entity.kind.minor}")
+                                response.raise_for_status()
+
+                                encoding = response.headers.get("Content-Encoding")
+                                decompressor = Decompressor(encoding)
+                                parser = JsonArrayStreamParser("body")
+                                wire_bytes = decoded_bytes = 0
+                                decompress_seconds = decode_seconds = 0.0
 
-                if not response_list:
-                    raise NotFoundError(f"Read API Error: Entity not found for id {entity.id}")
+                                async for chunk in response.content.iter_chunked(settings.OPENGIN_STREAM_CHUNK_SIZE):
+                                    started_at = time.perf_counter()
+                                    data = decompressor.feed(chunk)
+                                    decompress_seconds += time.perf_counter() - started_at
+                                    wire_bytes += len(chunk)
+                                    decoded_bytes += len(data)
 
-                result = [Entity.model_validate(response) for response in response_list]
-                return result    
+                                    for item in parser.feed(data):
+                                        started_at = time.perf_counter()
+                                        result = Entity.model_validate_json(item, strict=settings.OPENGIN_STRICT_VALIDATION)
+                                        decode_seconds += time.perf_counter() - started_at
+                                        yield result
+
+                                # whatever the decompressor still holds once the body ended
+                                started_at = time.perf_counter()
+                                data = decompressor.flush()
+                                decompress_seconds += time.perf_counter() - started_at
+                                decoded_bytes += len(data)
+
+                                for item in parser.feed(data):
+                                    started_at = time.perf_counter()
+                                    result = Entity.model_validate_json(item, strict=settings.OPENGIN_STRICT_VALIDATION)
+                                    decode_seconds += time.perf_counter() - started_at
+                                    yield result
+
+                                payload_stats.record("entities_stream", encoding, wire_bytes, decoded_bytes, decompress_seconds, decode_seconds)
+                        except asyncio.TimeoutError as e:
+                            if deadline_expired():
+                                raise GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE) from e
+                            raise
+        except (NotFoundError, BadRequestError, ServiceUnavailableError, GatewayTimeoutError):
+            raise
+        except Exception as e:
+            logger.error(f'Read API Error: {str(e)}')
+            raise InternalServerError("An unexpected error occurred") from e
+
+    async def get_entities_by_ids(self, ids: Iterable[str], projection: Optional[EntityProjection] = None) -> tuple[dict[str, Entity], dict[str, Exception]]:
+        """
+        Resolve many entities by id with bounded concurrency.
+
+        Duplicate and empty ids are dropped and at most OPENGIN_BATCH_CONCURRENCY lookups
+        run at the same time. Each lookup goes through get_entities, so cached ids are
+        answered without an upstream call.
+
+        Args:
+            ids (Iterable[str]): The entity ids to resolve.
+            projection (EntityProjection, optional): Resolve only these fields of each entity.
+
+        Returns:
+            tuple: A map of id -> Entity for the resolved ids, and a map of id -> exception for the failed ones.
+        """
+        unique_ids = list(dict.fromkeys(entity_id for entity_id in ids if entity_id))
+        results = await fan_out(
+            unique_ids,
+            lambda entity_id: self.get_entities(Entity(id=entity_id), projection),
+            limit=settings.OPENGIN_BATCH_CONCURRENCY,
+            return_exceptions=True
+        )
+
+        entities: dict[str, Entity] = {}
+        failures: dict[str, Exception] = {}
+        for entity_id, result in zip(unique_ids, results):
+            if isinstance(result, Exception):
+                failures[entity_id] = result
+            else:
+                entities[entity_id] = result[0]
+
+        return entities, failures
+
+    @retry_policy.retrying("entities")
+    async def _search_entities(self, entity: Entity, path: str, payload: dict, projection: Optional[EntityProjection] = None):
+        if projection is None:
+            decode = self._decode_entities
+        else:
+            decode = partial(projection.decode_search, strict=settings.OPENGIN_STRICT_VALIDATION)
+
+        try:
+            result = await hedger.run(
+                "entities", self._send_request,
+                "entities", "POST", path, payload,
+                not_found_message=f"Read API Error: Entity not found for id {entity.id}",
+                bad_request_message=f"Read API Error: Bad request for id {entity.id}",
+                decode=decode,
+                # searches by kind or name are far slower than id lookups
+                latency_class="entities" if entity.id else "entity_searches"
+            )
+
+            if not result:
+                raise NotFoundError(f"Read API Error: Entity not found for id {entity.id}")
+
+            return result    
                 
-        except NotFoundError:
-            raise       
-        except BadRequestError:
+        except (NotFoundError, BadRequestError, ServiceUnavailableError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f'Read API Error: {str(e)}')
             raise InternalServerError("An unexpected error occurred") from e
     
-    @api_retry_decorator
+    @staticmethod
+    def _relation_cache_key(entity_id: str, relation: Relation) -> Optional[str]:
+        """Return the cache key for (entityId, name, direction, activeAt) queries, None for any other query"""
+        if not settings.CACHE_ENABLED:
+            return None
+        if relation != Relation(name=relation.name, direction=relation.direction, activeAt=relation.activeAt):
+            return None
+        return f"{entity_id}:{relation.name}:{relation.direction}:{relation.activeAt}"
+
+    @staticmethod
+    def _relation_cache_ttl(relation: Relation) -> int:
+        """Relations active at a past date are historical facts and get the long TTL"""
+        if not relation.activeAt:
+            return settings.CACHE_RELATION_TTL
+
+        try:
+            active_date = datetime.fromisoformat(relation.activeAt.replace("Z", "+00:00")).date()
+        except ValueError:
+            return settings.CACHE_RELATION_TTL
+
+        if active_date < datetime.now(timezone.utc).date():
+            return settings.CACHE_RELATION_HISTORICAL_TTL
+        return settings.CACHE_RELATION_TTL
+
     async def fetch_relation(self, entityId: str, relation: Relation):
         
         if not entityId or not relation:
@@ -88,31 +414,49 @@ class OpenGINService:
         stripped_entity_id = str(entityId).strip()
         if not stripped_entity_id:
             raise BadRequestError("Entity ID can not be empty")
+
+        loaders = current_loaders()
+        if loaders is not None:
+            result = await loaders.get("relations", self._load_relations).load((stripped_entity_id, relation.model_dump_json()))
+            return list(result)
+
+        cache_key = self._relation_cache_key(stripped_entity_id, relation)
+        if cache_key:
+            cached = await relation_cache.aget(cache_key)
+            if cached is not None:
+                return list(cached)
         
-        url = f"{settings.BASE_URL_QUERY}/v1/entities/{stripped_entity_id}/relations"
-        headers = {"Content-Type": "application/json"}  
+        path = f"/v1/entities/{stripped_entity_id}/relations"
         payload = relation.model_dump(mode="json")
 
+        key = single_flight.make_key("POST", path, payload)
+        result = await run_within_deadline(single_flight.do, key, self._fetch_relation, entityId, path, payload)
+
+        if cache_key:
+            await relation_cache.aset(cache_key, result, ttl=self._relation_cache_ttl(relation))
+        return list(result)
+
+    async def _load_relations(self, keys: list[tuple[str, str]]) -> list:
+        """Batch function of the request-scoped relation loader"""
+        return await fan_out(keys, lambda key: self.fetch_relation(key[0], Relation.model_validate_json(key[1])), limit=settings.OPENGIN_BATCH_CONCURRENCY, return_exceptions=True)
+
+    @retry_policy.retrying("relations")
+    async def _fetch_relation(self, entityId: str, path: str, payload: dict):
         try:
-            async with self.session.post(url, json=payload, headers=headers) as response:
-                if response.status == 404:
-                    raise NotFoundError(f"Read API Error: Relation not found for id {entityId}")
-                if response.status == 400:
-                    raise BadRequestError(f"Read API Error: Bad request for id {entityId}")
-                response.raise_for_status()
-                data = await response.json()
-                result = [Relation.model_validate(item) for item in data]
-                return result
-
-        except NotFoundError:
-            raise    
-        except BadRequestError:
-            raise   
+            result = await self._send_request(
+                "relations", "POST", path, payload,
+                not_found_message=f"Read API Error: Relation not found for id {entityId}",
+                bad_request_message=f"Read API Error: Bad request for id {entityId}",
+                decode=self._decode_relations
+            )
+            return result
+
+        except (NotFoundError, BadRequestError, ServiceUnavailableError, GatewayTimeoutError):
+            raise
         except Exception as e:
             logger.error(f'Read API Error: {str(e)}')
             raise InternalServerError("An unexpected error occurred") from e
 
-    @api_retry_decorator
     async def get_metadata(self, entityId: str):
 
         if not entityId:
@@ -122,26 +466,26 @@ class OpenGINService:
         if not stripped_entity_id:
             raise BadRequestError("Entity ID can not be empty")
         
-        url = f"{settings.BASE_URL_QUERY}/v1/entities/{entityId}/metadata"
-        headers = {"Content-Type": "application/json"}
-                
+        path = f"/v1/entities/{entityId}/metadata"
+
+        key = single_flight.make_key("GET", path)
+        return await self._call_remembering_not_found("metadata", key, self._get_metadata, entityId, path)
+
+    @retry_policy.retrying("metadata")
+    async def _get_metadata(self, entityId: str, path: str):
         try:
-            async with self.session.get(url, headers=headers) as response:
-                if response.status == 404:
-                    raise NotFoundError(f"Read API Error: Metadata not found for id {entityId}")
-                if response.status == 400:
-                    raise BadRequestError(f"Read API Error: Bad request for id {entityId}")
-                response.raise_for_status()
-                return await response.json()
-        except NotFoundError:
-            raise    
-        except BadRequestError:
-            raise   
+            return await hedger.run(
+                "metadata", self._send_request,
+                "metadata", "GET", path, None,
+                not_found_message=f"Read API Error: Metadata not found for id {entityId}",
+                bad_request_message=f"Read API Error: Bad request for id {entityId}"
+            )
+        except (NotFoundError, BadRequestError, ServiceUnavailableError, GatewayTimeoutError):
+            raise
         except Exception as e:
             logger.error(f'Read API Error: {str(e)}')
             raise InternalServerError("An unexpected error occurred") from e 
 
-    @api_retry_decorator
     async def get_attributes(self,category_id: str, dataset_name: str):
         if not category_id:
             raise BadRequestError("Category ID is required")
@@ -157,24 +501,31 @@ class OpenGINService:
         if not stripped_dataset_name:
             raise BadRequestError("Dataset name can not be empty")
         
-        url = f"{settings.BASE_URL_QUERY}/v1/entities/{category_id}/attributes/{dataset_name}"
-        headers = {"Content-Type": "application/json"}
-                
+        cache_key = f"{stripped_category_id}/{stripped_dataset_name}" if settings.CACHE_ENABLED else None
+        if cache_key:
+            cached = await dataset_cache.aget(cache_key)
+            if cached is not None:
+                return cached
+
+        path = f"/v1/entities/{category_id}/attributes/{dataset_name}"
+
+        key = single_flight.make_key("GET", path)
+        result = await self._call_remembering_not_found("attributes", key, self._get_attributes, category_id, dataset_name, path)
+
+        if cache_key:
+            await dataset_cache.aset(cache_key, result)
+        return result
+
+    @retry_policy.retrying("attributes")
+    async def _get_attributes(self, category_id: str, dataset_name: str, path: str):
         try:
-            async with self.session.get(url, headers=headers) as response:
-                if response.status == 404:
-                    raise NotFoundError(f"Read API Error: Attributes not found for category id {category_id} and dataset name {dataset_name}")
-                if response.status == 400:
-                    raise BadRequestError(f"Read API Error: Bad request for category id {category_id} and dataset name {dataset_name}")
-                response.raise_for_status()
-                return await response.json()
-        except NotFoundError:
-            raise    
-        except BadRequestError:
-            raise   
+            return await self._send_request(
+                "attributes", "GET", path, None,
+                not_found_message=f"Read API Error: Attributes not found for category id {category_id} and dataset name {dataset_name}",
+                bad_request_message=f"Read API Error: Bad request for category id {category_id} and dataset name {dataset_name}"
+            )
+        except (NotFoundError, BadRequestError, ServiceUnavailableError, GatewayTimeoutError):
+            raise
         except Exception as e:
             logger.error(f'Read API Error: {str(e)}')
             raise InternalServerError("An unexpected error occurred") from e 
-            
-
-        
\ No newline at end of file
@@ -3,11 +3,15 @@ from src.enums.relationEnum import RelationNameEnum
 from src.exception.exceptions import BadRequestError
 from src.exception.exceptions import NotFoundError
 from src.exception.exceptions import InternalServerError
+from src.exception.exceptions import GatewayTimeoutError
 import asyncio
 from src.utils.util_functions import Util
+from src.utils.fan_out import fan_out
+from src.utils.response_cache import mark_partial
 from aiohttp import ClientSession
 from src.utils import http_client
 from src.models.organisation_schemas import Entity, Relation
+from src.models.projection import NAME_PROJECTION
 from src.enums.idEnum import EntityIdEnum
 from typing import Optional, Sequence
 import logging
@@ -67,7 +71,7 @@ class OrganisationService:
                 "isNew": is_new,
                 "isPresident": is_president
             }
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f'Error fetching person data: {e}')
@@ -89,18 +93,19 @@ class OrganisationService:
 
             # if the appointedMinister list is not empty (because for if there is no any minister appointed, the president for that date should be assigned)
             if(len(appointed_ministers_list) > 0):
-                person_data = [
-                    self.enrich_person_data(
+                person_data = fan_out(
+                    appointed_ministers_list,
+                    lambda person: self.enrich_person_data(
                         person_relation=person,
                         president_id=president_id,
                         selected_date=selected_date
-                        ) for  person in appointed_ministers_list
-                ]
-                # result contains portfolio_task result and person_data results respectively
-                results = await asyncio.gather(portfolio_task, *person_data, return_exceptions=True)
+                    ),
+                    return_exceptions=True
+                )
+                # result contains portfolio_task result and the person_data results respectively
+                portfolio_result, person_data_list = await asyncio.gather(portfolio_task, person_data, return_exceptions=True)
                 
-                portfolio_data = results[0][0]
-                person_data_list = results[1:]
+                portfolio_data = portfolio_result[0]
             else:
                 # if the appointed minister list is empty, assign the president(for that date) for that selected date
                 president_enrich_task = self.enrich_person_data(
@@ -139,7 +144,7 @@ class OrganisationService:
 
             return portfolio_dict
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise  
         except Exception as e:
             logger.error(f"Error enriching portfolio item: {e}")
@@ -159,7 +164,7 @@ class OrganisationService:
 
             return results
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Error fetching portfolio item: {e}")
@@ -212,10 +217,11 @@ class OrganisationService:
             )
 
             # Process each portfolio item in parallel
-            results =await asyncio.gather(*[
-                self.process_portfolio_item(portfolio, president_id, selected_date)
-                for portfolio in activePortfolioList
-            ], return_exceptions=True)
+            results = await fan_out(
+                activePortfolioList,
+                lambda portfolio: self.process_portfolio_item(portfolio, president_id, selected_date),
+                return_exceptions=True
+            )
 
             # Track successes and failures
             exceptions = []
@@ -258,7 +264,7 @@ class OrganisationService:
 
             return finalResult
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             raise InternalServerError("An unexpected error occurred") from e
@@ -332,13 +338,12 @@ class OrganisationService:
                 relation=relation
             )
             
-            # tasks to run in parallel
-            enrich_department_tasks = [
-                self.enrich_department_item(department_relation=department_relation, selected_date=selected_date)
-                for department_relation in department_relation_list
-            ]
-
-            results = await asyncio.gather(*enrich_department_tasks, return_exceptions=True)
+            # enrich the departments in parallel
+            results = await fan_out(
+                department_relation_list,
+                lambda department_relation: self.enrich_department_item(department_relation=department_relation, selected_date=selected_date),
+                return_exceptions=True
+            )
 
             departments = [
                 r for r in results if not isinstance(r, Exception)
@@ -356,7 +361,7 @@ class OrganisationService:
 
             return finalResult
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             raise InternalServerError("An unexpected error occurred") from e
@@ -415,7 +420,7 @@ class OrganisationService:
 
             return final_result
         
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             raise InternalServerError("An unexpected error occurred") from e
@@ -457,12 +462,11 @@ class OrganisationService:
             if not minister_ids:
                 return departments_results
 
-            tasks_for_departments = [
-                self.get_active_departments(minister_id, selected_date)
-                for minister_id in minister_ids
-            ]
-            
-            departments_results = await asyncio.gather(*tasks_for_departments, return_exceptions=True)
+            departments_results = await fan_out(
+                minister_ids,
+                lambda minister_id: self.get_active_departments(minister_id, selected_date),
+                return_exceptions=True
+            )
 
             flattened_results = []
             for result in departments_results:
@@ -470,7 +474,7 @@ class OrganisationService:
                     flattened_results.extend(result)
             return flattened_results
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             raise InternalServerError("An unexpected error occurred") from e
@@ -504,11 +508,11 @@ class OrganisationService:
             raise ValueError("At least 2 dates required for the comparison")
 
         try:
-            tasks_for_dates = [
-                self.get_ministers_and_departments(president_id, date)
-                for date in dates
-            ]
-            dates_gov_struct = await asyncio.gather(*tasks_for_dates, return_exceptions=True)
+            dates_gov_struct = await fan_out(
+                dates,
+                lambda date: self.get_ministers_and_departments(president_id, date),
+                return_exceptions=True
+            )
 
             departments_by_ministers = {} # maps department_id -> [node_index_at_date0, node_index_at_date1, ...] to track which minister held each department across dates
             name_lookup = {} # maps entity_id -> human-readable name, populated after fetching minister names
@@ -598,19 +602,10 @@ class OrganisationService:
             ]
             
             unique_ids = list({node['id'] for node in nodes})
-            tasks_for_getting_names = [
-                self.opengin_service.get_entities(
-                    entity= Entity(id=id)
-                )
-                for id in unique_ids
-            ]
-            name_output = await asyncio.gather(*tasks_for_getting_names, return_exceptions=True) 
-            
-            for name_obj in name_output:
-                if isinstance(name_obj, Exception):
-                    continue
-                for name in name_obj:
-                    name_lookup[name.id] = Util.decode_protobuf_attribute_name(name.name)
+            minister_entities, _ = await self.opengin_service.get_entities_by_ids(unique_ids, projection=NAME_PROJECTION)
+
+            for minister_id, minister_entity in minister_entities.items():
+                name_lookup[minister_id] = Util.decode_protobuf_attribute_name(minister_entity.name)
                         
             for node in nodes:
                 node["name"] = name_lookup.get(node['id'])
@@ -620,7 +615,7 @@ class OrganisationService:
                 "links": links,
                 "dates": date_status,
             }
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             raise InternalServerError("An unexpected error occurred") from e
@@ -645,23 +640,25 @@ class OrganisationService:
     # helper : fetch entities in parallel and map them by id
     async def _fetch_and_map_entities(self, entity_ids: list[str]) -> dict[str, Entity]:
         """Fetch multiple entities in parallel and return a map by ID."""
-        tasks = [self.opengin_service.get_entities(Entity(id=entity_id)) for entity_id in entity_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        entity_map = {}
-        for result in results:
-            if not isinstance(result, Exception) and result:
-                entity_map[result[0].id] = result[0]
+        entity_map, failures = await self.opengin_service.get_entities_by_ids(entity_ids)
+        if any(not isinstance(error, NotFoundError) for error in failures.values()):
+            mark_partial()
         return entity_map
 
     # helper : fetch relations for multiple entities in parallel and map them by id
     async def _fetch_and_map_relations(self, entity_ids: list[str], relation_query: Relation) -> dict[str, list[Relation]]:
         """Fetch relations for multiple entities in parallel and map them."""
-        tasks = [self.opengin_service.fetch_relation(entityId=entity_id, relation=relation_query) for entity_id in entity_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await fan_out(
+            entity_ids,
+            lambda entity_id: self.opengin_service.fetch_relation(entityId=entity_id, relation=relation_query),
+            return_exceptions=True
+        )
         relation_map = {}
         for i, result in enumerate(results):
             entity_id = entity_ids[i]
             relation_map[entity_id] = result if not isinstance(result, Exception) else []
+            if isinstance(result, Exception) and not isinstance(result, NotFoundError):
+                mark_partial()
         return relation_map
 
     # API: department history timeline for the given department
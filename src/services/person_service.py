@@ -3,11 +3,15 @@ from src.enums.relationEnum import RelationNameEnum
 from src.exception.exceptions import BadRequestError
 from src.exception.exceptions import NotFoundError
 from src.exception.exceptions import InternalServerError
+from src.exception.exceptions import GatewayTimeoutError
 import asyncio
 from src.utils.util_functions import Util
+from src.utils.fan_out import fan_out
+from src.utils.response_cache import mark_partial
 from aiohttp import ClientSession
 from src.utils import http_client
 from src.models.organisation_schemas import Entity, Relation, Kind
+from src.models.projection import NAME_PROJECTION
 from src.enums.kindEnum import KindMajorEnum, KindMinorEnum
 from src.enums.idEnum import EntityIdEnum
 from src.models.person_schemas import PersonResponse
@@ -111,14 +115,18 @@ class PersonService:
                 else []
             )
 
-            tasks = [
-                self.enrich_history_item(relation, president_relations)
+            relations_to_enrich = [
+                relation
                 for relation in ministry_relations
                 if not relation.endTime  # if this is true, the second condition will not be evaluated
                 or relation.startTime.split("T")[0]
                 != relation.endTime.split("T")[0]  # short circuit evaluation
             ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await fan_out(
+                relations_to_enrich,
+                lambda relation: self.enrich_history_item(relation, president_relations),
+                return_exceptions=True
+            )
 
             ministry_history = [
                 r for r in results if r and not isinstance(r, Exception)
@@ -143,7 +151,7 @@ class PersonService:
 
             return final_result
 
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Error fetching person history: {e}")
@@ -231,12 +239,41 @@ class PersonService:
 
             return person_profile_res
             
-        except (BadRequestError, NotFoundError):
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Error fetching person profile: {e}")
             raise InternalServerError("An unexpected error occurred") from e
 
+    async def _fetch_gazette_ids_by_date(self, kind_minor: str) -> dict[str, list[str]]:
+        """
+        Streams all gazettes of a kind and groups their decoded ids by publication date.
+
+        The gazettes are aggregated as they arrive, so only the date -> ids map is kept in memory.
+
+        Args:
+            kind_minor (str): The minor kind of the gazettes (organisation or person gazettes)
+
+        Returns:
+            dict: A map of date -> list of unique gazette ids published on that date
+        """
+        gazettes_by_date = {}
+        async for gazette in self.opengin_service.iter_entities(
+            Entity(kind=Kind(major=KindMajorEnum.DOCUMENT.value, minor=kind_minor))
+        ):
+            date = gazette.created.split("T")[0]
+            try:
+                gazette_id = Util.decode_protobuf_attribute_name(gazette.name)
+            except Exception as e:
+                logger.warning(f"Could not decode gazette name")
+                gazette_id = "Unknown"
+
+            date_ids = gazettes_by_date.setdefault(date, [])
+            if gazette_id not in date_ids:
+                date_ids.append(gazette_id)
+
+        return gazettes_by_date
+
     async def fetch_all_presidents(self):
         """
         Fetches all presidents and their terms.
@@ -272,18 +309,8 @@ class PersonService:
                 relation=Relation(name=RelationNameEnum.AS_PRESIDENT.value),
             )
 
-            organization_gazettes_task = self.opengin_service.get_entities(
-                Entity(kind=Kind(
-                    major=KindMajorEnum.DOCUMENT.value, 
-                    minor=KindMinorEnum.EXTGZT_ORGANISATION.value
-                ))
-            )
-            person_gazettes_task = self.opengin_service.get_entities(
-                Entity(kind=Kind(
-                    major=KindMajorEnum.DOCUMENT.value, 
-                    minor=KindMinorEnum.EXTGZT_PERSON.value
-                ))
-            )
+            organization_gazettes_task = self._fetch_gazette_ids_by_date(KindMinorEnum.EXTGZT_ORGANISATION.value)
+            person_gazettes_task = self._fetch_gazette_ids_by_date(KindMinorEnum.EXTGZT_PERSON.value)
             
             results = await asyncio.gather(
                 president_relations_task, 
@@ -293,6 +320,8 @@ class PersonService:
             )
             president_relations, organization_gazettes, person_gazettes = results
             
+            if isinstance(president_relations, GatewayTimeoutError):
+                raise president_relations
             if isinstance(president_relations, Exception):
                 logger.error(f"Failed to fetch president relations: {president_relations}")
                 raise InternalServerError("An unexpected error occurred while fetching president relations")
@@ -330,40 +359,28 @@ class PersonService:
                     "term_data": term # Reference to the term dictionary
                 })
 
-            unique_president_ids = list(presidents_map.keys())
-            
             # Fetch president details - name
-            tasks = [self.opengin_service.get_entities(Entity(id=president_id)) for president_id in unique_president_ids]
-            entities_results = await asyncio.gather(*tasks, return_exceptions=True)
+            president_entities, failures = await self.opengin_service.get_entities_by_ids(presidents_map.keys(), projection=NAME_PROJECTION)
+            if any(not isinstance(error, NotFoundError) for error in failures.values()):
+                mark_partial()
 
             # Update the map with names
-            for i, president_id in enumerate(unique_president_ids):
-                entity_data = entities_results[i]
-                if not isinstance(entity_data, Exception) and entity_data:
-                    entity = entity_data[0]
-                    decoded_name = Util.decode_protobuf_attribute_name(entity.name)
-                    presidents_map[president_id]["name"] = decoded_name
-
-            # Combine all gazettes into a single list
-            all_gazettes = []
-            for gazette_result in (organization_gazettes, person_gazettes):
-                if not isinstance(gazette_result, Exception) and gazette_result:
-                    all_gazettes.extend(gazette_result)
+            for president_id, entity in president_entities.items():
+                decoded_name = Util.decode_protobuf_attribute_name(entity.name)
+                presidents_map[president_id]["name"] = decoded_name
 
-            # Group all gazettes globally by date first
+            # Combine the gazettes of both kinds, grouped globally by date
             gazettes_by_date = {}
-            for gazette in all_gazettes:
-                date = gazette.created.split("T")[0]
-                try:
-                    gazette_id = Util.decode_protobuf_attribute_name(gazette.name)
-                except Exception as e:
-                    logger.warning(f"Could not decode gazette name")
-                    gazette_id = "Unknown"
-                    
-                if date not in gazettes_by_date:
-                    gazettes_by_date[date] = []
-                if gazette_id not in gazettes_by_date[date]:
-                    gazettes_by_date[date].append(gazette_id)
+            for gazette_result in (organization_gazettes, person_gazettes):
+                if isinstance(gazette_result, Exception):
+                    logger.warning(f"Serving all presidents without part of the gazettes: {gazette_result}")
+                    mark_partial()
+                    continue
+                if not gazette_result:
+                    continue
+                for date, gazette_ids in gazette_result.items():
+                    date_ids = gazettes_by_date.setdefault(date, [])
+                    date_ids.extend(gazette_id for gazette_id in gazette_ids if gazette_id not in date_ids)
 
             # Sort both lists for chronological processing
             all_terms.sort(key=lambda x: x["start"])
@@ -395,6 +412,8 @@ class PersonService:
             )
 
             return {"presidents": presidents_list}
+        except (BadRequestError, NotFoundError, GatewayTimeoutError):
+            raise
         except Exception as e:
             logger.error(f"Error fetching all presidents: {e}")
             raise InternalServerError("An unexpected error occurred") from e
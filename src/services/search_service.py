@@ -1,11 +1,11 @@
-import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from src.enums import KindMajorEnum, KindMinorEnum
-from src.exception.exceptions import BadRequestError, InternalServerError
+from src.exception.exceptions import BadRequestError, InternalServerError, GatewayTimeoutError
 from src.models.organisation_schemas import Entity, Kind
 from src.models.search_schemas import SearchResult, SearchResponse
 from src.utils.util_functions import Util
+from src.utils.fan_out import fan_out
 
 logger = logging.getLogger(__name__)
 
@@ -58,18 +58,16 @@ class SearchService:
                 "person": (KindMajorEnum.PERSON.value, KindMinorEnum.CITIZEN.value, "persons"),
             }
 
-            # Build search tasks dynamically based on requested types
-            search_tasks = []
-            search_type_names = []
-
-            for entity_type in types_to_search:
-                if entity_type in entity_config:
-                    major, minor, display_name = entity_config[entity_type]
-                    search_tasks.append(self.entity_specific_search(major, minor, query, as_of_date, limit))
-                    search_type_names.append(display_name)
+            # Select the searches based on requested types
+            searches = [entity_config[entity_type] for entity_type in types_to_search if entity_type in entity_config]
+            search_type_names = [display_name for _, _, display_name in searches]
 
             # Run selected searches in parallel
-            results = await asyncio.gather(*search_tasks, return_exceptions=True)
+            results = await fan_out(
+                searches,
+                lambda search: self.entity_specific_search(search[0], search[1], query, as_of_date, limit),
+                return_exceptions=True
+            )
 
             # Collect successful results, log errors
             all_results: List[Dict[str, Any]] = []
@@ -96,7 +94,7 @@ class SearchService:
                 results=search_results
             )
 
-        except BadRequestError:
+        except (BadRequestError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Unified search failed: {e}")
@@ -163,7 +161,7 @@ class SearchService:
             # Apply limit if specified
             return matching[:limit] if limit else matching
 
-        except BadRequestError:
+        except (BadRequestError, GatewayTimeoutError):
             raise
         except Exception as e:
             logger.error(f"Error in generic_search for {major}/{minor}: {e}")
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Any, Awaitable, Callable, Optional
+from src.core.config import settings
+from src.enums import PriorityEnum
+from src.services.data_service import DataService
+from src.services.organisation_service import OrganisationService
+from src.services.person_service import PersonService
+from src.utils.data_loader import request_scope
+from src.utils.deadline import reset_deadline, start_deadline
+from src.utils.priority import request_priority
+from src.utils.readiness import readiness
+from src.utils.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupService:
+    """
+    This service is responsible for preloading the caches behind the hottest views when a worker starts.
+
+    It fetches all presidents and their terms (also into the response cache of the all-presidents
+    route), then the current cabinet for today through active_portfolio_list, the prime minister
+    and the top-level data catalog categories. The whole warm-up shares one set of request loaders
+    and is bounded by WARMUP_TIMEOUT. Each step is timed and logged, a failed step does not stop
+    the others, and the readiness flag flips once the warm-up is over.
+    """
+
+    def __init__(self, opengin_service):
+        self.opengin_service = opengin_service
+        self.person_service = PersonService(opengin_service)
+        self.organisation_service = OrganisationService(opengin_service)
+        self.data_service = DataService(opengin_service)
+
+    async def run(self, priority: PriorityEnum = PriorityEnum.INTERACTIVE):
+        """
+        Run the warm-up and mark the worker ready.
+
+        Args:
+            priority (PriorityEnum): Priority of the OpenGIN calls, BACKGROUND when the worker
+                already serves traffic so user requests go first.
+        """
+        readiness.start_warmup()
+        logger.info(f"Cache warm-up started ({priority.value} priority)")
+        token = start_deadline(settings.WARMUP_TIMEOUT)
+        try:
+            with request_priority(priority), request_scope():
+                async with asyncio.timeout(settings.WARMUP_TIMEOUT):
+                    await self._warm()
+        except TimeoutError:
+            logger.warning(f"Cache warm-up did not finish within {settings.WARMUP_TIMEOUT}s")
+        finally:
+            reset_deadline(token)
+            readiness.mark_ready()
+        failed = [name for name, step in readiness.steps.items() if not step["ok"]]
+        logger.info(f"Cache warm-up finished in {readiness.warmup_seconds:.2f}s" + (f", failed steps: {', '.join(failed)}" if failed else ""))
+
+    async def _warm(self):
+        today = date.today().isoformat()
+        presidents = await self._step("presidents", response_cache.warm, "/v1/person/all-presidents", self.person_service.fetch_all_presidents)
+
+        steps = [
+            self._step("prime_minister", self.organisation_service.fetch_prime_minister, today),
+            self._step("data_catalog", self.data_service.fetch_data_catalog),
+        ]
+        president_id = self._current_president_id(presidents)
+        if president_id:
+            steps.append(self._step("current_cabinet", self.organisation_service.active_portfolio_list, president_id, today))
+        else:
+            logger.warning("Cache warm-up skips the current cabinet, no president in office was found")
+        await asyncio.gather(*steps)
+
+    @staticmethod
+    def _current_president_id(presidents: Optional[dict]) -> Optional[str]:
+        """The id of the president whose term has no end, from the all presidents response"""
+        for president in (presidents or {}).get("presidents", []):
+            if any(term.get("end") is None for term in president.get("terms", [])):
+                return president["id"]
+        return None
+
+    async def _step(self, name: str, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        started_at = time.monotonic()
+        try:
+            result = await fn(*args)
+        except Exception as e:
+            seconds = time.monotonic() - started_at
+            readiness.record_step(name, seconds, e)
+            logger.warning(f"Cache warm-up step {name} failed after {seconds:.2f}s: {e}")
+            return None
+        seconds = time.monotonic() - started_at
+        readiness.record_step(name, seconds)
+        logger.info(f"Cache warm-up step {name} done in {seconds:.2f}s")
+        return result
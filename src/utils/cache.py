@@ -0,0 +1,182 @@
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union
+from src.core.config import settings
+from src.exception.exceptions import NotFoundError
+from src.utils.shared_cache import SharedCache, estimate_size
+from src.utils.disk_cache import TieredCache, disk_store
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with a time-to-live per entry and LRU eviction.
+
+    Expired entries are dropped lazily when they are read. When the cache is full the
+    least recently used entry is evicted to make room for a new one.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._key_hits: Counter[Hashable] = Counter()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for the key, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._key_hits.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._key_hits[key] += 1
+        return value
+
+    async def aget(self, key: Hashable) -> Optional[Any]:
+        """get for callers on the event loop, the same here since nothing leaves the process"""
+        return self.get(key)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store the value, using the cache TTL unless a per-entry TTL is given"""
+        if self.max_entries <= 0:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (expires_at, value)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._key_hits.pop(evicted, None)
+            self.evictions += 1
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self.set(key, value, ttl=ttl)
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+        self._key_hits.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> list[Hashable]:
+        """Remove the entries for which predicate(key, value) is true, returns their keys"""
+        removed = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+        for key in removed:
+            self.delete(key)
+        return removed
+
+    def top_keys(self, count: int) -> list[dict]:
+        """The cached keys with the most hits"""
+        return [{"key": str(key), "hits": hits} for key, hits in self._key_hits.most_common(count)]
+
+    def memory_bytes(self) -> int:
+        """Rough size of the cached values, as the length of their JSON encoding. Walks every entry"""
+        return sum(estimate_size(value) for _, value in self._entries.values())
+
+    def clear(self):
+        self._entries.clear()
+        self._key_hits.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # Async forms of the whole-cache operations, run in a thread by the backends that do I/O
+    async def adelete_where(self, predicate: Callable[[Hashable, Any], bool]) -> list[Hashable]:
+        return self.delete_where(predicate)
+
+    async def amemory_bytes(self) -> int:
+        return self.memory_bytes()
+
+    async def asize(self) -> int:
+        return len(self)
+
+    async def aclear(self):
+        self.clear()
+
+    async def astats(self) -> dict:
+        return self.stats()
+
+
+class NotFoundCache(TTLCache):
+    """
+    Negative cache remembering which upstream calls recently answered 404.
+
+    Entries are keyed by (operation, call key) and hold the not found message, so a repeated
+    lookup of a dead id raises the same NotFoundError without an upstream round-trip.
+    The TTL is short so ids that start to exist are picked up again quickly.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float):
+        super().__init__(name, max_entries, ttl)
+        self.short_circuits: Counter[str] = Counter()
+
+    def check(self, operation: str, key: Hashable):
+        """Raise the remembered NotFoundError if the call recently answered 404"""
+        if not settings.CACHE_ENABLED:
+            return
+        message = self.get((operation, key))
+        if message is not None:
+            self.short_circuits[operation] += 1
+            raise NotFoundError(message)
+
+    def remember(self, operation: str, key: Hashable, error: NotFoundError):
+        if settings.CACHE_ENABLED:
+            self.set((operation, key), error.detail)
+
+    def clear(self):
+        super().clear()
+        self.short_circuits.clear()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "short_circuits": dict(self.short_circuits)}
+
+
+def create_cache(name: str, max_entries: int, ttl: float) -> Union[TTLCache, SharedCache, TieredCache]:
+    """
+    Create a cache on the backend selected by CACHE_BACKEND.
+
+    "memory" keeps the entries in the worker process, "sqlite" shares them between all the
+    workers of the host through the database at CACHE_SQLITE_PATH. With CACHE_DISK_PATH set
+    the entries are also persisted there and survive restarts.
+    """
+    if settings.CACHE_BACKEND == "sqlite":
+        cache = SharedCache(name, max_entries=max_entries, ttl=ttl, path=settings.CACHE_SQLITE_PATH, busy_timeout=settings.CACHE_SQLITE_BUSY_TIMEOUT)
+    else:
+        cache = TTLCache(name, max_entries=max_entries, ttl=ttl)
+    return TieredCache(cache, disk_store) if disk_store is not None else cache
+
+
+# Create the global caches
+entity_cache = create_cache("entities", max_entries=settings.CACHE_ENTITY_MAX_ENTRIES, ttl=settings.CACHE_ENTITY_TTL)
+relation_cache = create_cache("relations", max_entries=settings.CACHE_RELATION_MAX_ENTRIES, ttl=settings.CACHE_RELATION_TTL)
+dataset_cache = create_cache("datasets", max_entries=settings.CACHE_DATASET_MAX_ENTRIES, ttl=settings.CACHE_DATASET_TTL)
+# 404s are short lived and cheap to relearn, each worker keeps its own
+not_found_cache = NotFoundCache("not_found", max_entries=settings.CACHE_NOT_FOUND_MAX_ENTRIES, ttl=settings.CACHE_NOT_FOUND_TTL)
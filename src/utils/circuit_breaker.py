@@ -0,0 +1,181 @@
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from src.core.config import settings
+from src.enums import CircuitStateEnum
+from src.exception.exceptions import BadRequestError, GatewayTimeoutError, NotFoundError, ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream operation.
+
+    - CLOSED: calls pass through, and their outcomes are recorded in a sliding window of the
+      last `window_size` calls. Once the window holds at least `minimum_calls` outcomes and the
+      failure rate reaches `failure_rate_threshold`, the circuit opens.
+    - OPEN: calls fail fast with ServiceUnavailableError for `open_seconds`.
+    - HALF_OPEN: up to `half_open_calls` probe calls are let through. If they all succeed the
+      circuit closes, a single failure opens it again.
+
+    Not found and bad request responses mean the upstream is healthy, so they count as successes.
+    Calls cut short by the request deadline (GatewayTimeoutError) count as neither, the deadline
+    is chosen by the client and says nothing about the upstream.
+    """
+
+    def __init__(self, name: str, failure_rate_threshold: float, window_size: int, minimum_calls: int, open_seconds: float, half_open_calls: int):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self.state = CircuitStateEnum.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    @contextmanager
+    def protect(self):
+        """Guard one upstream call, raising ServiceUnavailableError without calling it while the circuit is open"""
+        is_probe = self._acquire()
+        try:
+            yield
+        except (NotFoundError, BadRequestError):
+            self._on_success(is_probe)
+            raise
+        except GatewayTimeoutError:
+            self._on_neutral(is_probe)
+            raise
+        except Exception:
+            self._on_failure(is_probe)
+            raise
+        except BaseException:
+            self._on_neutral(is_probe)
+            raise
+        else:
+            self._on_success(is_probe)
+
+    def _acquire(self) -> bool:
+        if self.state == CircuitStateEnum.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                raise ServiceUnavailableError(f"OpenGIN {self.name} is unavailable, please try again shortly")
+            self._transition(CircuitStateEnum.HALF_OPEN)
+
+        if self.state == CircuitStateEnum.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_calls:
+                self.rejected += 1
+                raise ServiceUnavailableError(f"OpenGIN {self.name} is unavailable, please try again shortly")
+            self._probes_in_flight += 1
+            return True
+
+        return False
+
+    def _on_neutral(self, is_probe: bool):
+        # cancelled calls and expired deadlines tell nothing about the upstream health
+        if is_probe:
+            self._probes_in_flight -= 1
+
+    def _on_success(self, is_probe: bool):
+        if is_probe:
+            self._probes_in_flight -= 1
+            if self.state == CircuitStateEnum.HALF_OPEN:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    self._transition(CircuitStateEnum.CLOSED)
+            return
+
+        if self.state == CircuitStateEnum.CLOSED:
+            self._outcomes.append(False)
+
+    def _on_failure(self, is_probe: bool):
+        if is_probe:
+            self._probes_in_flight -= 1
+            if self.state == CircuitStateEnum.HALF_OPEN:
+                self._transition(CircuitStateEnum.OPEN)
+            return
+
+        if self.state != CircuitStateEnum.CLOSED:
+            return
+
+        self._outcomes.append(True)
+        if len(self._outcomes) >= self.minimum_calls and self.failure_rate >= self.failure_rate_threshold:
+            self._transition(CircuitStateEnum.OPEN)
+
+    def _transition(self, state: CircuitStateEnum):
+        previous = self.state
+        self.state = state
+
+        if state == CircuitStateEnum.OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+            logger.warning(f"Circuit breaker '{self.name}' opened ({previous.value} -> open), failure rate {self.failure_rate:.0%} over {len(self._outcomes)} calls")
+        elif state == CircuitStateEnum.HALF_OPEN:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+            logger.info(f"Circuit breaker '{self.name}' half-open, letting {self.half_open_calls} probe calls through")
+        else:
+            self._outcomes.clear()
+            logger.info(f"Circuit breaker '{self.name}' closed, upstream recovered")
+
+    def reset(self):
+        self.state = CircuitStateEnum.CLOSED
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "failure_rate": round(self.failure_rate, 4),
+            "window_calls": len(self._outcomes),
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Holds one circuit breaker per upstream operation, created on first use from the settings"""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_rate_threshold=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+                window_size=settings.CIRCUIT_BREAKER_WINDOW_SIZE,
+                minimum_calls=settings.CIRCUIT_BREAKER_MINIMUM_CALLS,
+                open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+                half_open_calls=settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+            )
+            self._breakers[name] = breaker
+        return breaker
+
+    def reset(self):
+        for breaker in self._breakers.values():
+            breaker.reset()
+
+    def stats(self) -> dict:
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
+
+
+# Create a global instance
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,89 @@
+import zlib
+from collections import defaultdict
+from typing import Optional
+
+
+class Decompressor:
+    """
+    Incremental decoder for a response body sent with the given Content-Encoding.
+
+    Supports gzip and deflate (both the zlib wrapped form and the raw form some servers
+    send), no encoding or "identity" passes the bytes through unchanged.
+    """
+
+    def __init__(self, encoding: Optional[str]):
+        self.encoding = (encoding or "identity").strip().lower()
+        if self.encoding not in ("gzip", "deflate", "identity"):
+            raise ValueError(f"Unsupported Content-Encoding '{encoding}'")
+        # deflate picks its format from the first bytes, see feed()
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if self.encoding == "gzip" else None
+
+    def feed(self, chunk: bytes) -> bytes:
+        if not chunk:
+            return b""
+        if self.encoding == "deflate" and self._decoder is None:
+            # a zlib header starts with 0x78, anything else is raw deflate
+            self._decoder = zlib.decompressobj(zlib.MAX_WBITS if chunk[:1] == b"\x78" else -zlib.MAX_WBITS)
+        if self._decoder is None:
+            return chunk
+        return self._decoder.decompress(chunk)
+
+    def flush(self) -> bytes:
+        return self._decoder.flush() if self._decoder is not None else b""
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Decode a whole response body sent with the given Content-Encoding"""
+    decompressor = Decompressor(encoding)
+    return decompressor.feed(body) + decompressor.flush()
+
+
+class PayloadStats:
+    """
+    Per-operation accounting of upstream response sizes and the time spent decoding them.
+
+    Wire bytes are the body as received (compressed when the upstream compressed it),
+    decoded bytes the body after decompression. Decompression and parsing are timed apart,
+    so the CPU cost of compression can be weighed against the bandwidth it saves.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._operations: dict[str, dict] = defaultdict(lambda: {
+            "responses": 0,
+            "compressed_responses": 0,
+            "wire_bytes": 0,
+            "decoded_bytes": 0,
+            "decompress_seconds": 0.0,
+            "decode_seconds": 0.0,
+        })
+
+    def record(self, operation: str, encoding: Optional[str], wire_bytes: int, decoded_bytes: int, decompress_seconds: float, decode_seconds: float):
+        counts = self._operations[operation]
+        counts["responses"] += 1
+        if encoding and encoding.lower() != "identity":
+            counts["compressed_responses"] += 1
+        counts["wire_bytes"] += wire_bytes
+        counts["decoded_bytes"] += decoded_bytes
+        counts["decompress_seconds"] += decompress_seconds
+        counts["decode_seconds"] += decode_seconds
+
+    def stats(self) -> dict:
+        return {
+            operation: {
+                "responses": counts["responses"],
+                "compressed_responses": counts["compressed_responses"],
+                "wire_bytes": counts["wire_bytes"],
+                "decoded_bytes": counts["decoded_bytes"],
+                "compression_ratio": round(counts["decoded_bytes"] / counts["wire_bytes"], 2) if counts["wire_bytes"] else None,
+                "avg_decompress_ms": round(counts["decompress_seconds"] / counts["responses"] * 1000, 3),
+                "avg_decode_ms": round(counts["decode_seconds"] / counts["responses"] * 1000, 3),
+            }
+            for operation, counts in self._operations.items()
+        }
+
+
+# Create a global instance
+payload_stats = PayloadStats()
@@ -0,0 +1,220 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+from aiohttp import ClientConnectionError, ClientResponseError
+from src.core.config import settings
+from src.enums import PriorityEnum
+from src.exception.exceptions import BadRequestError, NotFoundError
+from src.utils.hedging import LatencyTracker
+from src.utils.priority import current_priority
+
+
+def _milliseconds(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limiter for the number of requests in flight to an upstream.
+
+    Requests above the current limit wait in a FIFO queue for a slot. After each request:
+    - a timeout, connection error, 429 or 5xx response, or a latency above `latency_tolerance`
+      times the smoothed latency of the same operation multiplies the limit by `backoff_ratio`
+      (multiplicative decrease)
+    - any other outcome raises the limit by one, as long as at least half of it is in use
+      (additive increase), so the limit only grows when there is demand for it
+
+    The limit stays between `min_limit` and `max_limit`. Not found and bad request responses
+    are answers from a healthy upstream and count as successes. Latency is smoothed per
+    operation, a heavy search is only compared with other heavy searches and never makes an
+    id lookup look congested. Calls whose duration says nothing about the upstream, such as
+    streams held open while the caller consumes them, are not sampled at all.
+
+    Requests queue in the lane of their priority (see request_priority). Freed slots go to
+    interactive requests first, background requests only get spare capacity, except for
+    `background_reserved` slots they are always entitled to so that background work completes.
+    """
+
+    def __init__(self, initial_limit: int, min_limit: int, max_limit: int, backoff_ratio: float, latency_tolerance: float, background_reserved: int = 0, smoothing: float = 0.05):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.background_reserved = background_reserved
+        self.smoothing = smoothing
+
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.smoothed_latency: dict[str, float] = {}
+        self._waiters: dict[PriorityEnum, deque[asyncio.Future]] = {priority: deque() for priority in PriorityEnum}
+        self._lane_in_flight: dict[PriorityEnum, int] = {priority: 0 for priority in PriorityEnum}
+        self.queue_wait = LatencyTracker()
+        self.latency = LatencyTracker()
+
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    @asynccontextmanager
+    async def slot(self, operation: str = "default", sample_latency: bool = True):
+        """
+        Hold one in-flight slot for the duration of an upstream call, waiting for one if needed.
+
+        Args:
+            operation (str): The kind of call, its latency is compared with calls of the same kind.
+            sample_latency (bool): False when the duration of the call is not the upstream latency.
+        """
+        priority = current_priority()
+        await self._acquire(priority)
+        started_at = time.monotonic()
+
+        def latency() -> Optional[float]:
+            return time.monotonic() - started_at if sample_latency else None
+
+        try:
+            yield
+        except (NotFoundError, BadRequestError):
+            self._release(priority, operation, latency(), dropped=False)
+            raise
+        except Exception as e:
+            if self._is_overload(e):
+                self._release(priority, operation, latency(), dropped=True)
+            else:
+                self._release(priority, operation, None, dropped=False)
+            raise
+        except BaseException:
+            # cancelled calls tell nothing about the upstream
+            self._release(priority, operation, None, dropped=False)
+            raise
+        else:
+            self._release(priority, operation, latency(), dropped=False)
+
+    @staticmethod
+    def _is_overload(exception: Exception) -> bool:
+        if isinstance(exception, ClientResponseError):
+            return exception.status == 429 or exception.status >= 500
+        return isinstance(exception, (ClientConnectionError, asyncio.TimeoutError))
+
+    async def _acquire(self, priority: PriorityEnum):
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+        self._wake()
+        if waiter.done():
+            self.queue_wait.record(priority.value, 0.0)
+            return
+
+        queued_at = time.monotonic()
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as the caller gave up, pass it on
+                self.in_flight -= 1
+                self._lane_in_flight[priority] -= 1
+                self._wake()
+            elif waiter in self._waiters[priority]:
+                self._waiters[priority].remove(waiter)
+            raise
+        self.queue_wait.record(priority.value, time.monotonic() - queued_at)
+
+    def _release(self, priority: PriorityEnum, operation: str, latency: Optional[float], dropped: bool):
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        self._lane_in_flight[priority] -= 1
+
+        if dropped:
+            self._decrease()
+        elif latency is not None:
+            self.latency.record(priority.value, latency)
+            smoothed = self.smoothed_latency.get(operation)
+            congested = smoothed is not None and latency > smoothed * self.latency_tolerance
+            self.smoothed_latency[operation] = latency if smoothed is None else (1 - self.smoothing) * smoothed + self.smoothing * latency
+            if congested:
+                self._decrease()
+            elif in_flight * 2 >= self.limit and self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1)
+                self.increases += 1
+
+        self._wake()
+
+    def _decrease(self):
+        limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        if limit < self.limit:
+            self.limit = limit
+            self.decreases += 1
+
+    def _next_lane(self) -> Optional[PriorityEnum]:
+        background, interactive = self._waiters[PriorityEnum.BACKGROUND], self._waiters[PriorityEnum.INTERACTIVE]
+        if background and self._lane_in_flight[PriorityEnum.BACKGROUND] < self.background_reserved:
+            return PriorityEnum.BACKGROUND
+        if interactive:
+            return PriorityEnum.INTERACTIVE
+        if background:
+            return PriorityEnum.BACKGROUND
+        return None
+
+    def _wake(self):
+        while self.in_flight < int(self.limit):
+            priority = self._next_lane()
+            if priority is None:
+                return
+            waiter = self._waiters[priority].popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                self._lane_in_flight[priority] += 1
+                waiter.set_result(None)
+
+    def reset(self):
+        self.limit = float(self.initial_limit)
+        self.smoothed_latency.clear()
+        self.queue_wait.clear()
+        self.latency.clear()
+        self.increases = 0
+        self.decreases = 0
+
+    def stats(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "smoothed_latency_ms": {operation: _milliseconds(latency) for operation, latency in self.smoothed_latency.items()},
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "lanes": {
+                priority.value: {
+                    "in_flight": self._lane_in_flight[priority],
+                    "queued": len(self._waiters[priority]),
+                    "queue_wait_p50_ms": _milliseconds(self.queue_wait.percentile(priority.value, 50)),
+                    "queue_wait_p95_ms": _milliseconds(self.queue_wait.percentile(priority.value, 95)),
+                    "latency_p50_ms": _milliseconds(self.latency.percentile(priority.value, 50)),
+                    "latency_p95_ms": _milliseconds(self.latency.percentile(priority.value, 95)),
+                }
+                for priority in PriorityEnum
+            },
+        }
+
+
+# Create the global instances, one per connection pool so slow bulk downloads neither hold
+# lookup slots nor feed their latencies into the lookup limit
+opengin_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=settings.CONCURRENCY_LIMIT_INITIAL,
+    min_limit=settings.CONCURRENCY_LIMIT_MIN,
+    max_limit=settings.CONCURRENCY_LIMIT_MAX,
+    backoff_ratio=settings.CONCURRENCY_LIMIT_BACKOFF_RATIO,
+    latency_tolerance=settings.CONCURRENCY_LIMIT_LATENCY_TOLERANCE,
+    background_reserved=settings.CONCURRENCY_BACKGROUND_RESERVED,
+)
+opengin_bulk_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=settings.CONCURRENCY_BULK_LIMIT_INITIAL,
+    min_limit=settings.CONCURRENCY_BULK_LIMIT_MIN,
+    max_limit=settings.CONCURRENCY_BULK_LIMIT_MAX,
+    backoff_ratio=settings.CONCURRENCY_LIMIT_BACKOFF_RATIO,
+    latency_tolerance=settings.CONCURRENCY_LIMIT_LATENCY_TOLERANCE,
+    background_reserved=min(settings.CONCURRENCY_BACKGROUND_RESERVED, settings.CONCURRENCY_BULK_LIMIT_MIN),
+)
@@ -0,0 +1,128 @@
+import asyncio
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class DataLoader:
+    """
+    Request-scoped loader batching, deduplicating and memoizing loads by key.
+
+    Keys requested during the same event loop tick are collected and handed to `batch_fn`
+    together once the tick ends. Every key is loaded at most once: later loads of the same
+    key, in the same tick or later in the request, share the first result or exception.
+
+    `batch_fn` receives the list of new keys and returns one result per key in the same order,
+    an exception in place of a result fails the loads of that key only. It runs outside of the
+    request scope, so it may call the very functions that load through this loader.
+    """
+
+    def __init__(self, name: str, batch_fn: Callable[[list[Hashable]], Awaitable[list[Any]]]):
+        self.name = name
+        self.batch_fn = batch_fn
+        self._memo: dict[Hashable, asyncio.Future] = {}
+        self._pending: list[Hashable] = []
+        self._batches: set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable) -> Any:
+        loader_stats.loads[self.name] += 1
+        future = self._memo.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._memo[key] = future
+            self._pending.append(key)
+            if len(self._pending) == 1:
+                loop.call_soon(self._dispatch)
+        # shielded so a caller giving up does not fail the load for the others sharing it
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        keys, self._pending = self._pending, []
+        loader_stats.batches[self.name] += 1
+        loader_stats.keys[self.name] += len(keys)
+        context = copy_context()
+        context.run(_request_loaders.set, None)
+        batch = asyncio.get_running_loop().create_task(self._run(keys), context=context)
+        self._batches.add(batch)
+        batch.add_done_callback(self._batches.discard)
+
+    async def _run(self, keys: list[Hashable]):
+        try:
+            results = await self.batch_fn(keys)
+        except asyncio.CancelledError:
+            for key in keys:
+                self._memo[key].cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(keys)
+
+        for key, result in zip(keys, results):
+            future = self._memo[key]
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+                # nobody may be waiting any more, do not report the exception as never retrieved
+                future.exception()
+            else:
+                future.set_result(result)
+
+
+class RequestLoaders:
+    """The DataLoaders of one request, each created on first use"""
+
+    def __init__(self):
+        self._loaders: dict[str, DataLoader] = {}
+
+    def get(self, name: str, batch_fn: Callable[[list[Hashable]], Awaitable[list[Any]]]) -> DataLoader:
+        loader = self._loaders.get(name)
+        if loader is None:
+            loader = self._loaders[name] = DataLoader(name, batch_fn)
+        return loader
+
+
+class LoaderStats:
+    """Process-wide counters of the request loaders, loads above keys are the ones answered without a new upstream call"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.loads: Counter[str] = Counter()
+        self.batches: Counter[str] = Counter()
+        self.keys: Counter[str] = Counter()
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "loads": self.loads[name],
+                "batches": self.batches[name],
+                "keys": self.keys[name],
+                "deduplicated": self.loads[name] - self.keys[name],
+            }
+            for name in self.loads
+        }
+
+
+_request_loaders: ContextVar[Optional[RequestLoaders]] = ContextVar("request_loaders", default=None)
+
+
+def current_loaders() -> Optional[RequestLoaders]:
+    """The loaders of the current request, None outside of a request scope"""
+    return _request_loaders.get()
+
+
+@contextmanager
+def request_scope():
+    """Give the code run inside, and the tasks it starts, a fresh set of request loaders"""
+    token = _request_loaders.set(RequestLoaders())
+    try:
+        yield
+    finally:
+        _request_loaders.reset(token)
+
+
+# Create a global instance
+loader_stats = LoaderStats()
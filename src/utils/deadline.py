@@ -0,0 +1,71 @@
+import asyncio
+import time
+from contextvars import Context, ContextVar, Token, copy_context
+from typing import Any, Awaitable, Callable, Optional
+from src.exception.exceptions import GatewayTimeoutError
+
+DEADLINE_EXCEEDED_MESSAGE = "The request deadline was exceeded while waiting for OpenGIN"
+
+# Monotonic time at which the current request has to be answered, None outside of a request
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def start_deadline(seconds: float) -> Token:
+    """Set the deadline of the current context to `seconds` from now, returns the token to reset it with"""
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token: Token):
+    _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """The monotonic time at which the current request has to be answered, None without a deadline"""
+    return _deadline.get()
+
+
+def context_with_deadline(deadline: Optional[float]) -> Context:
+    """A copy of the current context with the given deadline, for work shared by callers with deadlines of their own"""
+    context = copy_context()
+    context.run(_deadline.set, deadline)
+    return context
+
+
+def extend_deadline(context: Context, deadline: Optional[float]):
+    """Push the deadline of a context (not currently running) back to `deadline` if that is later, None meaning no deadline"""
+    current = context.get(_deadline)
+    if current is not None and (deadline is None or deadline > current):
+        context.run(_deadline.set, deadline)
+
+
+def remaining_time() -> Optional[float]:
+    """Return the seconds left until the deadline (negative once expired), None when there is no deadline"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_expired() -> bool:
+    budget = remaining_time()
+    return budget is not None and budget <= 0
+
+
+async def run_within_deadline(fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """
+    Await fn(*args, **kwargs) for at most the remaining time of the current deadline.
+
+    Raises GatewayTimeoutError when the deadline has passed before or while waiting.
+    Without a deadline the call is awaited as is.
+    """
+    budget = remaining_time()
+    if budget is None:
+        return await fn(*args, **kwargs)
+    if budget <= 0:
+        raise GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE)
+
+    try:
+        async with asyncio.timeout(budget):
+            return await fn(*args, **kwargs)
+    except TimeoutError as e:
+        raise GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE) from e
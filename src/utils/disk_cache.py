@@ -0,0 +1,411 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from src.core.config import settings
+from src.utils.shared_cache import decode_value, encode_value
+
+logger = logging.getLogger(__name__)
+
+# Part of every entry key, bump it when the cached models change so older entries are never read
+DISK_CACHE_VERSION = 1
+
+_MAGIC = b"GIC1"
+_CHECKSUM_SIZE = 16
+_ENTRY_SUFFIX = ".entry"
+
+
+class DiskStore:
+    """
+    Persistent cache directory for OpenGIN responses, surviving restarts and deploys.
+
+    Each entry is a file named after the hash of its versioned key, under a subdirectory per
+    cache. A file holds a header (the key and the wall clock expiry) and the encoded value,
+    behind a checksum of both: a truncated or corrupted file is deleted on read instead of
+    being served. Files are written to a temporary name and renamed into place, so readers,
+    including other workers sharing the directory, never see a partial entry.
+
+    The total size is capped at `max_bytes` by evicting the least recently used files, the
+    modification time of a file records its last use so the order survives a restart.
+    The index of the files on disk, needed only for eviction, is built lazily (see
+    load_index), boot never waits for the directory to be scanned. Every worker sharing the
+    directory writes to it, so the index is rebuilt from the directory at most every
+    `rescan_interval` seconds before evicting: the cap holds for the directory as a whole,
+    give or take what the other workers wrote since the last scan.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, touch_interval: float = 60, rescan_interval: float = 60):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.rescan_interval = rescan_interval
+        self._scanned_at = 0.0
+        self._index: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._bytes = 0
+        self._index_loaded = False
+        self._index_loading = False
+        self._lock = threading.Lock()
+
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.writes = 0
+        self.evictions = 0
+        self.corrupt = 0
+        self.errors = 0
+
+    def _path(self, name: str, key: Hashable) -> str:
+        key_text = key if isinstance(key, str) else json.dumps(key, default=str, separators=(",", ":"))
+        digest = hashlib.sha256(f"v{DISK_CACHE_VERSION}:{name}:{key_text}".encode()).hexdigest()
+        return os.path.join(self.directory, name, digest + _ENTRY_SUFFIX)
+
+    @staticmethod
+    def _checksum(body: bytes) -> bytes:
+        return hashlib.blake2b(body, digest_size=_CHECKSUM_SIZE).digest()
+
+    def _track(self, path: str, size: Optional[int], accessed_at: float = 0.0):
+        """Record a file in the index as most recently used, or drop it when size is None"""
+        with self._lock:
+            previous = self._index.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous[0]
+            if size is not None:
+                self._index[path] = (size, accessed_at)
+                self._bytes += size
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.errors += 1
+            logger.warning(f"Disk cache could not remove {path}: {e}")
+        self._track(path, None)
+
+    def get(self, name: str, key: Hashable) -> Optional[tuple[Any, float]]:
+        """Return the value stored for the key with its expiry time, or None if it is missing, expired or corrupt"""
+        path = self._path(name, key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            self.misses[name] += 1
+            return None
+        except OSError as e:
+            self.errors += 1
+            self.misses[name] += 1
+            logger.warning(f"Disk cache could not read {path}: {e}")
+            return None
+
+        try:
+            header, value = self._decode_entry(data)
+            if header["key"] != str(key):
+                raise ValueError("entry belongs to another key")
+        except Exception as e:
+            self.corrupt += 1
+            self.misses[name] += 1
+            logger.warning(f"Disk cache dropped corrupt entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        now = time.time()
+        if header["expires_at"] <= now:
+            self.misses[name] += 1
+            self._remove(path)
+            return None
+
+        accessed_at = self._index.get(path, (0, 0.0))[1]
+        if now - accessed_at >= self.touch_interval:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            accessed_at = now
+        self._track(path, len(data), accessed_at)
+        self.hits[name] += 1
+        return value, header["expires_at"]
+
+    def _decode_entry(self, data: bytes) -> tuple[dict, Any]:
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("unknown entry format")
+        checksum = data[len(_MAGIC):len(_MAGIC) + _CHECKSUM_SIZE]
+        body = data[len(_MAGIC) + _CHECKSUM_SIZE:]
+        if self._checksum(body) != checksum:
+            raise ValueError("checksum mismatch")
+        header, _, value = body.partition(b"\n")
+        return json.loads(header), decode_value(value)
+
+    def set(self, name: str, key: Hashable, value: Any, expires_at: float):
+        try:
+            encoded = encode_value(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Disk cache cannot store {name} {key}: {e}")
+            return
+
+        body = json.dumps({"key": str(key), "expires_at": expires_at}).encode() + b"\n" + encoded
+        data = _MAGIC + self._checksum(body) + body
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(name, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(data)
+                os.replace(temporary_path, path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+        except OSError as e:
+            self.errors += 1
+            logger.warning(f"Disk cache could not write {path}: {e}")
+            return
+
+        self.writes += 1
+        self._track(path, len(data), time.time())
+        self._evict()
+
+    def delete(self, name: str, key: Hashable):
+        self._remove(self._path(name, key))
+
+    def delete_where(self, name: str, predicate: Callable[[str, Any], bool]) -> list[str]:
+        """Remove the entries of one cache for which predicate(key, value) is true, returns their keys. Reads every entry"""
+        directory = os.path.join(self.directory, name)
+        try:
+            file_names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+
+        removed = []
+        for file_name in file_names:
+            if not file_name.endswith(_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(directory, file_name)
+            try:
+                with open(path, "rb") as file:
+                    header, value = self._decode_entry(file.read())
+            except Exception:
+                # gone meanwhile, or corrupt and dropped on its next read
+                continue
+            if predicate(header["key"], value):
+                self._remove(path)
+                removed.append(header["key"])
+        return removed
+
+    def clear(self, name: str):
+        """Remove every entry of one cache"""
+        directory = os.path.join(self.directory, name)
+        try:
+            file_names = os.listdir(directory)
+        except FileNotFoundError:
+            return
+        for file_name in file_names:
+            if file_name.endswith(_ENTRY_SUFFIX):
+                self._remove(os.path.join(directory, file_name))
+        self.hits.pop(name, None)
+        self.misses.pop(name, None)
+
+    def load_index(self, rescan: bool = False):
+        """
+        Scan the directory for the size and last use of every entry, oldest first.
+
+        Blocking, run it in a thread (see main.lifespan). Until it is done entries are still
+        read and written, only eviction waits for it, and it is run on the first write if
+        nothing started it before. With `rescan` an index already loaded is rebuilt, to pick
+        up the entries written and removed by the other workers.
+        """
+        with self._lock:
+            if (self._index_loaded and not rescan) or self._index_loading:
+                return
+            self._index_loading = True
+
+        found = []
+        try:
+            for cache_name in os.listdir(self.directory):
+                directory = os.path.join(self.directory, cache_name)
+                if not os.path.isdir(directory):
+                    continue
+                for file_name in os.listdir(directory):
+                    path = os.path.join(directory, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    if file_name.endswith(".tmp") and time.time() - stat.st_mtime > 3600:
+                        # left behind by a worker killed mid-write
+                        self._remove(path)
+                    elif file_name.endswith(_ENTRY_SUFFIX):
+                        found.append((stat.st_mtime, path, stat.st_size))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.errors += 1
+            logger.warning(f"Disk cache could not scan {self.directory}: {e}")
+
+        found.sort()
+        with self._lock:
+            if rescan:
+                # the directory is the truth, the file times record the last use by any worker
+                self._index = OrderedDict((path, (size, accessed_at)) for accessed_at, path, size in found)
+            else:
+                # entries used since the scan started are already in the index and stay the most recent
+                recent = self._index
+                self._index = OrderedDict((path, (size, accessed_at)) for accessed_at, path, size in found if path not in recent)
+                self._index.update(recent)
+            self._bytes = sum(size for size, _ in self._index.values())
+            self._index_loaded = True
+            self._index_loading = False
+            self._scanned_at = time.monotonic()
+        if not rescan:
+            logger.info(f"Disk cache indexed {len(self._index)} entries ({self._bytes} bytes) in {self.directory}")
+        self._evict_least_recently_used()
+
+    def _evict(self):
+        if not self._index_loaded:
+            if self._index_loading:
+                return
+            self.load_index()
+            return
+        if time.monotonic() - self._scanned_at >= self.rescan_interval:
+            # evicts once the directory is scanned
+            self.load_index(rescan=True)
+            return
+        self._evict_least_recently_used()
+
+    def _evict_least_recently_used(self):
+        while True:
+            with self._lock:
+                if self._bytes <= self.max_bytes or not self._index:
+                    return
+                path = next(iter(self._index))
+            self._remove(path)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "index_loaded": self._index_loaded,
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "corrupt": self.corrupt,
+            "errors": self.errors,
+        }
+
+
+class TieredCache:
+    """
+    A cache in front of the disk store, with the interface of TTLCache.
+
+    Reads are served from the front cache (memory or shared) and fall back to the disk store,
+    an entry found on disk is put back in the front cache for the rest of its lifetime.
+    Writes go to both, so the entries known when the service stops are there after it starts.
+    aget and aset read and write the disk store in a thread, so file I/O never blocks the event loop.
+    """
+
+    def __init__(self, front, disk: DiskStore):
+        self.front = front
+        self.disk = disk
+        self.name = front.name
+        self.max_entries = front.max_entries
+        self.ttl = front.ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self.front.get(key)
+        if value is not None:
+            return value
+
+        entry = self.disk.get(self.name, key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        self.front.set(key, value, ttl=expires_at - time.time())
+        return value
+
+    async def aget(self, key: Hashable) -> Optional[Any]:
+        value = await self.front.aget(key)
+        if value is not None:
+            return value
+
+        entry = await asyncio.to_thread(self.disk.get, self.name, key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        await self.front.aset(key, value, ttl=expires_at - time.time())
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self.front.set(key, value, ttl=ttl)
+        if self.max_entries > 0:
+            self.disk.set(self.name, key, value, time.time() + (self.ttl if ttl is None else ttl))
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        await self.front.aset(key, value, ttl=ttl)
+        if self.max_entries > 0:
+            await asyncio.to_thread(self.disk.set, self.name, key, value, time.time() + (self.ttl if ttl is None else ttl))
+
+    def delete(self, key: Hashable):
+        self.front.delete(key)
+        self.disk.delete(self.name, key)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> list:
+        removed = self.front.delete_where(predicate)
+        return list(dict.fromkeys([*map(str, removed), *self.disk.delete_where(self.name, predicate)]))
+
+    def top_keys(self, count: int) -> list[dict]:
+        return self.front.top_keys(count)
+
+    def memory_bytes(self) -> int:
+        return self.front.memory_bytes()
+
+    def clear(self):
+        self.front.clear()
+        self.disk.clear(self.name)
+
+    def __len__(self) -> int:
+        return len(self.front)
+
+    def stats(self) -> dict:
+        return {
+            **self.front.stats(),
+            "disk_hits": self.disk.hits[self.name],
+            "disk_misses": self.disk.misses[self.name],
+        }
+
+    # Async forms of the whole-cache operations, the disk store part runs in a thread
+    async def adelete_where(self, predicate: Callable[[Hashable, Any], bool]) -> list:
+        removed = await self.front.adelete_where(predicate)
+        return list(dict.fromkeys([*map(str, removed), *await asyncio.to_thread(self.disk.delete_where, self.name, predicate)]))
+
+    async def amemory_bytes(self) -> int:
+        return await self.front.amemory_bytes()
+
+    async def asize(self) -> int:
+        return await self.front.asize()
+
+    async def aclear(self):
+        await self.front.aclear()
+        await asyncio.to_thread(self.disk.clear, self.name)
+
+    async def astats(self) -> dict:
+        return {
+            **await self.front.astats(),
+            "disk_hits": self.disk.hits[self.name],
+            "disk_misses": self.disk.misses[self.name],
+        }
+
+
+# Create a global instance, only when a cache directory is configured
+disk_store = DiskStore(settings.CACHE_DISK_PATH, max_bytes=settings.CACHE_DISK_MAX_BYTES) if settings.CACHE_DISK_PATH else None
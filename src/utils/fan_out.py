@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar
+from src.core.config import settings
+from src.exception.exceptions import GatewayTimeoutError
+from src.utils.deadline import DEADLINE_EXCEEDED_MESSAGE, deadline_expired
+
+T = TypeVar("T")
+
+
+class FanOutStats:
+    """Process-wide gauge of the items being processed by fan_out, and its peak"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.items = 0
+        self.active = 0
+        self.peak_active = 0
+        self.skipped_on_deadline = 0
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "active": self.active,
+            "peak_active": self.peak_active,
+            "skipped_on_deadline": self.skipped_on_deadline,
+        }
+
+
+async def fan_out(items: Iterable[T], fn: Callable[[T], Awaitable[Any]], limit: Optional[int] = None, return_exceptions: bool = False) -> list:
+    """
+    Run fn over every item with at most `limit` items in progress at a time.
+
+    Unlike asyncio.gather over a list of coroutines, only `limit` worker coroutines exist at
+    any time, each taking the next item once it is done with the previous one, so nested
+    fan-outs of n levels never run more than limit ** n calls at once.
+
+    Once the request deadline has passed no further item is started, the remaining items
+    fail with GatewayTimeoutError.
+
+    Args:
+        items (Iterable): The items to process.
+        fn (Callable): Coroutine function called with each item.
+        limit (int, optional): Items in progress at a time, FAN_OUT_CONCURRENCY by default.
+        return_exceptions (bool): Collect the exception of a failed item in its place in the
+            results, like asyncio.gather. Otherwise the first failure cancels the other items
+            and is raised.
+
+    Returns:
+        list: The result (or exception) of every item, in the order of the items.
+    """
+    items = list(items)
+    results: list = [None] * len(items)
+    pending = iter(enumerate(items))
+    fan_out_stats.calls += 1
+    fan_out_stats.items += len(items)
+
+    async def worker():
+        for index, item in pending:
+            if deadline_expired():
+                fan_out_stats.skipped_on_deadline += 1
+                error = GatewayTimeoutError(DEADLINE_EXCEEDED_MESSAGE)
+                if not return_exceptions:
+                    raise error
+                results[index] = error
+                continue
+
+            fan_out_stats.active += 1
+            fan_out_stats.peak_active = max(fan_out_stats.peak_active, fan_out_stats.active)
+            try:
+                results[index] = await fn(item)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+            finally:
+                fan_out_stats.active -= 1
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(min(limit or settings.FAN_OUT_CONCURRENCY, len(items)))]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+    return results
+
+
+# Create a global instance
+fan_out_stats = FanOutStats()
@@ -0,0 +1,135 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+from src.core.config import settings
+from src.exception.exceptions import BadRequestError, NotFoundError
+
+
+class LatencyTracker:
+    """Keeps the most recent latencies per operation to derive percentiles from"""
+
+    def __init__(self, sample_size: int = 500):
+        self.sample_size = sample_size
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, operation: str, seconds: float):
+        self._samples.setdefault(operation, deque(maxlen=self.sample_size)).append(seconds)
+
+    def count(self, operation: str) -> int:
+        return len(self._samples.get(operation, ()))
+
+    def percentile(self, operation: str, percentile: float) -> Optional[float]:
+        samples = self._samples.get(operation)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(percentile / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def clear(self):
+        self._samples.clear()
+
+
+class HedgeBudget:
+    """
+    Token bucket that caps hedges to a fraction of the requests.
+
+    Every request deposits `ratio` tokens and every hedge spends one, so over time at most
+    `ratio` extra requests are sent per request. The bucket is capped so that a quiet period
+    can not save up a burst of hedges.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = 0.0
+
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Hedger:
+    """
+    Sends a duplicate of a slow idempotent request and takes whichever answers first.
+
+    The hedge is fired once the primary request has been running longer than the configured
+    percentile of the recently observed latency for its operation, provided the hedge budget
+    allows it. The losing request is cancelled. Only use this for idempotent reads.
+    """
+
+    def __init__(self):
+        self.latency = LatencyTracker()
+        self.budget = HedgeBudget(ratio=settings.HEDGING_MAX_EXTRA_LOAD)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """Return how long to wait before hedging, None while there are too few samples"""
+        if self.latency.count(operation) < settings.HEDGING_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(operation, settings.HEDGING_PERCENTILE)
+
+    async def run(self, operation: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        if not settings.HEDGING_ENABLED:
+            return await fn(*args, **kwargs)
+
+        self.requests += 1
+        self.budget.deposit()
+        started_at = time.monotonic()
+        delay = self.hedge_delay(operation)
+
+        primary = asyncio.ensure_future(fn(*args, **kwargs))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self.budget.withdraw():
+                self.hedged += 1
+                tasks.append(asyncio.ensure_future(fn(*args, **kwargs)))
+
+            pending = set(tasks)
+            failure: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    # not found and bad request are definitive answers, not failures to hedge around
+                    if error is None or isinstance(error, (NotFoundError, BadRequestError)):
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        self.latency.record(operation, time.monotonic() - started_at)
+                        return task.result()
+                    failure = failure or error
+            raise failure
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def reset(self):
+        self.latency.clear()
+        self.budget.tokens = 0.0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.HEDGING_ENABLED,
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "budget_tokens": round(self.budget.tokens, 2),
+        }
+
+
+# Create a global instance
+hedger = Hedger()
@@ -1,24 +1,104 @@
-from aiohttp import ClientSession, ClientTimeout, TCPConnector
+import asyncio
+import logging
+import time
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig
 from typing import Optional
 from src.core.config import settings
-class HTTPClient:
-    "Single HTTP client for the application"
+from src.enums.poolEnum import PoolEnum
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTelemetry:
+    """
+    Connection pool counters fed by aiohttp's request tracing.
+
+    An acquisition is every connection handed to a request, either reused from the idle
+    pool or newly opened. Its wait is the time spent queued for a free pool slot plus the
+    time spent opening the connection, which is zero for a reused one.
+    """
 
     def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.waiters = 0
+        self.queued = 0
+        self.created = 0
+        self.reused = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def acquisitions(self) -> int:
+        return self.created + self.reused
+
+    def trace_config(self) -> TraceConfig:
+        trace_config = TraceConfig()
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_start.append(self._on_create_start)
+        trace_config.on_connection_create_end.append(self._on_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuse)
+        return trace_config
+
+    async def _on_queued_start(self, session, context, params):
+        self.waiters += 1
+        self.queued += 1
+        context.queued_at = time.monotonic()
+
+    async def _on_queued_end(self, session, context, params):
+        self.waiters -= 1
+        context.queue_wait = time.monotonic() - context.queued_at
+
+    async def _on_create_start(self, session, context, params):
+        context.create_started_at = time.monotonic()
+
+    async def _on_create_end(self, session, context, params):
+        self.created += 1
+        self._record_wait(getattr(context, "queue_wait", 0.0) + time.monotonic() - context.create_started_at)
+
+    async def _on_reuse(self, session, context, params):
+        self.reused += 1
+        self._record_wait(getattr(context, "queue_wait", 0.0))
+
+    def _record_wait(self, wait: float):
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def stats(self) -> dict:
+        return {
+            "waiters": self.waiters,
+            "queued": self.queued,
+            "created": self.created,
+            "reused": self.reused,
+            "avg_acquire_wait_ms": round(self.total_wait / self.acquisitions * 1000, 3) if self.acquisitions else None,
+            "max_acquire_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class ConnectionPool:
+    "One session and connector with its own limits and timeouts"
+
+    def __init__(self, name: str, size: int, size_per_host: int, total_seconds: float, sock_read_seconds: float):
+        self.name = name
         self._session: Optional[ClientSession] = None
 
-        self.total_seconds = settings.HTTP_TIMEOUT_TOTAL
+        self.total_seconds = total_seconds
         self.connect_seconds = settings.HTTP_TIMEOUT_CONNECT
         self.sock_connect_seconds = settings.HTTP_TIMEOUT_SOCK_CONNECT
-        self.sock_read_seconds = settings.HTTP_TIMEOUT_SOCK_READ
+        self.sock_read_seconds = sock_read_seconds
 
         self.timeout = ClientTimeout(total=self.total_seconds, connect=self.connect_seconds, sock_connect=self.sock_connect_seconds, sock_read=self.sock_read_seconds)
         
         # Connection pool configuration
-        self.pool_size = settings.HTTP_POOL_SIZE
-        self.pool_size_per_host = settings.HTTP_POOL_SIZE_PER_HOST
+        self.pool_size = size
+        self.pool_size_per_host = size_per_host
         self.ttl_dns_cache = settings.HTTP_TTL_DNS_CACHE
 
+        self.telemetry = PoolTelemetry()
+        self.prewarmed = 0
+
     async def start(self):
         """Create session on app startup"""
         if self._session is None or self._session.closed:
@@ -32,20 +112,130 @@ class HTTPClient:
             )
             self._session = ClientSession(
                 timeout=self.timeout,
-                connector=connector
+                connector=connector,
+                trace_configs=[self.telemetry.trace_config()],
+                # bodies are decompressed by the caller, so compressed sizes can be accounted for (see PayloadStats)
+                auto_decompress=False
             )
 
+    async def prewarm(self, url: str, connections: int, timeout: float) -> int:
+        """
+        Open up to `connections` keep-alive connections to the host of `url` ahead of traffic.
+
+        The requests are sent concurrently so each one takes its own connection, which then
+        goes back to the idle pool. Any response status will do, only failing to connect
+        counts as a failure. Failures are logged and never raised, a cold pool is not a
+        reason to refuse to start.
+
+        Returns:
+            int: The number of connections that were opened.
+        """
+        connections = min(connections, self.pool_size, self.pool_size_per_host)
+        if connections <= 0:
+            return 0
+
+        async def open_connection() -> bool:
+            try:
+                async with self.session.head(url, allow_redirects=False, timeout=self.timeout_within(timeout)) as response:
+                    await response.read()
+                return True
+            except Exception as e:
+                logger.warning(f"Connection pre-warming to {url} failed: {str(e)}")
+                return False
+
+        results = await asyncio.gather(*[open_connection() for _ in range(connections)])
+        self.prewarmed = sum(results)
+        logger.info(f"Pre-warmed {self.prewarmed}/{connections} {self.name} connections to {url}")
+        return self.prewarmed
+
     async def close(self):
         """Close session on app shutdown"""
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
     
+    def timeout_within(self, seconds: float) -> ClientTimeout:
+        """Return the configured timeout with every limit capped to the given number of seconds"""
+        return ClientTimeout(
+            total=min(self.total_seconds, seconds),
+            connect=min(self.connect_seconds, seconds),
+            sock_connect=min(self.sock_connect_seconds, seconds),
+            sock_read=min(self.sock_read_seconds, seconds)
+        )
+
+    def stats(self) -> dict:
+        """Live pool statistics, acquired and idle come from the connector itself"""
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        return {
+            "limit": self.pool_size,
+            "limit_per_host": self.pool_size_per_host,
+            "acquired": len(connector._acquired) if connector else 0,
+            "idle": sum(len(connections) for connections in connector._conns.values()) if connector else 0,
+            "prewarmed": self.prewarmed,
+            **self.telemetry.stats(),
+        }
+
     @property
     def session(self) -> ClientSession:
         if self._session is None or self._session.closed:
             raise RuntimeError("HTTP client not initialized")
         return self._session
 
+
+class HTTPClient:
+    """
+    Single HTTP client for the application.
+
+    Requests are split over named connection pools (bulkheads) with independent limits
+    and timeouts, so a few large dataset downloads in the bulk pool can never take the
+    connections the small lookups in the lookup pool need.
+    """
+
+    def __init__(self):
+        self.pools: dict[PoolEnum, ConnectionPool] = {
+            PoolEnum.LOOKUP: ConnectionPool(
+                PoolEnum.LOOKUP.value,
+                size=settings.HTTP_POOL_SIZE,
+                size_per_host=settings.HTTP_POOL_SIZE_PER_HOST,
+                total_seconds=settings.HTTP_TIMEOUT_TOTAL,
+                sock_read_seconds=settings.HTTP_TIMEOUT_SOCK_READ
+            ),
+            PoolEnum.BULK: ConnectionPool(
+                PoolEnum.BULK.value,
+                size=settings.HTTP_BULK_POOL_SIZE,
+                size_per_host=settings.HTTP_BULK_POOL_SIZE_PER_HOST,
+                total_seconds=settings.HTTP_BULK_TIMEOUT_TOTAL,
+                sock_read_seconds=settings.HTTP_BULK_TIMEOUT_SOCK_READ
+            ),
+        }
+
+    async def start(self):
+        """Create the sessions on app startup"""
+        for pool in self.pools.values():
+            await pool.start()
+
+    async def close(self):
+        """Close the sessions on app shutdown"""
+        for pool in self.pools.values():
+            await pool.close()
+
+    async def prewarm(self, url: str, connections: int, timeout: float, pool: PoolEnum = PoolEnum.LOOKUP) -> int:
+        """Open keep-alive connections in one pool ahead of traffic, see ConnectionPool.prewarm"""
+        return await self.pools[pool].prewarm(url, connections, timeout)
+
+    def timeout_within(self, seconds: float, pool: PoolEnum = PoolEnum.LOOKUP) -> ClientTimeout:
+        """Return the pool's timeout with every limit capped to the given number of seconds"""
+        return self.pools[pool].timeout_within(seconds)
+
+    def stats(self) -> dict:
+        return {pool.value: connection_pool.stats() for pool, connection_pool in self.pools.items()}
+
+    def session_for(self, pool: PoolEnum) -> ClientSession:
+        return self.pools[pool].session
+
+    @property
+    def session(self) -> ClientSession:
+        return self.session_for(PoolEnum.LOOKUP)
+
 # Create a global instance
 http_client = HTTPClient()
\ No newline at end of file
@@ -0,0 +1,17 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Name of the decoder in use, reported with the metrics
+JSON_DECODER = "orjson" if orjson is not None else "json"
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document with orjson when it is installed, the standard library otherwise"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,172 @@
+import re
+from typing import Iterator, Optional
+
+_OPENERS = b"{["
+_CLOSERS = b"}]"
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_COLON = ord(":")
+_COMMA = ord(",")
+
+# Each pattern matches the run of bytes the parser can skip in its current state, so it
+# jumps from one byte that matters to the next and the bytes in between are skipped in C
+_STRUCTURAL = re.compile(rb'[^{}\[\]",:]*+')
+# inside an item, or below the top-level object, only nesting matters: whole strings are skipped too
+_NESTING = re.compile(rb'(?:[^{}\[\]"]++|"(?:[^"\\]++|\\.)*+")*+', re.DOTALL)
+# up to where a value starts, e.g. a scalar item
+_SIGNIFICANT = re.compile(rb'[ \t\r\n]*+')
+# up to the closing quote, or a backslash whose escaped byte is still to come
+_STRING_BODY = re.compile(rb'(?:[^"\\]++|\\.)*+', re.DOTALL)
+
+
+class JsonArrayStreamParser:
+    """
+    Incremental parser yielding the items of one array in a JSON document as raw bytes.
+
+    Feed the document chunk by chunk, each call to feed() yields the items of the array
+    under `key` in the top-level object that are complete so far, as their raw JSON text.
+    Only the item being parsed is buffered, so memory stays bounded by the largest item
+    rather than the size of the document. With `key=None` the top-level value is expected
+    to be the array itself.
+
+    The parser only tracks nesting and strings, the items themselves are validated by
+    whoever decodes them. It looks only at the bytes that can change its state, found with
+    regular expressions, so the text of strings and the fields of the items are skipped in bulk.
+    """
+
+    def __init__(self, key: Optional[str] = "body"):
+        self._key = key.encode() if key is not None else None
+        self._buffer = bytearray()
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+        # where the string being read (a key candidate) starts, and the last string that was read at depth 1
+        self._string_start = -1
+        self._last_key: Optional[bytes] = None
+        self._expect_array = key is None
+
+        # depth of the items of the target array, None until it is found
+        self._items_depth: Optional[int] = None
+        self._item_start = -1
+        self.done = False
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        if self.done:
+            return
+        self._buffer.extend(chunk)
+        buffer = self._buffer
+
+        while self._position < len(buffer):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    self._position += 1
+                    continue
+                index = _STRING_BODY.match(buffer, self._position).end()
+                if index >= len(buffer):
+                    self._position = index
+                    break
+                self._position = index + 1
+                if buffer[index] == _BACKSLASH:
+                    self._escaped = True
+                    continue
+                self._in_string = False
+                if self._string_start >= 0:
+                    self._last_key = bytes(buffer[self._string_start:index])
+                    self._string_start = -1
+                continue
+
+            index = self._skippable().match(buffer, self._position).end()
+            if index >= len(buffer):
+                self._position = index
+                break
+            char = buffer[index]
+            self._position = index + 1
+
+            if self._items_depth is not None and self._depth == self._items_depth and self._item_start < 0:
+                # between items of the target array
+                if char == _COMMA:
+                    continue
+                if char == _CLOSERS[1]:
+                    self._depth -= 1
+                    self._finish()
+                    return
+                self._item_start = index
+
+            if char == _QUOTE:
+                self._in_string = True
+                if self._items_depth is None and self._depth == 1:
+                    self._string_start = index + 1
+                continue
+
+            if char in _OPENERS:
+                if self._expect_array:
+                    self._expect_array = False
+                    if char == _OPENERS[1]:
+                        self._items_depth = self._depth + 1
+                        self._depth += 1
+                        self._discard(self._position)
+                        continue
+                self._depth += 1
+                continue
+
+            if char in _CLOSERS:
+                self._depth -= 1
+                if self._items_depth is not None and self._depth == self._items_depth - 1:
+                    # a scalar last item runs up to the closing bracket
+                    if self._item_start >= 0:
+                        yield bytes(buffer[self._item_start:index]).strip()
+                    self._finish()
+                    return
+                if self._items_depth is not None and self._depth == self._items_depth and self._item_start >= 0:
+                    yield bytes(buffer[self._item_start:index + 1])
+                    self._item_start = -1
+                    self._discard(self._position)
+                continue
+
+            if self._items_depth is not None and self._depth == self._items_depth and char == _COMMA and self._item_start >= 0:
+                yield bytes(buffer[self._item_start:index]).strip()
+                self._item_start = -1
+                self._discard(self._position)
+                continue
+
+            if self._items_depth is None:
+                if char == _COLON and self._depth == 1:
+                    self._expect_array = self._last_key == self._key
+                elif self._expect_array:
+                    # the key holds something other than an array (e.g. null), there are no items
+                    self._expect_array = False
+
+        if self._items_depth is None or self._item_start < 0:
+            self._discard(self._position)
+
+    def _skippable(self) -> re.Pattern:
+        """The pattern matching the bytes that cannot change the state of the parser from here"""
+        if self._items_depth is None:
+            if self._expect_array:
+                return _SIGNIFICANT
+            return _STRUCTURAL if self._depth <= 1 else _NESTING
+        if self._depth == self._items_depth:
+            return _SIGNIFICANT if self._item_start < 0 else _STRUCTURAL
+        return _NESTING
+
+    def _discard(self, upto: int):
+        """Drop the parsed bytes before `upto` that are no longer needed"""
+        keep_from = min(upto, self._item_start) if self._item_start >= 0 else upto
+        if self._string_start >= 0:
+            keep_from = min(keep_from, self._string_start)
+        if keep_from <= 0:
+            return
+        del self._buffer[:keep_from]
+        self._position -= keep_from
+        if self._item_start >= 0:
+            self._item_start -= keep_from
+        if self._string_start >= 0:
+            self._string_start -= keep_from
+
+    def _finish(self):
+        self.done = True
+        self._buffer.clear()
+        self._position = 0
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Optional
+from aiohttp import ClientConnectionError, ClientResponseError
+from src.core.config import settings
+from src.exception.exceptions import BadRequestError, NotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    """One upstream base URL and what the balancer has observed about it"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.ewma_latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.probing = False
+
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def load(self) -> float:
+        """Expected cost of sending one more request here: the latency it sees times the requests it already has"""
+        return (self.ewma_latency or 0.0) * (self.outstanding + 1)
+
+
+class LoadBalancer:
+    """
+    Client-side load balancer over replicas of one upstream.
+
+    Each request goes to the available replica with the lowest load, its EWMA latency
+    times the number of requests it has outstanding plus one, so slow or busy replicas
+    get less traffic. Ties go to the replica with the fewest recent failures, then the
+    fewest outstanding requests.
+
+    Ejection is passive, no health checks are sent: after `ejection_threshold` consecutive
+    failures (timeouts, connection errors, 429 and 5xx responses) a replica is skipped for
+    `ejection_seconds`. After that a single probe request is let through, a success puts the
+    replica back in rotation and a failure ejects it again. If every replica is ejected the
+    one due back first is used rather than failing the request.
+    """
+
+    def __init__(self, urls: list[str], ejection_threshold: int, ejection_seconds: float, smoothing: float = 0.3):
+        if not urls:
+            raise ValueError("At least one upstream URL is required")
+        self.replicas = [Replica(url) for url in dict.fromkeys(urls)]
+        self.ejection_threshold = ejection_threshold
+        self.ejection_seconds = ejection_seconds
+        self.smoothing = smoothing
+
+    @property
+    def urls(self) -> list[str]:
+        return [replica.url for replica in self.replicas]
+
+    def pick(self) -> Replica:
+        now = time.monotonic()
+        candidates = [
+            replica for replica in self.replicas
+            if not replica.is_ejected(now) and not (replica.probing and replica.outstanding)
+        ]
+        if not candidates:
+            return min(self.replicas, key=lambda replica: replica.ejected_until)
+
+        replica = min(candidates, key=lambda replica: (replica.load(), replica.consecutive_failures, replica.outstanding, random.random()))
+        if replica.ejected_until:
+            # first request after an ejection, it decides whether the replica is back
+            replica.probing = True
+        return replica
+
+    @contextmanager
+    def request(self):
+        """Pick a replica for one upstream call and yield its base URL, recording the outcome of the call"""
+        replica = self.pick()
+        replica.outstanding += 1
+        replica.requests += 1
+        started_at = time.monotonic()
+        try:
+            yield replica.url
+        except (NotFoundError, BadRequestError):
+            self._on_success(replica, time.monotonic() - started_at)
+            raise
+        except Exception as e:
+            # other errors, such as an expired request deadline, tell nothing about the replica
+            if self._is_failure(e):
+                self._on_failure(replica)
+            raise
+        else:
+            self._on_success(replica, time.monotonic() - started_at)
+        finally:
+            replica.outstanding -= 1
+
+    @staticmethod
+    def _is_failure(exception: Exception) -> bool:
+        if isinstance(exception, ClientResponseError):
+            return exception.status == 429 or exception.status >= 500
+        return isinstance(exception, (ClientConnectionError, asyncio.TimeoutError))
+
+    def _on_success(self, replica: Replica, latency: float):
+        replica.consecutive_failures = 0
+        replica.ejected_until = 0.0
+        replica.probing = False
+        replica.ewma_latency = latency if replica.ewma_latency is None else (1 - self.smoothing) * replica.ewma_latency + self.smoothing * latency
+
+    def _on_failure(self, replica: Replica):
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.probing or replica.consecutive_failures >= self.ejection_threshold:
+            replica.ejected_until = time.monotonic() + self.ejection_seconds
+            replica.probing = False
+            replica.ejections += 1
+            logger.warning(f"Ejected upstream {replica.url} for {self.ejection_seconds}s after {replica.consecutive_failures} consecutive failures")
+
+    def reset(self):
+        self.replicas = [Replica(replica.url) for replica in self.replicas]
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            replica.url: {
+                "ejected": replica.is_ejected(now),
+                "outstanding": replica.outstanding,
+                "ewma_latency_ms": round(replica.ewma_latency * 1000, 2) if replica.ewma_latency is not None else None,
+                "requests": replica.requests,
+                "failures": replica.failures,
+                "ejections": replica.ejections,
+            }
+            for replica in self.replicas
+        }
+
+
+# Create a global instance
+opengin_balancer = LoadBalancer(
+    urls=settings.OPENGIN_REPLICAS or [settings.BASE_URL_QUERY],
+    ejection_threshold=settings.OPENGIN_EJECTION_THRESHOLD,
+    ejection_seconds=settings.OPENGIN_EJECTION_SECONDS,
+)
@@ -0,0 +1,23 @@
+from typing import Callable
+
+
+class MetricsRegistry:
+    """
+    Collects in-process statistics from the resilience and caching components.
+
+    Components register a callable returning a dictionary of their current counters,
+    and snapshot() gathers them under the registered names.
+    """
+
+    def __init__(self):
+        self._sources: dict[str, Callable[[], dict]] = {}
+
+    def register(self, name: str, source: Callable[[], dict]):
+        self._sources[name] = source
+
+    def snapshot(self) -> dict:
+        return {name: source() for name, source in self._sources.items()}
+
+
+# Create a global instance
+metrics = MetricsRegistry()
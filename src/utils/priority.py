@@ -0,0 +1,20 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from src.enums import PriorityEnum
+
+# Priority of the OpenGIN calls made in the current context, user-facing unless stated otherwise
+_priority: ContextVar[PriorityEnum] = ContextVar("request_priority", default=PriorityEnum.INTERACTIVE)
+
+
+def current_priority() -> PriorityEnum:
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: PriorityEnum):
+    """Run the OpenGIN calls made inside the block (and the tasks it starts) with the given priority"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
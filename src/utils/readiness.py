@@ -0,0 +1,44 @@
+import time
+from typing import Optional
+
+
+class Readiness:
+    """
+    Whether this worker is ready for traffic, and how its cache warm-up went.
+
+    The flag flips once warm-up completes, whether or not every step succeeded: a warm-up
+    step failing only means the first requests for that view are slower.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ready = False
+        self.warmup_started_at: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.steps: dict[str, dict] = {}
+
+    def start_warmup(self):
+        self.warmup_started_at = time.monotonic()
+
+    def record_step(self, name: str, seconds: float, error: Optional[Exception] = None):
+        self.steps[name] = {"seconds": round(seconds, 3), "ok": error is None}
+        if error is not None:
+            self.steps[name]["error"] = str(error) or type(error).__name__
+
+    def mark_ready(self):
+        if self.warmup_started_at is not None:
+            self.warmup_seconds = time.monotonic() - self.warmup_started_at
+        self.ready = True
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_seconds": round(self.warmup_seconds, 3) if self.warmup_seconds is not None else None,
+            "warmup_steps": self.steps,
+        }
+
+
+# Create a global instance
+readiness = Readiness()
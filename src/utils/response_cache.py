@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+from pydantic_core import to_jsonable_python
+from starlette.requests import Request
+from starlette.responses import Response
+from src.core.config import settings
+from src.enums import PriorityEnum
+from src.utils.cache import create_cache
+from src.utils.data_loader import request_scope
+from src.utils.deadline import reset_deadline, start_deadline
+from src.utils.metrics import metrics
+from src.utils.priority import request_priority
+from src.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache-Status"
+
+# Outcome flags of the response being computed for the cache, see mark_partial
+_partial: ContextVar[Optional[list[bool]]] = ContextVar("response_partial", default=None)
+
+
+def mark_partial():
+    """
+    Report that the response being computed is degraded, part of it could not be fetched.
+
+    The response is still returned to the caller but not cached, so the next request tries
+    again instead of being served the degraded response until the hard TTL. Outside of a
+    cached computation it does nothing.
+    """
+    flags = _partial.get()
+    if flags is not None:
+        flags.append(True)
+
+
+class ResponseCache:
+    """
+    Stale-while-revalidate cache of whole responses, for slow aggregate endpoints.
+
+    Each route (the longest matching path prefix in RESPONSE_CACHE_ROUTES) has a soft and a
+    hard TTL. Within the soft TTL the cached response is served as is. Past it, the cached
+    response is still served right away and a refresh is started in the background, at
+    background priority with its own deadline of REQUEST_DEADLINE_MAX. Past the hard TTL the
+    entry is gone and the caller waits for a fresh response. Refreshes and computations of
+    the same response are single-flight, a failed refresh leaves the cached response in place.
+    A response reported partial by its computation (see mark_partial) is served but not cached.
+
+    The staleness of the answer is reported with the Age header (seconds since the response
+    was computed) and the X-Cache-Status header: "hit", "stale" or "miss".
+    Responses are kept as JSON data in a cache from create_cache, so they are shared
+    between workers and persisted like the OpenGIN caches when those are.
+    """
+
+    def __init__(self, cache, routes: dict[str, dict[str, float]]):
+        self.cache = cache
+        # longest prefixes first so the most specific route wins
+        self.routes = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+        self._flights = SingleFlight()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.partial = 0
+
+    def policy_for(self, path: str) -> Optional[dict[str, float]]:
+        """Return the soft_ttl and hard_ttl of the route, None when its responses are not cached"""
+        for prefix, policy in self.routes:
+            if path.startswith(prefix):
+                return policy
+        return None
+
+    async def serve(self, request: Request, response: Response, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Answer the request from the cache when the route is cached, otherwise (and on a miss) with fn()"""
+        policy = self.policy_for(request.url.path)
+        if policy is None or not settings.CACHE_ENABLED:
+            return await fn()
+
+        key = request.url.path + (f"?{request.url.query}" if request.url.query else "")
+        entry = await self.cache.aget(key)
+        now = time.time()
+        if entry is not None and now - entry["stored_at"] < policy["hard_ttl"]:
+            age = now - entry["stored_at"]
+            if age < policy["soft_ttl"]:
+                self.hits += 1
+                status = "hit"
+            else:
+                self.stale_hits += 1
+                status = "stale"
+                self._start_refresh(key, fn, policy)
+            response.headers["Age"] = str(int(age))
+            response.headers[CACHE_STATUS_HEADER] = status
+            return entry["value"]
+
+        self.misses += 1
+        value = await self._flights.do(key, self._load, key, fn, policy)
+        response.headers["Age"] = "0"
+        response.headers[CACHE_STATUS_HEADER] = "miss"
+        return value
+
+    async def warm(self, path: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Compute the response of a route ahead of its first request and cache it, returns the response"""
+        policy = self.policy_for(path)
+        if policy is None or not settings.CACHE_ENABLED:
+            return await fn()
+        return await self._flights.do(path, self._load, path, fn, policy)
+
+    async def _load(self, key: str, fn: Callable[[], Awaitable[Any]], policy: dict[str, float]) -> Any:
+        flags: list[bool] = []
+        token = _partial.set(flags)
+        try:
+            value = to_jsonable_python(await fn())
+        finally:
+            _partial.reset(token)
+        if flags:
+            self.partial += 1
+            logger.warning(f"Response for {key} is partial, serving it without caching it")
+            return value
+        await self.cache.aset(key, {"value": value, "stored_at": time.time()}, ttl=policy["hard_ttl"])
+        return value
+
+    def _start_refresh(self, key: str, fn: Callable[[], Awaitable[Any]], policy: dict[str, float]):
+        if key in self._refreshing:
+            return
+        self.refreshes += 1
+        with request_priority(PriorityEnum.BACKGROUND):
+            task = asyncio.ensure_future(self._flights.do(key, self._refresh, key, fn, policy))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done_task: self._refresh_done(key, done_task))
+
+    async def _refresh(self, key: str, fn: Callable[[], Awaitable[Any]], policy: dict[str, float]) -> Any:
+        # the refresh outlives the request, it must not use its deadline, priority or loaders
+        with request_priority(PriorityEnum.BACKGROUND), request_scope():
+            token = start_deadline(settings.REQUEST_DEADLINE_MAX)
+            try:
+                return await self._load(key, fn, policy)
+            finally:
+                reset_deadline(token)
+
+    def _refresh_done(self, key: str, task: asyncio.Task):
+        self._refreshing.pop(key, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.refresh_failures += 1
+            logger.warning(f"Background refresh of {key} failed, serving the stale response meanwhile: {error}")
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.partial = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.cache),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshing": len(self._refreshing),
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "partial": self.partial,
+        }
+
+
+# Create a global instance
+response_cache = ResponseCache(
+    create_cache("responses", max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl=max((policy["hard_ttl"] for policy in settings.RESPONSE_CACHE_ROUTES.values()), default=0)),
+    routes=settings.RESPONSE_CACHE_ROUTES,
+)
+metrics.register("response_cache", response_cache.stats)
@@ -0,0 +1,170 @@
+import asyncio
+import functools
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+from aiohttp import ClientConnectionError, ClientResponseError
+from src.core.config import settings
+from src.exception.exceptions import GatewayTimeoutError
+from src.utils.deadline import remaining_time
+
+logger = logging.getLogger(__name__)
+
+TRANSIENT_STATUSES = {429, 502, 503, 504}
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a fraction of the requests, process wide.
+
+    Every request deposits `ratio` tokens and every retry spends one. The bucket starts full
+    so a handful of retries are available right away, and is capped so that a quiet period
+    can not save up a retry storm.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def reset(self):
+        self.tokens = self.max_tokens
+
+
+class RetryPolicy:
+    """
+    Retries upstream calls that failed for a transient reason.
+
+    Only connection errors, timeouts and 429/502/503/504 responses are retried. The failure
+    is looked for in the exception and the exceptions it was raised from, since the
+    OpenGINService wraps unexpected errors in InternalServerError. Anything else (not found,
+    bad request, invalid payloads, bugs) fails on the first attempt.
+
+    Retries wait with full-jitter exponential backoff, or as long as a 429 Retry-After header
+    asks for. They stop once `timeout` seconds have passed since the first attempt, once the
+    request deadline would be exceeded, or when the process-wide retry budget is spent.
+    """
+
+    def __init__(self, initial: float, maximum: float, multiplier: float, timeout: float, budget: RetryBudget):
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.timeout = timeout
+        self.budget = budget
+        self._counts: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def transient_cause(exception: BaseException) -> Optional[BaseException]:
+        """Return the transient failure behind the exception, None when it should not be retried"""
+        current: Optional[BaseException] = exception
+        while current is not None:
+            if isinstance(current, GatewayTimeoutError):
+                # the request deadline passed, retrying can not help
+                return None
+            if isinstance(current, ClientResponseError):
+                return current if current.status in TRANSIENT_STATUSES else None
+            if isinstance(current, (ClientConnectionError, asyncio.TimeoutError)):
+                return current
+            current = current.__cause__
+        return None
+
+    @staticmethod
+    def retry_after(cause: BaseException) -> Optional[float]:
+        """Return the seconds a 429 response asked to wait, from its Retry-After header"""
+        if not isinstance(cause, ClientResponseError) or cause.status != 429 or not cause.headers:
+            return None
+
+        value = cause.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: a random delay between 0 and the exponential backoff of the attempt"""
+        return random.uniform(0, min(self.maximum, self.initial * self.multiplier ** attempt))
+
+    def _count(self, operation: str, counter: str):
+        counts = self._counts.setdefault(operation, {"calls": 0, "retries": 0, "budget_exhausted": 0, "gave_up": 0})
+        counts[counter] += 1
+
+    async def run(self, operation: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Call fn(*args, **kwargs), retrying transient failures"""
+        self._count(operation, "calls")
+        self.budget.deposit()
+        started_at = time.monotonic()
+        attempt = 0
+
+        while True:
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                cause = self.transient_cause(e)
+                if cause is None:
+                    raise
+
+                delay = self.retry_after(cause)
+                if delay is None:
+                    delay = self.backoff(attempt)
+
+                budget = remaining_time()
+                if time.monotonic() - started_at + delay > self.timeout or (budget is not None and delay >= budget):
+                    self._count(operation, "gave_up")
+                    raise
+                if not self.budget.withdraw():
+                    self._count(operation, "budget_exhausted")
+                    logger.warning(f"Retry budget exhausted, not retrying {operation}: {cause!r}")
+                    raise
+
+                self._count(operation, "retries")
+                attempt += 1
+                logger.info(f"Retrying {operation} in {delay:.2f}s (attempt {attempt + 1}) after {cause!r}")
+                await asyncio.sleep(delay)
+
+    def retrying(self, operation: str):
+        """Decorator running the decorated coroutine function through run() as the given operation"""
+        def decorator(fn: Callable[..., Awaitable[Any]]):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await self.run(operation, fn, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        self.budget.reset()
+        self._counts.clear()
+
+    def stats(self) -> dict:
+        return {
+            "budget_tokens": round(self.budget.tokens, 2),
+            "operations": {operation: dict(counts) for operation, counts in self._counts.items()},
+        }
+
+
+# Create a global instance
+retry_policy = RetryPolicy(
+    initial=settings.RETRY_INITIAL_BACKOFF,
+    maximum=settings.RETRY_MAX_BACKOFF,
+    multiplier=settings.RETRY_MULTIPLIER,
+    timeout=settings.RETRY_TIMEOUT,
+    budget=RetryBudget(ratio=settings.RETRY_BUDGET_RATIO, max_tokens=settings.RETRY_BUDGET_MAX_TOKENS),
+)
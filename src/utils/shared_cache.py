@@ -0,0 +1,291 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Hashable, Optional
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+from src.models.organisation_schemas import Entity, Relation
+from src.models.projection import EntityProjection
+
+logger = logging.getLogger(__name__)
+
+# Models the cache knows how to rebuild, projected entities are tagged with their projection instead
+CACHED_MODELS: dict[str, type[BaseModel]] = {"Entity": Entity, "Relation": Relation}
+
+_PROJECTION_TAG = "projection:"
+
+
+def _model_tag(model: type[BaseModel]) -> str:
+    projection_fields = getattr(model, "__projection_fields__", None)
+    if projection_fields is not None:
+        return _PROJECTION_TAG + ",".join(projection_fields)
+    if CACHED_MODELS.get(model.__name__) is not model:
+        raise TypeError(f"Cannot cache instances of {model.__name__}")
+    return model.__name__
+
+
+def _tagged_model(tag: str) -> type[BaseModel]:
+    if tag.startswith(_PROJECTION_TAG):
+        return EntityProjection(fields=tuple(tag[len(_PROJECTION_TAG):].split(","))).model
+    return CACHED_MODELS[tag]
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serialise a cached value to JSON bytes any worker can decode.
+
+    Lists of models (entities, relations, projected entities) keep the model they were
+    decoded into, anything else must be plain JSON data such as a decoded dataset.
+    """
+    if isinstance(value, list) and value and all(isinstance(item, BaseModel) for item in value):
+        models = {type(item) for item in value}
+        if len(models) != 1:
+            raise TypeError("Cannot cache a list of mixed models")
+        return to_json({"model": _model_tag(models.pop()), "items": value})
+    return to_json({"value": to_jsonable_python(value)})
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate size of a cached value in bytes, the length of its JSON encoding"""
+    try:
+        return len(to_json(value, fallback=str))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def decode_value(data: bytes) -> Any:
+    document = json.loads(data)
+    if "model" in document:
+        model = _tagged_model(document["model"])
+        return [model.model_validate(item) for item in document["items"]]
+    return document["value"]
+
+
+class SharedCache:
+    """
+    Cache shared by every worker process of a host, stored in a SQLite database in WAL mode.
+
+    It has the interface of TTLCache, so the two are interchangeable (see CACHE_BACKEND).
+    An entry stored by one uvicorn worker is served to the others, values are kept as JSON
+    (see encode_value) and rebuilt into fresh objects on every read. Expiry uses the wall
+    clock, which all processes agree on. Eviction is LRU, with the last access time of an
+    entry refreshed at most every `touch_interval` seconds so reads rarely need a write.
+
+    The cache never fails the caller: a database error is logged and treated as a miss. The
+    busy timeout is short (`busy_timeout` seconds), a write lock held by another worker for
+    longer turns the lookup into a miss rather than stalling this one. On the event loop, use
+    aget and aset: they run the database calls in a thread. The size is checked against
+    `max_entries` every `evict_interval` writes rather than on each one, so a cache may
+    briefly hold up to `evict_interval` entries more than its bound.
+    Hits, misses and evictions are counted per worker, the size is the shared one.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float, path: str, touch_interval: float = 60, busy_timeout: float = 0.1, evict_interval: Optional[int] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.touch_interval = touch_interval
+        self.busy_timeout = busy_timeout
+        # a tenth of the bound, so the overshoot stays small next to it
+        self.evict_interval = evict_interval or max(1, min(100, max_entries // 10))
+        self._writes = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._key_hits: Counter[str] = Counter()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # a connection must not cross a fork, every worker opens its own
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "cache TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (cache, key))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS cache_entries_lru ON cache_entries (cache, accessed_at)")
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return key if isinstance(key, str) else json.dumps(key, default=str, separators=(",", ":"))
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> Optional[list]:
+        with self._lock:
+            try:
+                return self._connect().execute(sql, parameters).fetchall()
+            except sqlite3.Error as e:
+                self.errors += 1
+                logger.warning(f"Shared cache '{self.name}' unavailable: {e}")
+                return None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for the key, or None if it is missing or expired"""
+        key = self._key(key)
+        rows = self._execute("SELECT value, expires_at, accessed_at FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key))
+        if not rows:
+            self.misses += 1
+            return None
+
+        data, expires_at, accessed_at = rows[0]
+        now = time.time()
+        if expires_at <= now:
+            self._execute("DELETE FROM cache_entries WHERE cache = ? AND key = ? AND expires_at <= ?", (self.name, key, now))
+            self.misses += 1
+            return None
+
+        try:
+            value = decode_value(data)
+        except Exception as e:
+            # written by an incompatible version of the service, drop it
+            logger.warning(f"Shared cache '{self.name}' dropped an undecodable entry: {e}")
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        if now - accessed_at >= self.touch_interval:
+            self._execute("UPDATE cache_entries SET accessed_at = ? WHERE cache = ? AND key = ?", (now, self.name, key))
+        with self._lock:
+            self.hits += 1
+            self._key_hits[key] += 1
+            if len(self._key_hits) > 2 * self.max_entries:
+                # keys evicted by other workers are never seen leaving, keep the counts bounded
+                self._key_hits = Counter(dict(self._key_hits.most_common(self.max_entries)))
+        return value
+
+    async def aget(self, key: Hashable) -> Optional[Any]:
+        """get, with the database calls run in a thread so the event loop never waits on them"""
+        return await asyncio.to_thread(self.get, key)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store the value, using the cache TTL unless a per-entry TTL is given"""
+        if self.max_entries <= 0:
+            return
+
+        try:
+            data = encode_value(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Shared cache '{self.name}' cannot store {key}: {e}")
+            return
+
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        self._execute(
+            "INSERT OR REPLACE INTO cache_entries (cache, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (self.name, self._key(key), data, expires_at, now),
+        )
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_interval == 0
+        if due:
+            self._evict(now)
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """set, with the encoding and the database calls run in a thread"""
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def _evict(self, now: float):
+        rows = self._execute("SELECT COUNT(*) FROM cache_entries WHERE cache = ?", (self.name,))
+        if not rows or rows[0][0] <= self.max_entries:
+            return
+
+        self._execute("DELETE FROM cache_entries WHERE cache = ? AND expires_at <= ?", (self.name, now))
+        rows = self._execute("SELECT COUNT(*) FROM cache_entries WHERE cache = ?", (self.name,))
+        excess = rows[0][0] - self.max_entries if rows else 0
+        if excess > 0:
+            self._execute(
+                "DELETE FROM cache_entries WHERE cache = ? AND key IN "
+                "(SELECT key FROM cache_entries WHERE cache = ? ORDER BY accessed_at LIMIT ?)",
+                (self.name, self.name, excess),
+            )
+            self.evictions += excess
+
+    def delete(self, key: Hashable):
+        key = self._key(key)
+        self._execute("DELETE FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key))
+        with self._lock:
+            self._key_hits.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[str, Any], bool]) -> list[str]:
+        """Remove the entries for which predicate(key, value) is true for every worker, returns their keys"""
+        removed = []
+        for key, data in self._execute("SELECT key, value FROM cache_entries WHERE cache = ?", (self.name,)) or []:
+            try:
+                value = decode_value(data)
+            except Exception:
+                continue
+            if predicate(key, value):
+                self.delete(key)
+                removed.append(key)
+        return removed
+
+    def top_keys(self, count: int) -> list[dict]:
+        """The cached keys with the most hits in this worker"""
+        with self._lock:
+            return [{"key": key, "hits": hits} for key, hits in self._key_hits.most_common(count)]
+
+    def memory_bytes(self) -> int:
+        """Size of the stored values of this cache in the database"""
+        rows = self._execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries WHERE cache = ?", (self.name,))
+        return rows[0][0] if rows else 0
+
+    def clear(self):
+        """Remove the entries of this cache for every worker"""
+        self._execute("DELETE FROM cache_entries WHERE cache = ?", (self.name,))
+        self._key_hits.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        rows = self._execute("SELECT COUNT(*) FROM cache_entries WHERE cache = ? AND expires_at > ?", (self.name, time.time()))
+        return rows[0][0] if rows else 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # Async forms of the whole-cache operations, they read every row so they run in a thread
+    async def adelete_where(self, predicate: Callable[[str, Any], bool]) -> list[str]:
+        return await asyncio.to_thread(self.delete_where, predicate)
+
+    async def amemory_bytes(self) -> int:
+        return await asyncio.to_thread(self.memory_bytes)
+
+    async def asize(self) -> int:
+        return await asyncio.to_thread(len, self)
+
+    async def aclear(self):
+        await asyncio.to_thread(self.clear)
+
+    async def astats(self) -> dict:
+        return await asyncio.to_thread(self.stats)
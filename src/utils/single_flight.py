@@ -0,0 +1,97 @@
+import asyncio
+import json
+from contextvars import Context
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from src.utils.deadline import context_with_deadline, current_deadline, extend_deadline
+from src.utils.priority import current_priority
+
+
+class _Flight:
+    """One shared call, with the context it runs in and the number of callers waiting for it"""
+
+    def __init__(self, task: asyncio.Task, context: Context):
+        self.task = task
+        self.context = context
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls so that concurrent callers share one upstream request.
+
+    The first caller for a key starts the call as a task, every caller that arrives while it is
+    still running awaits the same task. The result (or the exception) is delivered to all of them.
+    Callers are shielded from each other, so a cancelled caller does not cancel the shared call
+    while others still wait for it. Once the last caller has left, the shared call is cancelled.
+
+    The shared call runs under the latest deadline of its callers (none if one of them has
+    none), pushed back as later callers join: it must not be cut short by the deadline of
+    whichever caller happened to start it, nor outlive all of them. Each caller bounds its own
+    wait (see run_within_deadline). Calls only coalesce with calls of the same priority, so an
+    interactive request never waits on a call queued in the background lane of the limiter.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Flight] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(method: str, url: str, payload: Optional[Any] = None) -> tuple[str, str, str]:
+        """Build a call key from the method, url and the canonical JSON form of the payload"""
+        canonical_payload = json.dumps(payload, sort_keys=True, separators=(",", ":")) if payload is not None else ""
+        return (method.upper(), url, canonical_payload)
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) once per key and priority, sharing the outcome with concurrent callers"""
+        key = (current_priority(), key)
+        deadline = current_deadline()
+        flight = self._calls.get(key)
+
+        if flight is None:
+            context = context_with_deadline(deadline)
+            task = asyncio.get_running_loop().create_task(fn(*args, **kwargs), context=context)
+            flight = _Flight(task, context)
+            self._calls[key] = flight
+            self.executed += 1
+            task.add_done_callback(lambda done_task: self._forget(key, done_task))
+        else:
+            self.coalesced += 1
+            extend_deadline(flight.context, deadline)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # every caller gave up, nobody is left to use the result
+                flight.task.cancel()
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        flight = self._calls.get(key)
+        if flight is not None and flight.task is task:
+            del self._calls[key]
+        # mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
+
+    def reset(self):
+        """Reset counters, in-flight calls are left to finish"""
+        self.executed = 0
+        self.coalesced = 0
+
+
+# Create a global instance
+single_flight = SingleFlight()
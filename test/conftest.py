@@ -1,7 +1,11 @@
 
 from src.services.data_service import DataService
+import json
 import pytest
-from aiohttp import ClientError
+from aiohttp import ClientResponseError, RequestInfo
+from pydantic_core import to_jsonable_python
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
 from unittest.mock import patch, PropertyMock, MagicMock
 from services.opengin_service import OpenGINService
 from src.utils.http_client import HTTPClient
@@ -9,19 +13,45 @@ from services.organisation_service import OrganisationService
 from unittest.mock import AsyncMock
 from src.utils.util_functions import Util
 from src.services.person_service import PersonService
+from src.utils.cache import dataset_cache, entity_cache, not_found_cache, relation_cache
+from src.utils.circuit_breaker import circuit_breakers
+from src.utils.hedging import hedger
+from src.utils.retry import retry_policy
+from src.utils.concurrency_limiter import opengin_bulk_limiter, opengin_limiter
+from src.utils.load_balancer import opengin_balancer
+from src.utils.compression import payload_stats
+from src.utils.response_cache import response_cache
+from src.utils.readiness import readiness
+
+# MockStreamReader simulates aiohttp's response.content, handing out the body in chunks
+class MockStreamReader:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self._data), size):
+            yield self._data[start:start + size]
 
 # MockResponse class to simulate aiohttp responses
 class MockResponse:
-    def __init__(self, json_data, status=200):
+    def __init__(self, json_data, status=200, headers=None):
         self._json_data = json_data
         self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self.content = MockStreamReader(json.dumps(json_data, default=to_jsonable_python).encode())
 
     async def json(self):
         return self._json_data
 
+    async def read(self):
+        # the raw body as OpenGIN would send it, pydantic models in the data become plain JSON
+        return json.dumps(self._json_data, default=to_jsonable_python).encode()
+
     def raise_for_status(self):
         if self.status >= 400:
-            raise ClientError("HTTP error")
+            url = URL("http://opengin.test")
+            request_info = RequestInfo(url, "GET", CIMultiDictProxy(CIMultiDict()), url)
+            raise ClientResponseError(request_info, (), status=self.status, message="HTTP error", headers=self.headers)
 
     async def __aenter__(self):
         return self
@@ -29,14 +59,42 @@ class MockResponse:
     async def __aexit__(self, exc_type, exc, tb):
         pass
 
+# Async iterator over the given items, to mock streaming methods such as iter_entities
+async def async_iter(items):
+    for item in items:
+        yield item
+
+# Caches, circuit breakers, hedging, retry, concurrency limiter, load balancer and payload accounting state are process wide, start every test from a clean state
+def reset_shared_state():
+    entity_cache.clear()
+    relation_cache.clear()
+    dataset_cache.clear()
+    not_found_cache.clear()
+    circuit_breakers.reset()
+    hedger.reset()
+    retry_policy.reset()
+    opengin_limiter.reset()
+    opengin_bulk_limiter.reset()
+    opengin_balancer.reset()
+    payload_stats.reset()
+    response_cache.clear()
+    readiness.reset()
+
+@pytest.fixture(autouse=True)
+def clear_shared_state():
+    reset_shared_state()
+    yield
+    reset_shared_state()
+
 # Fixture for OpenGINService tests
 @pytest.fixture
 def mock_session():
-    """Fixture that provides a mocked session and patches HTTPClient"""
+    """Fixture that provides a mocked session and patches HTTPClient, every pool hands out the same session"""
     session = MagicMock() 
     with patch.object(HTTPClient, 'session', new_callable=PropertyMock) as mock_prop:
         mock_prop.return_value = session
-        yield session
+        with patch.object(HTTPClient, 'session_for', return_value=session):
+            yield session
 
 @pytest.fixture
 def mock_service():
@@ -47,7 +105,10 @@ def mock_service():
 # Fixtueres for OrganisationService tests
 @pytest.fixture
 def mock_opengin_service():
-    return AsyncMock(spec=OpenGINService)
+    service = AsyncMock(spec=OpenGINService)
+    service.get_entities_by_ids.return_value = ({}, {})
+    service.iter_entities = MagicMock(side_effect=lambda *args, **kwargs: async_iter([]))
+    return service
 
 @pytest.fixture
 def organisation_service(mock_opengin_service):
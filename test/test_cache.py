@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import patch
+from src.exception.exceptions import NotFoundError
+from src.utils.cache import NotFoundCache, TTLCache, create_cache
+from src.utils.shared_cache import SharedCache
+
+# Tests for TTLCache
+def test_cache_returns_stored_value():
+    cache = TTLCache("test", max_entries=10, ttl=60)
+    cache.set("entity_123", ["value"])
+
+    assert cache.get("entity_123") == ["value"]
+    assert cache.stats()["hits"] == 1
+
+def test_cache_miss_for_unknown_key():
+    cache = TTLCache("test", max_entries=10, ttl=60)
+
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 1
+
+def test_cache_entry_expires_after_ttl():
+    cache = TTLCache("test", max_entries=10, ttl=60)
+
+    with patch("src.utils.cache.time.monotonic", return_value=100):
+        cache.set("entity_123", "value")
+    with patch("src.utils.cache.time.monotonic", return_value=161):
+        assert cache.get("entity_123") is None
+
+    assert len(cache) == 0
+
+def test_cache_per_entry_ttl_overrides_default():
+    cache = TTLCache("test", max_entries=10, ttl=60)
+
+    with patch("src.utils.cache.time.monotonic", return_value=100):
+        cache.set("entity_123", "value", ttl=600)
+    with patch("src.utils.cache.time.monotonic", return_value=500):
+        assert cache.get("entity_123") == "value"
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache("test", max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_disabled_with_zero_entries():
+    cache = TTLCache("test", max_entries=0, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+def test_cache_hit_ratio():
+    cache = TTLCache("test", max_entries=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats()["hit_ratio"] == 0.5
+
+# Tests for NotFoundCache
+def test_not_found_cache_raises_the_remembered_error():
+    cache = NotFoundCache("test", max_entries=10, ttl=60)
+    cache.check("metadata", "key")
+
+    cache.remember("metadata", "key", NotFoundError("Metadata not found"))
+
+    with pytest.raises(NotFoundError) as error:
+        cache.check("metadata", "key")
+    assert error.value.detail == "Metadata not found"
+    cache.check("attributes", "key")
+    assert cache.stats()["short_circuits"] == {"metadata": 1}
+
+def test_not_found_cache_is_bypassed_when_caching_is_disabled():
+    cache = NotFoundCache("test", max_entries=10, ttl=60)
+
+    with patch("src.utils.cache.settings.CACHE_ENABLED", False):
+        cache.remember("metadata", "key", NotFoundError("Metadata not found"))
+        cache.check("metadata", "key")
+
+    assert len(cache) == 0
+
+# Tests for the cache backend selection
+def test_create_cache_uses_the_configured_backend(tmp_path):
+    assert isinstance(create_cache("test", max_entries=10, ttl=60), TTLCache)
+
+    with patch("src.utils.cache.settings.CACHE_BACKEND", "sqlite"), patch("src.utils.cache.settings.CACHE_SQLITE_PATH", str(tmp_path / "cache.sqlite3")):
+        cache = create_cache("test", max_entries=10, ttl=60)
+
+    assert isinstance(cache, SharedCache)
+    assert cache.path == str(tmp_path / "cache.sqlite3")
+
+# Tests for the cache introspection
+def test_cache_top_keys_forget_deleted_entries():
+    cache = TTLCache("test", max_entries=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("b")
+
+    cache.delete_where(lambda key, value: value == 2)
+
+    assert cache.top_keys(5) == [{"key": "a", "hits": 1}]
@@ -0,0 +1,120 @@
+import threading
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.exception.exceptions import BadRequestError
+from src.models.organisation_schemas import Entity, Relation
+from src.routers.admin_router import get_cache_admin_service, router
+from src.services.cache_admin_service import CacheAdminService
+from src.utils.cache import TTLCache
+from src.utils.shared_cache import SharedCache
+
+
+@pytest.fixture
+def caches():
+    caches = {
+        "entities": TTLCache("entities", max_entries=10, ttl=60),
+        "relations": TTLCache("relations", max_entries=10, ttl=60),
+        "responses": TTLCache("responses", max_entries=10, ttl=60),
+    }
+    caches["entities"].set("dep_1", [Entity(id="dep_1", name="Department")])
+    caches["entities"].set("dep_1#id,name", [Entity(id="dep_1", name="Department")])
+    caches["entities"].set("dep_10", [Entity(id="dep_10", name="Other department")])
+    caches["relations"].set("dep_1:AS_DEPARTMENT:INCOMING:None", [Relation(relatedEntityId="ministry_1")])
+    caches["relations"].set("ministry_1:AS_DEPARTMENT:OUTGOING:None", [Relation(relatedEntityId="dep_1")])
+    caches["relations"].set("ministry_2:AS_DEPARTMENT:OUTGOING:None", [Relation(relatedEntityId="dep_10")])
+    caches["responses"].set("/v1/organisation/department-history/dep_1", {"value": [], "stored_at": 0})
+    caches["responses"].set("/v1/person/all-presidents", {"value": {"presidents": [{"id": "president_1"}]}, "stored_at": 0})
+    return caches
+
+# Tests for CacheAdminService
+@pytest.mark.asyncio
+async def test_purge_entity_cascades_to_relations_and_responses(caches):
+    result = await CacheAdminService(caches).purge_entity("dep_1")
+
+    assert sorted(result["removed"]["entities"]) == ["dep_1", "dep_1#id,name"]
+    assert sorted(result["removed"]["relations"]) == ["dep_1:AS_DEPARTMENT:INCOMING:None", "ministry_1:AS_DEPARTMENT:OUTGOING:None"]
+    assert result["removed"]["responses"] == ["/v1/organisation/department-history/dep_1"]
+    assert caches["entities"].get("dep_10") is not None
+    assert caches["relations"].get("ministry_2:AS_DEPARTMENT:OUTGOING:None") is not None
+
+@pytest.mark.asyncio
+async def test_purge_entity_matches_ids_inside_response_values(caches):
+    result = await CacheAdminService(caches).purge_entity("president_1")
+
+    assert result["removed"] == {"entities": [], "relations": [], "responses": ["/v1/person/all-presidents"]}
+
+@pytest.mark.asyncio
+async def test_purge_prefix_in_one_cache(caches):
+    result = await CacheAdminService(caches).purge_prefix("ministry_", cache_name="relations")
+
+    assert set(result["removed"]) == {"relations"}
+    assert len(result["removed"]["relations"]) == 2
+    assert len(caches["relations"]) == 1
+
+@pytest.mark.asyncio
+async def test_purge_prefix_rejects_unknown_cache(caches):
+    with pytest.raises(BadRequestError):
+        await CacheAdminService(caches).purge_prefix("dep_", cache_name="unknown")
+
+@pytest.mark.asyncio
+async def test_purge_all_empties_every_cache(caches):
+    result = await CacheAdminService(caches).purge_all()
+
+    assert result["removed"] == {"entities": 3, "relations": 3, "responses": 2}
+    assert all(len(cache) == 0 for cache in caches.values())
+
+@pytest.mark.asyncio
+async def test_cache_stats_lists_the_most_hit_keys(caches):
+    caches["entities"].get("dep_10")
+    caches["entities"].get("dep_10")
+    caches["entities"].get("dep_1")
+
+    stats = (await CacheAdminService(caches).cache_stats(top=1))["caches"]["entities"]
+
+    assert stats["top_keys"] == [{"key": "dep_10", "hits": 2}]
+    assert stats["size"] == 3
+    assert stats["memory_bytes"] > 0
+
+@pytest.mark.asyncio
+async def test_shared_cache_is_walked_off_the_event_loop(tmp_path):
+    shared = SharedCache("entities", max_entries=10, ttl=60, path=str(tmp_path / "cache.sqlite3"))
+    shared.set("dep_1", [Entity(id="dep_1")])
+    threads = set()
+    delete_where = shared.delete_where
+
+    def recording_delete_where(predicate):
+        threads.add(threading.get_ident())
+        return delete_where(predicate)
+
+    with patch.object(shared, "delete_where", side_effect=recording_delete_where):
+        result = await CacheAdminService({"entities": shared}).purge_entity("dep_1")
+
+    assert result["removed"] == {"entities": ["dep_1"]}
+    assert threads and threading.get_ident() not in threads
+    assert (await CacheAdminService({"entities": shared}).purge_all())["removed"] == {"entities": 0}
+
+# Tests for the admin router
+def make_client(caches) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_cache_admin_service] = lambda: CacheAdminService(caches)
+    return TestClient(app)
+
+def test_admin_endpoints_are_disabled_without_a_token(caches):
+    with patch("src.routers.admin_router.settings.ADMIN_TOKEN", ""):
+        response = make_client(caches).get("/admin/caches", headers={"X-Admin-Token": ""})
+
+    assert response.status_code == 403
+
+def test_admin_endpoints_require_the_token(caches):
+    client = make_client(caches)
+
+    with patch("src.routers.admin_router.settings.ADMIN_TOKEN", "secret"):
+        assert client.get("/admin/caches").status_code == 401
+        assert client.get("/admin/caches", headers={"X-Admin-Token": "wrong"}).status_code == 401
+        response = client.delete("/admin/caches/entity/dep_1", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert len(response.json()["removed"]["entities"]) == 2
@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import patch
+from src.enums import CircuitStateEnum
+from src.exception.exceptions import GatewayTimeoutError, NotFoundError, ServiceUnavailableError
+from src.utils.circuit_breaker import CircuitBreaker
+
+def make_breaker():
+    return CircuitBreaker("entities", failure_rate_threshold=0.5, window_size=4, minimum_calls=4, open_seconds=30, half_open_calls=2)
+
+def fail(breaker):
+    with pytest.raises(RuntimeError):
+        with breaker.protect():
+            raise RuntimeError("upstream failure")
+
+def succeed(breaker):
+    with breaker.protect():
+        pass
+
+# Tests for CircuitBreaker
+def test_circuit_stays_closed_below_minimum_calls():
+    breaker = make_breaker()
+    for _ in range(3):
+        fail(breaker)
+
+    assert breaker.state == CircuitStateEnum.CLOSED
+
+def test_circuit_opens_when_failure_rate_reached():
+    breaker = make_breaker()
+    succeed(breaker)
+    succeed(breaker)
+    fail(breaker)
+    fail(breaker)
+
+    assert breaker.state == CircuitStateEnum.OPEN
+    assert breaker.stats()["times_opened"] == 1
+
+def test_open_circuit_fails_fast():
+    breaker = make_breaker()
+    for _ in range(4):
+        fail(breaker)
+
+    with pytest.raises(ServiceUnavailableError):
+        succeed(breaker)
+    assert breaker.rejected == 1
+
+def test_not_found_counts_as_success():
+    breaker = make_breaker()
+    for _ in range(4):
+        with pytest.raises(NotFoundError):
+            with breaker.protect():
+                raise NotFoundError("not found")
+
+    assert breaker.state == CircuitStateEnum.CLOSED
+    assert breaker.failure_rate == 0.0
+
+def test_expired_deadline_is_not_counted():
+    breaker = make_breaker()
+    for _ in range(10):
+        with pytest.raises(GatewayTimeoutError):
+            with breaker.protect():
+                raise GatewayTimeoutError("deadline expired")
+
+    assert breaker.state == CircuitStateEnum.CLOSED
+    assert len(breaker._outcomes) == 0
+
+def test_expired_deadline_frees_the_probe_slot():
+    breaker = make_breaker()
+    with patch("src.utils.circuit_breaker.time.monotonic", return_value=100):
+        for _ in range(4):
+            fail(breaker)
+
+    with patch("src.utils.circuit_breaker.time.monotonic", return_value=131):
+        for _ in range(2):
+            with pytest.raises(GatewayTimeoutError):
+                with breaker.protect():
+                    raise GatewayTimeoutError("deadline expired")
+        succeed(breaker)
+        succeed(breaker)
+
+    assert breaker.state == CircuitStateEnum.CLOSED
+
+def test_circuit_closes_after_successful_probes():
+    breaker = make_breaker()
+    with patch("src.utils.circuit_breaker.time.monotonic", return_value=100):
+        for _ in range(4):
+            fail(breaker)
+
+    with patch("src.utils.circuit_breaker.time.monotonic", return_value=131):
+        succeed(breaker)
+        assert breaker.state == CircuitStateEnum.HALF_OPEN
+        succeed(breaker)
+
+    assert breaker.state == CircuitStateEnum.CLOSED
+
+def test_failed_probe_reopens_circuit():
+    breaker = make_breaker()
+    with patch("src.utils.circuit_breaker.time.monotonic", return_value=100):
+        for _ in range(4):
+            fail(breaker)
+
+    with patch("src.utils.circuit_breaker.time.monotonic", return_value=131):
+        fail(breaker)
+
+    assert breaker.state == CircuitStateEnum.OPEN
+    assert breaker.times_opened == 2
@@ -0,0 +1,49 @@
+import gzip
+import zlib
+import pytest
+from src.utils.compression import Decompressor, PayloadStats, decompress
+
+BODY = b'{"columns": ["a", "b"], "rows": [[1, 2], [3, 4]]}' * 50
+
+def test_decompress_gzip():
+    assert decompress(gzip.compress(BODY), "gzip") == BODY
+
+@pytest.mark.parametrize("wbits", [zlib.MAX_WBITS, -zlib.MAX_WBITS])
+def test_decompress_deflate_in_zlib_and_raw_form(wbits):
+    compressor = zlib.compressobj(wbits=wbits)
+    compressed = compressor.compress(BODY) + compressor.flush()
+
+    assert decompress(compressed, "deflate") == BODY
+
+def test_identity_passes_through():
+    assert decompress(BODY, None) == BODY
+    assert decompress(BODY, "identity") == BODY
+
+def test_decompressor_accepts_arbitrary_chunks():
+    compressed = gzip.compress(BODY)
+    decompressor = Decompressor("GZIP")
+
+    decoded = b"".join(decompressor.feed(compressed[start:start + 7]) for start in range(0, len(compressed), 7))
+
+    assert decoded + decompressor.flush() == BODY
+
+def test_unsupported_encoding():
+    with pytest.raises(ValueError):
+        Decompressor("br")
+
+def test_payload_stats_per_operation():
+    stats = PayloadStats()
+    stats.record("attributes", "gzip", wire_bytes=100, decoded_bytes=1000, decompress_seconds=0.002, decode_seconds=0.004)
+    stats.record("attributes", None, wire_bytes=300, decoded_bytes=300, decompress_seconds=0.0, decode_seconds=0.002)
+
+    assert stats.stats() == {
+        "attributes": {
+            "responses": 2,
+            "compressed_responses": 1,
+            "wire_bytes": 400,
+            "decoded_bytes": 1300,
+            "compression_ratio": 3.25,
+            "avg_decompress_ms": 1.0,
+            "avg_decode_ms": 3.0,
+        }
+    }
@@ -0,0 +1,208 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from aiohttp import ClientConnectionError
+from src.enums import PriorityEnum
+from src.exception.exceptions import NotFoundError
+from src.utils.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.utils.priority import current_priority, request_priority
+
+def make_limiter(initial_limit=2, min_limit=1, max_limit=4, background_reserved=0) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(initial_limit=initial_limit, min_limit=min_limit, max_limit=max_limit, backoff_ratio=0.5, latency_tolerance=2.0, background_reserved=background_reserved)
+
+@pytest.mark.asyncio
+async def test_requests_above_the_limit_wait_for_a_slot():
+    limiter = make_limiter(initial_limit=2)
+    release = asyncio.Event()
+    started = []
+
+    async def call(index):
+        async with limiter.slot():
+            started.append(index)
+            await release.wait()
+
+    tasks = [asyncio.create_task(call(index)) for index in range(3)]
+    await asyncio.sleep(0)
+
+    assert started == [0, 1]
+    assert limiter.in_flight == 2
+    assert limiter.queued == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert started == [0, 1, 2]
+    assert limiter.in_flight == 0
+    assert limiter.stats()["lanes"]["interactive"]["queue_wait_p95_ms"] is not None
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_in_use():
+    limiter = make_limiter(initial_limit=2, max_limit=3)
+
+    async def call():
+        async with limiter.slot():
+            await asyncio.sleep(0)
+
+    # a frozen clock, so that no call looks slower than the smoothed latency
+    with patch("src.utils.concurrency_limiter.time.monotonic", return_value=100):
+        await asyncio.gather(call(), call())
+        await asyncio.gather(call(), call(), call())
+
+    assert limiter.limit == 3
+    assert limiter.increases == 1
+
+@pytest.mark.asyncio
+async def test_limit_does_not_grow_when_idle():
+    limiter = make_limiter(initial_limit=4)
+
+    async with limiter.slot():
+        pass
+
+    assert limiter.limit == 4
+    assert limiter.increases == 0
+
+@pytest.mark.asyncio
+async def test_limit_backs_off_on_overload_errors():
+    limiter = make_limiter(initial_limit=4)
+
+    with pytest.raises(ClientConnectionError):
+        async with limiter.slot():
+            raise ClientConnectionError("Connection reset")
+
+    assert limiter.limit == 2
+
+    for _ in range(3):
+        with pytest.raises(ClientConnectionError):
+            async with limiter.slot():
+                raise ClientConnectionError("Connection reset")
+
+    assert limiter.limit == 1
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_an_overload():
+    limiter = make_limiter(initial_limit=4)
+
+    with pytest.raises(NotFoundError):
+        async with limiter.slot():
+            raise NotFoundError("missing")
+
+    assert limiter.limit == 4
+
+@pytest.mark.asyncio
+async def test_limit_backs_off_when_latency_rises():
+    limiter = make_limiter(initial_limit=4)
+    limiter.smoothed_latency["default"] = 0.001
+
+    async with limiter.slot():
+        await asyncio.sleep(0.02)
+
+    assert limiter.limit == 2
+    assert limiter.decreases == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = make_limiter(initial_limit=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    async def wait():
+        async with limiter.slot():
+            pass
+
+    waiter = asyncio.create_task(wait())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.queued == 0
+
+    release.set()
+    await holder
+    assert limiter.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_latency_is_compared_per_operation():
+    limiter = make_limiter(initial_limit=4)
+    limiter.smoothed_latency["lookups"] = 0.001
+
+    async with limiter.slot("searches"):
+        await asyncio.sleep(0.02)
+    async with limiter.slot("searches"):
+        await asyncio.sleep(0.02)
+
+    assert limiter.decreases == 0
+    assert set(limiter.smoothed_latency) == {"lookups", "searches"}
+
+@pytest.mark.asyncio
+async def test_unsampled_calls_do_not_count_as_congestion():
+    limiter = make_limiter(initial_limit=4)
+    limiter.smoothed_latency["default"] = 0.001
+
+    async with limiter.slot(sample_latency=False):
+        await asyncio.sleep(0.02)
+
+    assert limiter.limit == 4
+    assert limiter.smoothed_latency == {"default": 0.001}
+
+# Priority lanes
+def test_priority_defaults_to_interactive():
+    assert current_priority() == PriorityEnum.INTERACTIVE
+
+    with request_priority(PriorityEnum.BACKGROUND):
+        assert current_priority() == PriorityEnum.BACKGROUND
+
+    assert current_priority() == PriorityEnum.INTERACTIVE
+
+async def run_lanes(limiter: AdaptiveConcurrencyLimiter, lanes: list[PriorityEnum]) -> list[str]:
+    """Fill the limiter, queue one call per given lane and return the order in which they got a slot"""
+    release = asyncio.Event()
+    order = []
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    async def call(name: str):
+        async with limiter.slot():
+            order.append(name)
+
+    holders = [asyncio.create_task(hold()) for _ in range(int(limiter.limit))]
+    await asyncio.sleep(0)
+
+    tasks = []
+    for index, lane in enumerate(lanes):
+        with request_priority(lane):
+            tasks.append(asyncio.create_task(call(f"{lane.value}-{index}")))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(*holders, *tasks)
+    return order
+
+@pytest.mark.asyncio
+async def test_interactive_calls_are_served_first():
+    limiter = make_limiter(initial_limit=1, max_limit=1)
+
+    order = await run_lanes(limiter, [PriorityEnum.BACKGROUND, PriorityEnum.INTERACTIVE, PriorityEnum.INTERACTIVE])
+
+    assert order == ["interactive-1", "interactive-2", "background-0"]
+
+@pytest.mark.asyncio
+async def test_background_calls_keep_their_reserved_slots():
+    limiter = make_limiter(initial_limit=1, max_limit=1, background_reserved=1)
+
+    order = await run_lanes(limiter, [PriorityEnum.INTERACTIVE, PriorityEnum.BACKGROUND])
+
+    assert order == ["background-1", "interactive-0"]
+    stats = limiter.stats()["lanes"]
+    assert stats["background"]["latency_p50_ms"] is not None
+    assert stats["interactive"]["queued"] == 0
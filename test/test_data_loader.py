@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from src.utils.data_loader import DataLoader, current_loaders, loader_stats, request_scope
+
+def make_loader(calls: list):
+    async def batch(keys):
+        calls.append(list(keys))
+        return [ValueError(key) if key == "bad" else key.upper() for key in keys]
+    return DataLoader("test", batch)
+
+@pytest.fixture(autouse=True)
+def reset_loader_stats():
+    loader_stats.reset()
+    yield
+    loader_stats.reset()
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_are_batched_and_deduplicated():
+    calls = []
+    loader = make_loader(calls)
+
+    results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("a"))
+
+    assert results == ["A", "B", "A"]
+    assert calls == [["a", "b"]]
+    assert loader_stats.stats()["test"] == {"loads": 3, "batches": 1, "keys": 2, "deduplicated": 1}
+
+@pytest.mark.asyncio
+async def test_results_are_memoized_across_ticks():
+    calls = []
+    loader = make_loader(calls)
+
+    assert await loader.load("a") == "A"
+    assert await asyncio.gather(loader.load("a"), loader.load("c")) == ["A", "C"]
+
+    assert calls == [["a"], ["c"]]
+
+@pytest.mark.asyncio
+async def test_an_error_fails_only_its_key():
+    loader = make_loader([])
+
+    results = await asyncio.gather(loader.load("a"), loader.load("bad"), return_exceptions=True)
+
+    assert results[0] == "A"
+    assert isinstance(results[1], ValueError)
+    with pytest.raises(ValueError):
+        await loader.load("bad")
+
+@pytest.mark.asyncio
+async def test_a_failing_batch_fails_all_its_keys():
+    async def batch(keys):
+        raise RuntimeError("upstream down")
+    loader = DataLoader("test", batch)
+
+    results = await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.asyncio
+async def test_a_cancelled_caller_does_not_cancel_the_shared_load():
+    release = asyncio.Event()
+    async def batch(keys):
+        await release.wait()
+        return ["value" for _ in keys]
+    loader = DataLoader("test", batch)
+
+    first = asyncio.create_task(loader.load("a"))
+    second = asyncio.create_task(loader.load("a"))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "value"
+
+@pytest.mark.asyncio
+async def test_request_scope_binds_fresh_loaders():
+    assert current_loaders() is None
+
+    with request_scope():
+        loaders = current_loaders()
+        assert loaders is not None
+        assert loaders.get("test", None) is loaders.get("test", None)
+
+        with request_scope():
+            assert current_loaders() is not loaders
+
+    assert current_loaders() is None
+
+@pytest.mark.asyncio
+async def test_batch_runs_outside_of_the_request_scope():
+    seen = []
+    async def batch(keys):
+        seen.append(current_loaders())
+        return keys
+
+    with request_scope():
+        await current_loaders().get("test", batch).load("a")
+
+    assert seen == [None]
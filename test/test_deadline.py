@@ -0,0 +1,239 @@
+import asyncio
+import time
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from contextvars import ContextVar
+from unittest.mock import AsyncMock, patch
+from src.core.config import settings
+from src.exception.exceptions import GatewayTimeoutError
+from src.middleware.deadline import DeadlineMiddleware
+from src.models.organisation_schemas import Entity
+from src.utils.deadline import start_deadline, remaining_time, deadline_expired, run_within_deadline
+from src.utils.single_flight import SingleFlight
+from test.conftest import MockResponse
+
+# Delays the response of a mocked request, like a slow upstream
+class SlowResponse:
+    def __init__(self, response, seconds):
+        self._response = response
+        self._seconds = seconds
+        self.cancelled = False
+
+    async def __aenter__(self):
+        try:
+            await asyncio.sleep(self._seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+@pytest.fixture
+def deadline():
+    """Give the test its own deadline context variable, returns the setter for the deadline"""
+    with patch("src.utils.deadline._deadline", ContextVar("request_deadline", default=None)):
+        yield start_deadline
+
+def test_no_deadline_outside_of_a_request():
+    assert remaining_time() is None
+    assert deadline_expired() is False
+
+def test_remaining_time_counts_down(deadline):
+    deadline(5)
+
+    assert 4 < remaining_time() <= 5
+    assert deadline_expired() is False
+
+    deadline(-1)
+    assert deadline_expired() is True
+
+@pytest.mark.asyncio
+async def test_run_within_deadline_times_out(deadline):
+    deadline(0.05)
+
+    with pytest.raises(GatewayTimeoutError):
+        await run_within_deadline(asyncio.sleep, 1)
+
+@pytest.mark.asyncio
+async def test_run_within_deadline_fails_fast_once_expired(deadline):
+    deadline(-1)
+    fn = AsyncMock()
+
+    with pytest.raises(GatewayTimeoutError):
+        await run_within_deadline(fn)
+
+    fn.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_run_within_deadline_without_deadline():
+    fn = AsyncMock(return_value="ok")
+
+    assert await run_within_deadline(fn, 1, key="value") == "ok"
+    fn.assert_awaited_once_with(1, key="value")
+
+# OpenGINService under a deadline
+@pytest.mark.asyncio
+async def test_upstream_timeout_is_capped_to_the_remaining_time(mock_service, mock_session, deadline):
+    deadline(2)
+    mock_session.post.return_value = MockResponse({"body": [{"id": "entity_123"}]})
+
+    await mock_service.get_entities(Entity(id="entity_123"))
+
+    timeout = mock_session.post.call_args.kwargs["timeout"]
+    assert 0 < timeout.total <= 2
+    assert timeout.sock_read <= 2
+
+@pytest.mark.asyncio
+async def test_shared_call_is_not_bound_by_the_deadline_of_the_caller_that_started_it(mock_service, mock_session, deadline):
+    mock_session.post.side_effect = lambda *args, **kwargs: SlowResponse(MockResponse({"body": [{"id": "entity_123"}]}), 0.2)
+
+    async def call(seconds, delay=0):
+        await asyncio.sleep(delay)
+        deadline(seconds)
+        return await mock_service.get_entities(Entity(id="entity_123"))
+
+    impatient, patient = await asyncio.gather(call(0.1), call(30, delay=0.05), return_exceptions=True)
+
+    assert isinstance(impatient, GatewayTimeoutError)
+    assert patient[0].id == "entity_123"
+    mock_session.post.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_shared_call_runs_under_the_latest_deadline_of_its_callers(deadline):
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    budgets = []
+
+    async def fetch():
+        await release.wait()
+        budgets.append(remaining_time())
+
+    async def call(seconds):
+        if seconds is not None:
+            deadline(seconds)
+        await single_flight.do("key", fetch)
+
+    callers = [asyncio.create_task(call(1)), asyncio.create_task(call(5))]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*callers)
+
+    callers = [asyncio.create_task(call(1)), asyncio.create_task(call(None))]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await asyncio.gather(*callers)
+
+    assert 4 < budgets[0] <= 5
+    assert budgets[1] is None
+
+@pytest.mark.asyncio
+async def test_shared_call_is_cancelled_once_every_caller_timed_out(mock_service, mock_session, deadline):
+    slow_response = SlowResponse(MockResponse({"body": [{"id": "entity_123"}]}), 1)
+    mock_session.post.return_value = slow_response
+    deadline(0.1)
+
+    with pytest.raises(GatewayTimeoutError):
+        await mock_service.get_entities(Entity(id="entity_123"))
+    await asyncio.sleep(0.01)
+
+    assert slow_response.cancelled
+
+@pytest.mark.asyncio
+async def test_no_upstream_call_once_the_deadline_expired(mock_service, mock_session, deadline):
+    deadline(-1)
+
+    with pytest.raises(GatewayTimeoutError):
+        await mock_service.get_entities(Entity(id="entity_123"))
+
+    mock_session.post.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_upstream_timeout_after_deadline_is_not_retried(mock_service, mock_session, deadline):
+    deadline(0.05)
+
+    async def slow_read():
+        await asyncio.sleep(0.1)
+        raise asyncio.TimeoutError()
+
+    response = MockResponse({})
+    response.read = slow_read
+    mock_session.get.return_value = response
+
+    with pytest.raises(GatewayTimeoutError):
+        await mock_service._get_metadata("entity_123", "http://opengin/v1/entities/entity_123/metadata")
+
+    assert mock_session.get.call_count == 1
+
+# DeadlineMiddleware
+def create_app():
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware)
+
+    @app.get("/v1/person/all-presidents")
+    async def long_route():
+        return {"remaining": remaining_time()}
+
+    @app.get("/v1/data/remaining")
+    async def default_route():
+        return {"remaining": remaining_time()}
+
+    @app.get("/v1/data/slow")
+    async def slow_route(request: Request):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            app.state.cancelled = True
+            raise
+        return {}
+
+    return app
+
+def test_middleware_uses_the_default_deadline():
+    client = TestClient(create_app())
+
+    remaining = client.get("/v1/data/remaining").json()["remaining"]
+
+    assert settings.REQUEST_DEADLINE_DEFAULT - 1 < remaining <= settings.REQUEST_DEADLINE_DEFAULT
+
+def test_middleware_uses_the_route_deadline():
+    client = TestClient(create_app())
+
+    remaining = client.get("/v1/person/all-presidents").json()["remaining"]
+
+    route_seconds = settings.REQUEST_DEADLINE_ROUTES["/v1/person/all-presidents"]
+    assert route_seconds - 1 < remaining <= route_seconds
+
+def test_middleware_header_overrides_and_is_capped():
+    client = TestClient(create_app())
+    header = settings.REQUEST_DEADLINE_HEADER
+
+    remaining = client.get("/v1/data/remaining", headers={header: "5"}).json()["remaining"]
+    assert 4 < remaining <= 5
+
+    remaining = client.get("/v1/data/remaining", headers={header: "100000"}).json()["remaining"]
+    assert remaining <= settings.REQUEST_DEADLINE_MAX
+
+    remaining = client.get("/v1/data/remaining", headers={header: "soon"}).json()["remaining"]
+    assert settings.REQUEST_DEADLINE_DEFAULT - 1 < remaining <= settings.REQUEST_DEADLINE_DEFAULT
+
+def test_middleware_returns_gateway_timeout_when_expired():
+    client = TestClient(create_app())
+
+    response = client.get("/v1/data/slow", headers={settings.REQUEST_DEADLINE_HEADER: "0.05"})
+
+    assert response.status_code == 504
+
+def test_middleware_cancels_the_expired_request():
+    app = create_app()
+    app.state.cancelled = False
+    client = TestClient(app)
+
+    started_at = time.monotonic()
+    response = client.get("/v1/data/slow", headers={settings.REQUEST_DEADLINE_HEADER: "0.05"})
+
+    assert response.status_code == 504
+    assert app.state.cancelled
+    assert time.monotonic() - started_at < 0.5
@@ -0,0 +1,139 @@
+import os
+import threading
+import pytest
+from unittest.mock import patch
+from src.models.organisation_schemas import Entity
+from src.utils.cache import TTLCache
+from src.utils.disk_cache import DiskStore, TieredCache
+
+
+def entry_files(directory):
+    return [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names if name.endswith(".entry")]
+
+# Tests for DiskStore
+def test_disk_store_survives_a_restart(tmp_path):
+    DiskStore(str(tmp_path), max_bytes=1_000_000).set("entities", "entity_123", [Entity(id="entity_123", name="Test Entity")], expires_at=4102444800)
+
+    restarted = DiskStore(str(tmp_path), max_bytes=1_000_000)
+    value, expires_at = restarted.get("entities", "entity_123")
+
+    assert value == [Entity(id="entity_123", name="Test Entity")]
+    assert expires_at == 4102444800
+    assert restarted.stats()["hits"] == {"entities": 1}
+
+def test_disk_store_drops_expired_entries(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000)
+
+    with patch("src.utils.disk_cache.time.time", return_value=100):
+        store.set("datasets", "key", {"rows": []}, expires_at=160)
+    with patch("src.utils.disk_cache.time.time", return_value=161):
+        assert store.get("datasets", "key") is None
+
+    assert entry_files(tmp_path) == []
+
+def test_disk_store_drops_corrupt_entries(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000)
+    store.set("datasets", "key", {"rows": [[1, 2]]}, expires_at=4102444800)
+    [path] = entry_files(tmp_path)
+    with open(path, "r+b") as file:
+        file.seek(-3, os.SEEK_END)
+        file.write(b"999")
+
+    assert store.get("datasets", "key") is None
+    assert store.stats()["corrupt"] == 1
+    assert entry_files(tmp_path) == []
+
+def test_disk_store_keys_are_versioned(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000)
+    store.set("datasets", "key", {"rows": []}, expires_at=4102444800)
+
+    with patch("src.utils.disk_cache.DISK_CACHE_VERSION", 2):
+        assert store.get("datasets", "key") is None
+
+def test_disk_store_evicts_least_recently_used_beyond_the_size_cap(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000, touch_interval=0)
+    store.load_index()
+    store.set("datasets", "a", {"rows": "x" * 100}, expires_at=4102444800)
+    entry_size = store.stats()["bytes"]
+    store.max_bytes = entry_size * 2
+    store.set("datasets", "b", {"rows": "x" * 100}, expires_at=4102444800)
+    store.get("datasets", "a")
+
+    store.set("datasets", "c", {"rows": "x" * 100}, expires_at=4102444800)
+
+    assert store.get("datasets", "b") is None
+    assert store.get("datasets", "a") is not None
+    assert store.get("datasets", "c") is not None
+    assert store.stats()["evictions"] == 1
+
+def test_disk_store_cap_holds_for_every_worker_sharing_the_directory(tmp_path):
+    workers = [DiskStore(str(tmp_path), max_bytes=1_000_000, rescan_interval=0) for _ in range(2)]
+    for worker in workers:
+        worker.load_index()
+    workers[0].set("datasets", "probe", {"rows": "x" * 100}, expires_at=4102444800)
+    entry_size = workers[0].stats()["bytes"]
+    for worker in workers:
+        worker.max_bytes = entry_size * 3
+
+    for index in range(6):
+        workers[index % 2].set("datasets", f"key_{index}", {"rows": "x" * 100}, expires_at=4102444800)
+
+    assert sum(os.path.getsize(path) for path in entry_files(tmp_path)) <= entry_size * 3
+
+def test_disk_store_index_is_loaded_from_existing_files(tmp_path):
+    DiskStore(str(tmp_path), max_bytes=1_000_000).set("datasets", "a", {"rows": []}, expires_at=4102444800)
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000)
+
+    assert store.stats()["index_loaded"] is False
+    store.load_index()
+
+    assert store.stats()["entries"] == 1
+    assert store.stats()["bytes"] == os.path.getsize(entry_files(tmp_path)[0])
+
+# Tests for TieredCache
+def test_tiered_cache_refills_memory_from_disk(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000)
+    TieredCache(TTLCache("entities", max_entries=10, ttl=60), store).set("entity_123", [Entity(id="entity_123")])
+
+    restarted = TieredCache(TTLCache("entities", max_entries=10, ttl=60), store)
+
+    assert restarted.get("entity_123") == [Entity(id="entity_123")]
+    assert len(restarted.front) == 1
+    assert restarted.stats()["disk_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_tiered_cache_async_access_does_file_io_off_the_event_loop(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000)
+    threads = set()
+    disk_get, disk_set = store.get, store.set
+
+    def recording(method):
+        def record(*args):
+            threads.add(threading.get_ident())
+            return method(*args)
+        return record
+
+    with patch.object(store, "get", side_effect=recording(disk_get)), patch.object(store, "set", side_effect=recording(disk_set)):
+        await TieredCache(TTLCache("entities", max_entries=10, ttl=60), store).aset("entity_123", [Entity(id="entity_123")])
+        restarted = TieredCache(TTLCache("entities", max_entries=10, ttl=60), store)
+        assert await restarted.aget("entity_123") == [Entity(id="entity_123")]
+
+    assert len(restarted.front) == 1
+    assert threads and threading.get_ident() not in threads
+
+def test_tiered_cache_clear_removes_the_persisted_entries(tmp_path):
+    cache = TieredCache(TTLCache("entities", max_entries=10, ttl=60), DiskStore(str(tmp_path), max_bytes=1_000_000))
+    cache.set("entity_123", [Entity(id="entity_123")])
+
+    cache.clear()
+
+    assert cache.get("entity_123") is None
+    assert entry_files(tmp_path) == []
+
+def test_tiered_cache_delete_where_reaches_the_persisted_entries(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1_000_000)
+    TieredCache(TTLCache("entities", max_entries=10, ttl=60), store).set("dep_1", [Entity(id="dep_1")])
+    restarted = TieredCache(TTLCache("entities", max_entries=10, ttl=60), store)
+
+    assert restarted.delete_where(lambda key, value: key == "dep_1") == ["dep_1"]
+    assert restarted.get("dep_1") is None
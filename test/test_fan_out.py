@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.exception.exceptions import GatewayTimeoutError
+from src.utils.fan_out import fan_out, fan_out_stats
+
+@pytest.fixture(autouse=True)
+def reset_fan_out_stats():
+    fan_out_stats.reset()
+    yield
+    fan_out_stats.reset()
+
+@pytest.mark.asyncio
+async def test_results_keep_the_order_of_the_items():
+    async def double(item):
+        await asyncio.sleep(0.001 * (5 - item))
+        return item * 2
+
+    assert await fan_out(range(5), double, limit=2) == [0, 2, 4, 6, 8]
+
+@pytest.mark.asyncio
+async def test_no_more_than_limit_items_run_at_once():
+    active = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+
+    await fan_out(range(20), work, limit=3)
+
+    assert peak == 3
+    assert fan_out_stats.stats()["peak_active"] == 3
+    assert fan_out_stats.stats()["items"] == 20
+
+@pytest.mark.asyncio
+async def test_errors_are_collected_per_item():
+    async def work(item):
+        if item == 1:
+            raise ValueError("bad item")
+        return item
+
+    results = await fan_out([0, 1, 2], work, return_exceptions=True)
+
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError)
+
+@pytest.mark.asyncio
+async def test_first_error_cancels_the_rest():
+    started = []
+
+    async def work(item):
+        started.append(item)
+        if item == 0:
+            raise ValueError("bad item")
+        await asyncio.sleep(1)
+
+    with pytest.raises(ValueError):
+        await fan_out(range(10), work, limit=2)
+
+    assert started == [0, 1]
+
+@pytest.mark.asyncio
+async def test_no_items_start_after_the_deadline():
+    calls = []
+
+    async def work(item):
+        calls.append(item)
+        return item
+
+    with patch("src.utils.fan_out.deadline_expired", side_effect=[False, True, True]):
+        results = await fan_out([0, 1, 2], work, limit=1, return_exceptions=True)
+
+    assert calls == [0]
+    assert results[0] == 0
+    assert all(isinstance(result, GatewayTimeoutError) for result in results[1:])
+    assert fan_out_stats.stats()["skipped_on_deadline"] == 2
+
+@pytest.mark.asyncio
+async def test_empty_items():
+    async def work(item):
+        return item
+
+    assert await fan_out([], work) == []
@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.exception.exceptions import NotFoundError
+from src.utils.hedging import Hedger, HedgeBudget, LatencyTracker
+
+@pytest.fixture
+def hedging_settings():
+    with patch("src.utils.hedging.settings") as mock_settings:
+        mock_settings.HEDGING_ENABLED = True
+        mock_settings.HEDGING_PERCENTILE = 95
+        mock_settings.HEDGING_MAX_EXTRA_LOAD = 1.0
+        mock_settings.HEDGING_MIN_SAMPLES = 1
+        yield mock_settings
+
+def make_hedger(delay: float) -> Hedger:
+    hedger = Hedger()
+    hedger.latency.record("entities", delay)
+    return hedger
+
+# Tests for LatencyTracker and HedgeBudget
+def test_latency_percentile():
+    tracker = LatencyTracker()
+    for value in range(1, 101):
+        tracker.record("entities", value / 100)
+
+    assert tracker.percentile("entities", 95) == 0.95
+    assert tracker.percentile("metadata", 95) is None
+
+def test_hedge_budget_limits_extra_load():
+    budget = HedgeBudget(ratio=0.05)
+    for _ in range(19):
+        budget.deposit()
+    assert budget.withdraw() is False
+
+    budget.deposit()
+    assert budget.withdraw() is True
+    assert budget.withdraw() is False
+
+# Tests for Hedger
+@pytest.mark.asyncio
+async def test_hedger_passes_through_when_disabled():
+    hedger = Hedger()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return "result"
+
+    with patch("src.utils.hedging.settings.HEDGING_ENABLED", False):
+        assert await hedger.run("entities", fetch) == "result"
+
+    assert calls == 1
+    assert hedger.requests == 0
+
+@pytest.mark.asyncio
+async def test_hedger_takes_faster_duplicate_and_cancels_loser(hedging_settings):
+    hedger = make_hedger(0.01)
+    calls = 0
+    primary_cancelled = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return f"answer {calls}"
+
+    result = await hedger.run("entities", fetch)
+    await asyncio.sleep(0)
+
+    assert result == "answer 2"
+    assert hedger.hedged == 1
+    assert hedger.hedge_wins == 1
+    assert primary_cancelled.is_set()
+
+@pytest.mark.asyncio
+async def test_hedger_does_not_hedge_fast_requests(hedging_settings):
+    hedger = make_hedger(1.0)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return "result"
+
+    assert await hedger.run("entities", fetch) == "result"
+    assert calls == 1
+    assert hedger.hedged == 0
+
+@pytest.mark.asyncio
+async def test_hedger_respects_budget(hedging_settings):
+    hedging_settings.HEDGING_MAX_EXTRA_LOAD = 0.0
+    hedger = make_hedger(0.01)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    assert await hedger.run("entities", fetch) == "result"
+    assert calls == 1
+    assert hedger.hedged == 0
+
+@pytest.mark.asyncio
+async def test_hedger_returns_not_found_as_answer(hedging_settings):
+    hedger = make_hedger(1.0)
+
+    async def fetch():
+        raise NotFoundError("Read API Error: Entity not found for id entity_123")
+
+    with pytest.raises(NotFoundError):
+        await hedger.run("entities", fetch)
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.core.config import settings
+from src.enums import PoolEnum
+from src.utils.http_client import HTTPClient
+
+@pytest_asyncio.fixture
+async def server():
+    app = web.Application()
+
+    async def ok(request):
+        return web.Response(text="ok")
+
+    async def slow(request):
+        await asyncio.sleep(0.05)
+        return web.Response(text="ok")
+
+    app.router.add_route("*", "/", ok)
+    app.router.add_get("/slow", slow)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+@pytest_asyncio.fixture
+async def client():
+    client = HTTPClient()
+    await client.start()
+    yield client
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_prewarm_leaves_idle_keep_alive_connections(server, client):
+    opened = await client.prewarm(str(server.make_url("/")), connections=3, timeout=5)
+
+    stats = client.stats()["lookup"]
+    assert opened == 3
+    assert stats["prewarmed"] == 3
+    assert stats["idle"] == 3
+    assert stats["acquired"] == 0
+    assert stats["created"] == 3
+
+    # the next request reuses a warm connection
+    async with client.session.get(server.make_url("/")) as response:
+        await response.read()
+
+    assert client.stats()["lookup"]["reused"] == 1
+    assert client.stats()["lookup"]["created"] == 3
+
+@pytest.mark.asyncio
+async def test_prewarm_failures_do_not_raise(client):
+    opened = await client.prewarm("http://127.0.0.1:1/", connections=2, timeout=1)
+
+    assert opened == 0
+    assert client.stats()["lookup"]["prewarmed"] == 0
+
+@pytest.mark.asyncio
+async def test_stats_report_waiters_for_a_saturated_pool(server, client):
+    client.session.connector._limit = 1
+
+    async def call():
+        async with client.session.get(server.make_url("/slow")) as response:
+            await response.read()
+
+    tasks = [asyncio.create_task(call()) for _ in range(3)]
+    await asyncio.sleep(0.02)
+
+    stats = client.stats()["lookup"]
+    assert stats["acquired"] == 1
+    assert stats["waiters"] == 2
+
+    await asyncio.gather(*tasks)
+
+    stats = client.stats()["lookup"]
+    assert stats["waiters"] == 0
+    assert stats["queued"] == 2
+    assert stats["avg_acquire_wait_ms"] > 0
+
+def test_stats_before_start():
+    stats = HTTPClient().stats()["lookup"]
+
+    assert stats["acquired"] == 0
+    assert stats["idle"] == 0
+    assert stats["avg_acquire_wait_ms"] is None
+
+@pytest.mark.asyncio
+async def test_pools_are_isolated(server, client):
+    """Test that a saturated bulk pool does not hold up lookups"""
+    client.session_for(PoolEnum.BULK).connector._limit = 1
+
+    async def download():
+        async with client.session_for(PoolEnum.BULK).get(server.make_url("/slow")) as response:
+            await response.read()
+
+    downloads = [asyncio.create_task(download()) for _ in range(3)]
+    await asyncio.sleep(0.02)
+
+    async with client.session_for(PoolEnum.LOOKUP).get(server.make_url("/")) as response:
+        assert response.status == 200
+
+    stats = client.stats()
+    assert stats["bulk"]["waiters"] == 2
+    assert stats["lookup"]["waiters"] == 0
+    assert stats["lookup"]["queued"] == 0
+
+    await asyncio.gather(*downloads)
+    assert client.session is client.session_for(PoolEnum.LOOKUP)
+
+def test_pools_have_their_own_timeouts():
+    client = HTTPClient()
+
+    assert client.pools[PoolEnum.BULK].timeout.total == settings.HTTP_BULK_TIMEOUT_TOTAL
+    assert client.pools[PoolEnum.LOOKUP].timeout.total == settings.HTTP_TIMEOUT_TOTAL
+    assert client.timeout_within(5, PoolEnum.BULK).sock_read == 5
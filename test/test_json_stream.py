@@ -0,0 +1,57 @@
+import json
+import pytest
+from src.utils.json_stream import JsonArrayStreamParser
+
+def parse(document: str, key="body", chunk_size=1) -> list:
+    parser = JsonArrayStreamParser(key)
+    data = document.encode()
+    items = []
+    for start in range(0, len(data), chunk_size):
+        items.extend(json.loads(item) for item in parser.feed(data[start:start + chunk_size]))
+    return items
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+def test_yields_the_items_of_the_key(chunk_size):
+    document = {
+        "meta": {"body": ["nested, not the target"]},
+        "note": "body",
+        "body": [{"id": "a", "name": 'with "quotes", [brackets] and {braces}'}, {"id": "b", "kind": {"major": "Document"}}],
+        "after": [1, 2],
+    }
+
+    assert parse(json.dumps(document), chunk_size=chunk_size) == document["body"]
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_yields_scalars_and_nested_arrays(chunk_size):
+    items = [1, "two", None, [3, [4]], {"a": {}}, True]
+
+    assert parse(json.dumps({"body": items}), chunk_size=chunk_size) == items
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4096])
+def test_escapes_are_followed_across_chunks(chunk_size):
+    items = [{"name": 'ends with a backslash \\', "note": 'a \\"quoted\\" ] and } inside'}, 'a "string" item \\', {"nested": [{"x": "\\\\"}]}]
+    document = {"meta": {"text": 'not the "body": [1]'}, "body": items}
+
+    assert parse(json.dumps(document), chunk_size=chunk_size) == items
+
+def test_missing_null_or_empty_array_yields_nothing():
+    assert parse(json.dumps({"body": None, "other": [1]})) == []
+    assert parse(json.dumps({"body": []})) == []
+    assert parse(json.dumps({"other": [1]})) == []
+
+def test_top_level_array_without_key():
+    assert parse(json.dumps([{"a": 1}, 2]), key=None, chunk_size=3) == [{"a": 1}, 2]
+
+def test_buffer_stays_bounded_by_the_largest_item():
+    items = [{"id": f"entity_{index}", "name": "x" * 50} for index in range(2000)]
+    data = json.dumps({"body": items}).encode()
+    parser = JsonArrayStreamParser()
+    count = 0
+    peak = 0
+
+    for start in range(0, len(data), 1024):
+        count += len(list(parser.feed(data[start:start + 1024])))
+        peak = max(peak, len(parser._buffer))
+
+    assert count == 2000
+    assert peak < 2048
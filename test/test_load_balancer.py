@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import patch
+from aiohttp import ClientConnectionError
+from src.exception.exceptions import NotFoundError
+from src.utils.load_balancer import LoadBalancer
+
+def make_balancer(urls=("http://a", "http://b"), ejection_threshold=2, ejection_seconds=10) -> LoadBalancer:
+    return LoadBalancer(list(urls), ejection_threshold=ejection_threshold, ejection_seconds=ejection_seconds)
+
+def fail(balancer: LoadBalancer, url: str):
+    with patch.object(balancer, "pick", return_value=next(replica for replica in balancer.replicas if replica.url == url)):
+        with pytest.raises(ClientConnectionError):
+            with balancer.request():
+                raise ClientConnectionError("Connection reset")
+
+def test_requires_at_least_one_url():
+    with pytest.raises(ValueError):
+        LoadBalancer([], ejection_threshold=1, ejection_seconds=1)
+
+def test_picks_the_replica_with_least_outstanding_requests():
+    balancer = make_balancer()
+
+    with balancer.request() as first:
+        with balancer.request() as second:
+            assert {first, second} == {"http://a", "http://b"}
+
+def test_prefers_the_faster_replica():
+    balancer = make_balancer()
+    balancer.replicas[0].ewma_latency = 0.5
+    balancer.replicas[1].ewma_latency = 0.05
+
+    with balancer.request() as url:
+        assert url == "http://b"
+
+    # busy enough that the slow replica becomes the cheaper choice
+    balancer.replicas[1].outstanding = 20
+    with balancer.request() as url:
+        assert url == "http://a"
+
+def test_not_found_is_a_success():
+    balancer = make_balancer(urls=["http://a"])
+
+    with pytest.raises(NotFoundError):
+        with balancer.request():
+            raise NotFoundError("missing")
+
+    replica = balancer.replicas[0]
+    assert replica.failures == 0
+    assert replica.ewma_latency is not None
+    assert replica.outstanding == 0
+
+def test_ejects_after_consecutive_failures_and_probes_back():
+    balancer = make_balancer()
+
+    with patch("time.monotonic", return_value=100.0):
+        fail(balancer, "http://a")
+        fail(balancer, "http://a")
+
+        assert balancer.stats()["http://a"]["ejected"] is True
+        for _ in range(3):
+            with balancer.request() as url:
+                assert url == "http://b"
+
+    with patch("time.monotonic", return_value=111.0):
+        # the ejection has passed, the replica gets a single probe
+        with patch("random.random", return_value=0.0):
+            balancer.replicas[1].ewma_latency = 1.0
+            replica = balancer.pick()
+        assert replica.url == "http://a"
+        assert replica.probing is True
+
+        # a failed probe ejects it again at once
+        fail(balancer, "http://a")
+        assert balancer.stats()["http://a"]["ejections"] == 2
+
+    with patch("time.monotonic", return_value=122.0):
+        balancer.replicas[1].ewma_latency = 1.0
+        with balancer.request() as url:
+            assert url == "http://a"
+
+        # the successful probe restores it
+        assert balancer.stats()["http://a"]["ejected"] is False
+        assert balancer.replicas[0].probing is False
+        assert balancer.replicas[0].consecutive_failures == 0
+
+def test_uses_the_replica_due_back_first_when_all_are_ejected():
+    balancer = make_balancer(ejection_threshold=1)
+
+    with patch("time.monotonic", return_value=100.0):
+        fail(balancer, "http://a")
+    with patch("time.monotonic", return_value=105.0):
+        fail(balancer, "http://b")
+        with balancer.request() as url:
+            assert url == "http://a"
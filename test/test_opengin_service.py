@@ -1,11 +1,30 @@
-
+import asyncio
+import gzip
+import json
+import time
 import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from src.core.config import settings
 from src.enums.relationEnum import RelationDirectionEnum
 from src.enums.relationEnum import RelationNameEnum
 from src.models.organisation_schemas import Kind
-from src.exception.exceptions import NotFoundError, BadRequestError
+from src.exception.exceptions import NotFoundError, BadRequestError, ServiceUnavailableError, InternalServerError
+from src.enums import CircuitStateEnum, PoolEnum
+from src.utils.http_client import HTTPClient
+from src.utils.load_balancer import LoadBalancer
+from aiohttp import ClientConnectionError
+from src.utils.circuit_breaker import circuit_breakers
+from src.utils.cache import not_found_cache
+from src.utils.compression import Decompressor, payload_stats
+from src.utils.concurrency_limiter import opengin_bulk_limiter, opengin_limiter
+from src.utils.shared_cache import SharedCache
+from src.utils.data_loader import request_scope
+from src.utils.json_codec import json_loads
 from src.models.organisation_schemas import Entity, Relation
-from test.conftest import MockResponse
+from src.models.projection import EntityProjection
+from src.services.opengin_service import OpenGINService
+from test.conftest import MockResponse, MockStreamReader
 
 # Test get entity
 @pytest.mark.asyncio
@@ -171,3 +190,492 @@ async def test_get_metadata_empty_response(mock_service, mock_session):
     mock_session.get.assert_called_once()
 
 
+
+# Tests for single-flight coalescing
+@pytest.mark.asyncio
+async def test_get_entities_coalesces_identical_concurrent_calls(mock_service, mock_session):
+    """Test that identical concurrent get_entities calls share a single upstream request"""
+    release = asyncio.Event()
+
+    class SlowResponse(MockResponse):
+        async def read(self):
+            await release.wait()
+            return await super().read()
+
+    mock_session.post.return_value = SlowResponse({"body": [{"id": "entity_123", "name": "Test Entity"}]})
+
+    waiters = [asyncio.create_task(mock_service.get_entities(Entity(id="entity_123"))) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert all(result == [Entity(id="entity_123", name="Test Entity")] for result in results)
+    mock_session.post.assert_called_once()
+
+# Tests for the entity cache
+@pytest.mark.asyncio
+async def test_get_entities_serves_id_lookup_from_cache(mock_service, mock_session):
+    """Test that a repeated id-only lookup does not hit OpenGIN again"""
+    mock_session.post.return_value = MockResponse({"body": [{"id": "entity_123", "name": "Test Entity"}]})
+
+    first = await mock_service.get_entities(Entity(id="entity_123"))
+    second = await mock_service.get_entities(Entity(id="entity_123"))
+
+    assert first == second == [Entity(id="entity_123", name="Test Entity")]
+    mock_session.post.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_entities_does_not_cache_searches(mock_service, mock_session):
+    """Test that lookups with more than an id are always sent upstream"""
+    mock_session.post.side_effect = lambda *args, **kwargs: MockResponse({"body": [{"id": "entity_123", "name": "Test Entity"}]})
+
+    await mock_service.get_entities(Entity(name="Test Entity"))
+    await mock_service.get_entities(Entity(name="Test Entity"))
+
+    assert mock_session.post.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_entities_cache_disabled(mock_service, mock_session):
+    """Test that the cache can be switched off through settings"""
+    mock_session.post.side_effect = lambda *args, **kwargs: MockResponse({"body": [{"id": "entity_123", "name": "Test Entity"}]})
+
+    with patch("src.services.opengin_service.settings.CACHE_ENABLED", False):
+        await mock_service.get_entities(Entity(id="entity_123"))
+        await mock_service.get_entities(Entity(id="entity_123"))
+
+    assert mock_session.post.call_count == 2
+
+# Tests for the relation cache
+@pytest.mark.asyncio
+async def test_fetch_relation_serves_repeated_query_from_cache(mock_service, mock_session):
+    """Test that a repeated relation query does not hit OpenGIN again"""
+    mock_session.post.return_value = MockResponse([{"relatedEntityId": "minister_1", "name": RelationNameEnum.AS_MINISTER.value}])
+    relation = Relation(name=RelationNameEnum.AS_MINISTER.value, activeAt="2020-01-01T00:00:00Z", direction=RelationDirectionEnum.OUTGOING.value)
+
+    first = await mock_service.fetch_relation("president_1", relation=relation)
+    second = await mock_service.fetch_relation("president_1", relation=relation)
+
+    assert first == second
+    assert first[0].relatedEntityId == "minister_1"
+    mock_session.post.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_fetch_relation_cache_is_keyed_on_active_at(mock_service, mock_session):
+    """Test that queries for different dates are fetched separately"""
+    mock_session.post.side_effect = lambda *args, **kwargs: MockResponse([])
+
+    await mock_service.fetch_relation("president_1", relation=Relation(name=RelationNameEnum.AS_MINISTER.value, activeAt="2020-01-01T00:00:00Z"))
+    await mock_service.fetch_relation("president_1", relation=Relation(name=RelationNameEnum.AS_MINISTER.value, activeAt="2021-01-01T00:00:00Z"))
+
+    assert mock_session.post.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_attributes_serves_repeated_dataset_from_cache(mock_service, mock_session):
+    """Test that a dataset downloaded once is not downloaded again"""
+    mock_session.get.return_value = MockResponse({"columns": ["year"], "rows": [[2020]]})
+
+    first = await mock_service.get_attributes("category_123", "dataset")
+    second = await mock_service.get_attributes(" category_123 ", "dataset")
+
+    assert first == second == {"columns": ["year"], "rows": [[2020]]}
+    mock_session.get.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_entities_cached_by_one_worker_are_served_to_another(mock_service, mock_session, tmp_path):
+    """Test that with the shared backend an entity fetched through one cache instance is read through another"""
+    worker_a = SharedCache("entities", max_entries=10, ttl=60, path=str(tmp_path / "cache.sqlite3"))
+    worker_b = SharedCache("entities", max_entries=10, ttl=60, path=str(tmp_path / "cache.sqlite3"))
+    mock_session.post.return_value = MockResponse({"body": [{"id": "entity_123", "name": "Test Entity"}]})
+
+    with patch(f"{type(mock_service).__module__}.entity_cache", worker_a):
+        await mock_service.get_entities(Entity(id="entity_123"))
+    with patch(f"{type(mock_service).__module__}.entity_cache", worker_b):
+        result = await mock_service.get_entities(Entity(id="entity_123"))
+
+    assert result[0] == Entity(id="entity_123", name="Test Entity")
+    mock_session.post.assert_called_once()
+
+def test_relation_cache_ttl_for_historical_date(mock_service):
+    relation = Relation(name=RelationNameEnum.AS_MINISTER.value, activeAt="2020-01-01T00:00:00Z")
+
+    assert mock_service._relation_cache_ttl(relation) == settings.CACHE_RELATION_HISTORICAL_TTL
+
+def test_relation_cache_ttl_for_today_and_without_active_at(mock_service):
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%dT00:00:00Z")
+
+    assert mock_service._relation_cache_ttl(Relation(name=RelationNameEnum.AS_MINISTER.value, activeAt=today)) == settings.CACHE_RELATION_TTL
+    assert mock_service._relation_cache_ttl(Relation(name=RelationNameEnum.AS_MINISTER.value)) == settings.CACHE_RELATION_TTL
+
+def test_relation_cache_key_skips_queries_with_other_fields(mock_service):
+    assert mock_service._relation_cache_key("entity_123", Relation(name="AS_MINISTER", activeAt="2020-01-01T00:00:00Z")) == "entity_123:AS_MINISTER::2020-01-01T00:00:00Z"
+    assert mock_service._relation_cache_key("entity_123", Relation(name="AS_MINISTER", relatedEntityId="minister_1")) is None
+
+# Tests for the not-found cache
+@pytest.mark.asyncio
+async def test_not_found_is_remembered(mock_service, mock_session):
+    """Test that repeated lookups of a missing id do not reach OpenGIN again"""
+    mock_session.get.return_value = MockResponse({}, status=404)
+
+    for _ in range(3):
+        with pytest.raises(NotFoundError):
+            await mock_service.get_attributes("dead_category", "dataset")
+
+    assert mock_session.get.call_count == 1
+    assert not_found_cache.stats()["short_circuits"] == {"attributes": 2}
+
+@pytest.mark.asyncio
+async def test_not_found_expires(mock_service, mock_session):
+    mock_session.post.side_effect = [MockResponse({"body": []}), MockResponse({"body": [{"id": "entity_123"}]})]
+
+    with patch("src.utils.cache.time.monotonic", return_value=100):
+        with pytest.raises(NotFoundError):
+            await mock_service.get_entities(Entity(id="entity_123"))
+        with pytest.raises(NotFoundError):
+            await mock_service.get_entities(Entity(id="entity_123"))
+
+    with patch("src.utils.cache.time.monotonic", return_value=100 + settings.CACHE_NOT_FOUND_TTL + 1):
+        result = await mock_service.get_entities(Entity(id="entity_123"))
+
+    assert result[0].id == "entity_123"
+    assert mock_session.post.call_count == 2
+
+# Tests for request-scoped loading
+@pytest.mark.asyncio
+async def test_request_scope_loads_each_entity_once(mock_service, mock_session):
+    """Test that id lookups in one request are deduplicated even when caching is disabled"""
+    def respond(url, json=None, **kwargs):
+        return MockResponse({"body": [{"id": json["id"], "name": f"name of {json['id']}"}]})
+
+    mock_session.post.side_effect = respond
+
+    with patch("src.services.opengin_service.settings.CACHE_ENABLED", False), request_scope():
+        results = await asyncio.gather(*[mock_service.get_entities(Entity(id=entity_id)) for entity_id in ["p1", "m1", "p1", "m1", "p1"]])
+        again = await mock_service.get_entities(Entity(id="p1"))
+
+    assert [result[0].name for result in results] == ["name of p1", "name of m1", "name of p1", "name of m1", "name of p1"]
+    assert again[0].name == "name of p1"
+    assert mock_session.post.call_count == 2
+
+@pytest.mark.asyncio
+async def test_request_scope_loads_each_relation_query_once(mock_service, mock_session):
+    mock_session.post.return_value = MockResponse([Relation(id="relation_123", name=RelationNameEnum.AS_MINISTER.value)])
+    relation = Relation(name=RelationNameEnum.AS_MINISTER.value, relatedEntityId="minister_1")
+
+    with request_scope():
+        results = await asyncio.gather(*[mock_service.fetch_relation("entity_123", relation) for _ in range(3)])
+
+    assert all(result[0].id == "relation_123" for result in results)
+    assert mock_session.post.call_count == 1
+
+# Tests for get_entities_by_ids
+@pytest.mark.asyncio
+async def test_get_entities_by_ids_dedupes_and_maps_by_id(mock_service, mock_session):
+    """Test that duplicate ids are fetched once and results are mapped by id"""
+    def respond(url, json=None, **kwargs):
+        return MockResponse({"body": [{"id": json["id"], "name": f"name of {json['id']}"}]})
+
+    mock_session.post.side_effect = respond
+
+    entities, failures = await mock_service.get_entities_by_ids(["e1", "e2", "e1", ""])
+
+    assert failures == {}
+    assert entities == {"e1": Entity(id="e1", name="name of e1"), "e2": Entity(id="e2", name="name of e2")}
+    assert mock_session.post.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_entities_by_ids_reports_failures_per_id(mock_service, mock_session):
+    """Test that a failing id is reported without failing the whole batch"""
+    def respond(url, json=None, **kwargs):
+        if json["id"] == "missing":
+            return MockResponse({}, status=404)
+        return MockResponse({"body": [{"id": json["id"], "name": "found"}]})
+
+    mock_session.post.side_effect = respond
+
+    entities, failures = await mock_service.get_entities_by_ids(["e1", "missing"])
+
+    assert list(entities) == ["e1"]
+    assert isinstance(failures["missing"], NotFoundError)
+
+@pytest.mark.asyncio
+async def test_get_entities_by_ids_bounds_concurrency(mock_service, mock_session):
+    """Test that no more than OPENGIN_BATCH_CONCURRENCY lookups run at once"""
+    in_flight = 0
+    peak = 0
+
+    class SlowResponse(MockResponse):
+        async def __aenter__(self):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            nonlocal in_flight
+            in_flight -= 1
+
+    mock_session.post.side_effect = lambda url, json=None, **kwargs: SlowResponse({"body": [{"id": json["id"]}]})
+
+    with patch("src.services.opengin_service.settings.OPENGIN_BATCH_CONCURRENCY", 3):
+        entities, _ = await mock_service.get_entities_by_ids([f"e{i}" for i in range(10)])
+
+    assert len(entities) == 10
+    assert peak == 3
+
+# Tests for projections
+def test_projection_normalises_fields_and_always_keeps_the_id():
+    projection = EntityProjection.of("name", "kind.minor", "name")
+
+    assert projection.fields == ("id", "kind.minor", "name")
+    assert projection.as_query_params() == {"fields": "id,kind.minor,name"}
+    assert projection == EntityProjection.of("kind.minor", "name")
+
+def test_projection_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        EntityProjection.of("nickname")
+
+    with pytest.raises(ValueError):
+        EntityProjection.of("name.value")
+
+def test_projection_decodes_only_the_selected_fields():
+    projection = EntityProjection.of("name", "kind.minor")
+    data = b'{"body": [{"id": "e1", "name": "Entity One", "created": "2020-01-01", "kind": {"major": "Person", "minor": "citizen"}}]}'
+
+    result = projection.decode_search(data)
+
+    assert result[0].model_dump() == {"id": "e1", "name": "Entity One", "kind": {"minor": "citizen"}}
+    assert result[0] == projection.project(Entity(id="e1", name="Entity One", created="2020-01-01", kind=Kind(major="Person", minor="citizen")))
+
+@pytest.mark.asyncio
+async def test_get_entities_with_projection(mock_service, mock_session):
+    """Test that a projected lookup returns compact results cached apart from full entities"""
+    projection = EntityProjection.of("name")
+    mock_session.post.return_value = MockResponse({"body": [{"id": "entity_123", "name": "Test Entity", "created": "2020-01-01"}]})
+
+    result = await mock_service.get_entities(Entity(id="entity_123"), projection)
+    cached = await mock_service.get_entities(Entity(id="entity_123"), projection)
+
+    assert result[0].model_dump() == {"id": "entity_123", "name": "Test Entity"}
+    assert cached == result
+    assert mock_session.post.call_count == 1
+
+    # a projected entry never answers a full lookup
+    full = await mock_service.get_entities(Entity(id="entity_123"))
+    assert full[0].created == "2020-01-01"
+    assert mock_session.post.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_entities_projects_cached_full_entities(mock_service, mock_session):
+    mock_session.post.return_value = MockResponse({"body": [{"id": "entity_123", "name": "Test Entity", "created": "2020-01-01"}]})
+
+    await mock_service.get_entities(Entity(id="entity_123"))
+    entities, _ = await mock_service.get_entities_by_ids(["entity_123"], projection=EntityProjection.of("name"))
+
+    assert entities["entity_123"].model_dump() == {"id": "entity_123", "name": "Test Entity"}
+    assert mock_session.post.call_count == 1
+
+# Tests for connection pool routing
+@pytest.mark.asyncio
+async def test_attributes_use_the_bulk_pool(mock_service, mock_session):
+    """Test that dataset downloads go through the bulk pool and lookups through the lookup pool"""
+    mock_session.get.return_value = MockResponse({"columns": [], "rows": []})
+
+    with patch.object(HTTPClient, "session_for", return_value=mock_session) as session_for:
+        await mock_service.get_attributes("category_123", "dataset")
+        session_for.assert_called_once_with(PoolEnum.BULK)
+
+        session_for.reset_mock()
+        await mock_service.get_metadata("category_123")
+        session_for.assert_called_once_with(PoolEnum.LOOKUP)
+
+@pytest.mark.asyncio
+async def test_attributes_use_the_bulk_limiter(mock_service, mock_session):
+    """Test that dataset downloads neither hold lookup slots nor feed the lookup latency"""
+    mock_session.get.return_value = MockResponse({"columns": [], "rows": []})
+
+    await mock_service.get_attributes("category_123", "dataset")
+
+    assert opengin_limiter.smoothed_latency == {}
+    assert "attributes" in opengin_bulk_limiter.smoothed_latency
+
+    await mock_service.get_metadata("category_123")
+
+    assert "metadata" in opengin_limiter.smoothed_latency
+
+# Tests for load balancing
+@pytest.mark.asyncio
+async def test_requests_are_spread_over_replicas(mock_service, mock_session):
+    """Test that a retried request goes to another replica and the failure is recorded against the first"""
+    balancer = LoadBalancer(["http://replica-a", "http://replica-b"], ejection_threshold=5, ejection_seconds=30)
+    mock_session.get.side_effect = [ClientConnectionError("Connection reset"), MockResponse({"key1": "value1"})]
+
+    # the fixture service may come from the module imported without the src prefix
+    with patch(f"{type(mock_service).__module__}.opengin_balancer", balancer), patch("asyncio.sleep"):
+        result = await mock_service.get_metadata("category_123")
+
+    assert result == {"key1": "value1"}
+    urls = [call.args[0] for call in mock_session.get.call_args_list]
+    assert urls[0] != urls[1]
+    assert {url.split("/v1/")[0] for url in urls} == {"http://replica-a", "http://replica-b"}
+    stats = balancer.stats()
+    assert sorted(replica["failures"] for replica in stats.values()) == [0, 1]
+
+# Tests for the circuit breaker
+@pytest.mark.asyncio
+async def test_get_entities_fails_fast_when_circuit_open(mock_service, mock_session):
+    """Test that an open circuit rejects calls without contacting OpenGIN"""
+    breaker = circuit_breakers.get("entities")
+    breaker.state = CircuitStateEnum.OPEN
+    breaker._opened_at = time.monotonic()
+
+    with pytest.raises(ServiceUnavailableError):
+        await mock_service.get_entities(Entity(id="entity_123"))
+
+    mock_session.post.assert_not_called()
+
+# Tests for response decoding
+@pytest.mark.asyncio
+async def test_get_entities_decodes_nested_models(mock_service, mock_session):
+    """Test that entities are validated from the raw body, including their nested kind, ignoring unknown fields"""
+    mock_session.post.return_value = MockResponse({"body": [{"id": "entity_123", "name": "Test Entity", "kind": {"major": "Organisation", "minor": "minister"}, "extra": 1}]})
+
+    result = await mock_service.get_entities(Entity(id="entity_123"))
+
+    assert result == [Entity(id="entity_123", name="Test Entity", kind=Kind(major="Organisation", minor="minister"))]
+    assert isinstance(result[0].kind, Kind)
+
+@pytest.mark.asyncio
+async def test_get_entities_null_body_is_not_found(mock_service, mock_session):
+    mock_session.post.return_value = MockResponse({"body": None})
+
+    with pytest.raises(NotFoundError):
+        await mock_service.get_entities(Entity(id="entity_123"))
+
+@pytest.mark.asyncio
+async def test_fetch_relation_rejects_invalid_items(mock_service, mock_session):
+    """Test that relations with wrongly typed fields are rejected"""
+    mock_session.post.return_value = MockResponse([{"relatedEntityId": 123, "name": RelationNameEnum.AS_MINISTER.value}])
+
+    with pytest.raises(InternalServerError):
+        await mock_service.fetch_relation("entity_123", Relation(name=RelationNameEnum.AS_MINISTER.value))
+
+def test_strict_validation_is_passed_on():
+    with patch.object(settings, "OPENGIN_STRICT_VALIDATION", True):
+        with patch("src.services.opengin_service._relation_list_adapter") as mock_adapter:
+            OpenGINService._decode_relations(b"[]")
+
+    mock_adapter.validate_json.assert_called_once_with(b"[]", strict=True)
+
+def test_json_loads_decodes_bytes_and_text():
+    assert json_loads(b'{"body": [1, 2]}') == {"body": [1, 2]}
+    assert json_loads('[{"id": "a"}]') == [{"id": "a"}]
+
+# Tests for compression
+class CompressedResponse(MockResponse):
+    """MockResponse sending its body gzip compressed, as aiohttp hands it over without auto_decompress"""
+    def __init__(self, json_data, status=200):
+        super().__init__(json_data, status=status, headers={"Content-Encoding": "gzip"})
+        self._body = gzip.compress(json.dumps(json_data).encode())
+        self.content = MockStreamReader(self._body)
+
+    async def read(self):
+        return self._body
+
+@pytest.mark.asyncio
+async def test_compressed_responses_are_decoded_and_accounted(mock_service, mock_session):
+    """Test that compression is asked for and compressed and decompressed sizes are recorded"""
+    data = {"columns": ["id", "name"], "rows": [["1", "a" * 1000]]}
+    mock_session.get.return_value = CompressedResponse(data)
+
+    result = await mock_service.get_attributes("category_123", "dataset")
+
+    assert result == data
+    assert mock_session.get.call_args.kwargs["headers"]["Accept-Encoding"] == settings.OPENGIN_ACCEPT_ENCODING
+    stats = payload_stats.stats()["attributes"]
+    assert stats["compressed_responses"] == 1
+    assert stats["decoded_bytes"] == len(json.dumps(data))
+    assert stats["wire_bytes"] < stats["decoded_bytes"]
+
+@pytest.mark.asyncio
+async def test_iter_entities_decompresses_the_stream(mock_service, mock_session):
+    mock_session.post.return_value = CompressedResponse({"body": [{"id": f"e{index}"} for index in range(50)]})
+
+    with patch("src.services.opengin_service.settings.OPENGIN_STREAM_CHUNK_SIZE", 16):
+        result = [entity.id async for entity in mock_service.iter_entities(Entity(kind=Kind(major="Document", minor="extraGazette")))]
+
+    assert result == [f"e{index}" for index in range(50)]
+    assert payload_stats.stats()["entities_stream"]["compressed_responses"] == 1
+
+@pytest.mark.asyncio
+async def test_iter_entities_parses_the_flushed_tail(mock_service, mock_session):
+    """Test that bytes the decompressor only hands over on flush still reach the parser"""
+    class HoldingDecompressor(Decompressor):
+        def __init__(self, encoding):
+            super().__init__(encoding)
+            self._held = b""
+
+        def feed(self, chunk):
+            self._held += super().feed(chunk)
+            return b""
+
+        def flush(self):
+            return self._held + super().flush()
+
+    mock_session.post.return_value = CompressedResponse({"body": [{"id": "e1"}, {"id": "e2"}]})
+
+    with patch(f"{type(mock_service).__module__}.Decompressor", HoldingDecompressor):
+        result = [entity.id async for entity in mock_service.iter_entities(Entity(kind=Kind(major="Document")))]
+
+    assert result == ["e1", "e2"]
+    assert payload_stats.stats()["entities_stream"]["decoded_bytes"] == len(json.dumps({"body": [{"id": "e1"}, {"id": "e2"}]}))
+
+# Tests for streaming searches
+@pytest.mark.asyncio
+async def test_iter_entities_streams_the_body_items(mock_service, mock_session):
+    """Test that entities are yielded from a response read in small chunks"""
+    items = [{"id": f"gazette_{index}", "name": 'gazette "quoted" [name]', "kind": {"major": "Document", "minor": "extgztorg"}} for index in range(50)]
+    mock_session.post.return_value = MockResponse({"body": items, "total": 50})
+
+    with patch.object(settings, "OPENGIN_STREAM_CHUNK_SIZE", 7):
+        result = [entity async for entity in mock_service.iter_entities(Entity(kind=Kind(major="Document", minor="extgztorg")))]
+
+    assert [entity.id for entity in result] == [f"gazette_{index}" for index in range(50)]
+    assert result[0].name == 'gazette "quoted" [name]'
+    assert result[0].kind == Kind(major="Document", minor="extgztorg")
+
+@pytest.mark.asyncio
+async def test_searches_and_streams_do_not_feed_the_lookup_latency(mock_service, mock_session):
+    """Test that searches are compared with searches only and streams are not sampled"""
+    mock_session.post.return_value = MockResponse({"body": [{"id": "entity_123"}]})
+
+    [entity async for entity in mock_service.iter_entities(Entity(kind=Kind(major="Document")))]
+    assert opengin_limiter.smoothed_latency == {}
+
+    await mock_service.get_entities(Entity(kind=Kind(major="Document")))
+    await mock_service.get_entities(Entity(id="entity_123"))
+    assert set(opengin_limiter.smoothed_latency) == {"entity_searches", "entities"}
+
+@pytest.mark.asyncio
+async def test_iter_entities_empty_body_yields_nothing(mock_service, mock_session):
+    mock_session.post.return_value = MockResponse({"body": None})
+
+    result = [entity async for entity in mock_service.iter_entities(Entity(kind=Kind(major="Document")))]
+
+    assert result == []
+
+@pytest.mark.asyncio
+async def test_iter_entities_not_found(mock_service, mock_session):
+    mock_session.post.return_value = MockResponse({}, status=404)
+
+    with pytest.raises(NotFoundError):
+        async for _ in mock_service.iter_entities(Entity(kind=Kind(major="Document"))):
+            pass
+
+@pytest.mark.asyncio
+async def test_iter_entities_wraps_invalid_items(mock_service, mock_session):
+    mock_session.post.return_value = MockResponse({"body": [{"id": 1}]})
+
+    with pytest.raises(InternalServerError):
+        async for _ in mock_service.iter_entities(Entity(kind=Kind(major="Document"))):
+            pass
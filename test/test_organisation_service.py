@@ -538,8 +538,16 @@ async def test_department_history_timeline_success(
             else []
         )
 
+    async def get_entities_by_ids_handler(ids):
+        entities = {}
+        for entity_id in ids:
+            result = await get_entities_handler(Entity(id=entity_id))
+            if result:
+                entities[entity_id] = result[0]
+        return entities, {}
+
     mock_opengin_service.fetch_relation.side_effect = fetch_relation_handler
-    mock_opengin_service.get_entities.side_effect = get_entities_handler
+    mock_opengin_service.get_entities_by_ids.side_effect = get_entities_by_ids_handler
 
     result = await organisation_service.department_history_timeline(
         department_id=department_id
@@ -626,8 +634,16 @@ async def test_department_history_timeline_collapsing(
             return [Entity(id="pers_01", name='{"value": "52616e696c"}')]
         return []
 
+    async def get_entities_by_ids_handler(ids):
+        entities = {}
+        for entity_id in ids:
+            result = await get_entities_handler(Entity(id=entity_id))
+            if result:
+                entities[entity_id] = result[0]
+        return entities, {}
+
     mock_opengin_service.fetch_relation.side_effect = fetch_relation_handler
-    mock_opengin_service.get_entities.side_effect = get_entities_handler
+    mock_opengin_service.get_entities_by_ids.side_effect = get_entities_by_ids_handler
 
     result = await organisation_service.department_history_timeline(
         department_id=department_id
@@ -671,17 +687,17 @@ async def test_fetch_and_map_entities_success(
     organisation_service, mock_opengin_service
 ):
     entity_ids = ["e1", "e2"]
-    mock_opengin_service.get_entities.side_effect = [
-        [Entity(id="e1", name="name1")],
-        [Entity(id="e2", name="name2")],
-    ]
+    mock_opengin_service.get_entities_by_ids.return_value = (
+        {"e1": Entity(id="e1", name="name1"), "e2": Entity(id="e2", name="name2")},
+        {},
+    )
 
     result = await organisation_service._fetch_and_map_entities(entity_ids)
 
     assert len(result) == 2
     assert result["e1"].id == "e1"
     assert result["e2"].id == "e2"
-    assert mock_opengin_service.get_entities.call_count == 2
+    mock_opengin_service.get_entities_by_ids.assert_called_once_with(entity_ids)
 
 
 @pytest.mark.asyncio
@@ -690,10 +706,10 @@ async def test_fetch_and_map_entities_partial_failure(
 ):
     entity_ids = ["e1", "e2"]
     # Suppose e2 fails or returns nothing
-    mock_opengin_service.get_entities.side_effect = [
-        [Entity(id="e1", name="name1")],
-        Exception("Failed to fetch"),
-    ]
+    mock_opengin_service.get_entities_by_ids.return_value = (
+        {"e1": Entity(id="e1", name="name1")},
+        {"e2": Exception("Failed to fetch")},
+    )
 
     result = await organisation_service._fetch_and_map_entities(entity_ids)
 
@@ -788,8 +804,8 @@ async def test_department_moves_between_ministers(organisation_service):
     mock_entity3.id = "min10"
     mock_entity3.name = "Minister 10"
 
-    organisation_service.opengin_service.get_entities = AsyncMock(
-        return_value=[mock_entity1, mock_entity2, mock_entity3]
+    organisation_service.opengin_service.get_entities_by_ids = AsyncMock(
+        return_value=({entity.id: entity for entity in [mock_entity1, mock_entity2, mock_entity3]}, {})
     )
 
     result = await organisation_service.fetch_cabinet_flow(
@@ -858,8 +874,8 @@ async def test_no_departments_for_one_date(organisation_service):
     mock_entity4.id = "min6"
     mock_entity4.name = "Minister 6"
 
-    organisation_service.opengin_service.get_entities = AsyncMock(
-        return_value=[mock_entity1, mock_entity2, mock_entity3, mock_entity4]
+    organisation_service.opengin_service.get_entities_by_ids = AsyncMock(
+        return_value=({entity.id: entity for entity in [mock_entity1, mock_entity2, mock_entity3, mock_entity4]}, {})
     )
 
     result = await organisation_service.fetch_cabinet_flow(
@@ -898,8 +914,8 @@ async def test_one_date_failure(organisation_service):
     mock_entity1.id = "min3"
     mock_entity1.name = "Minister 3"
 
-    organisation_service.opengin_service.get_entities = AsyncMock(
-        return_value=[mock_entity1]
+    organisation_service.opengin_service.get_entities_by_ids = AsyncMock(
+        return_value=({entity.id: entity for entity in [mock_entity1]}, {})
     )
 
     result = await organisation_service.fetch_cabinet_flow(
@@ -953,8 +969,8 @@ async def test_multiple_departments_aggregation(organisation_service):
     mock_entity2.id = "min2"
     mock_entity2.name = "Minister 2"
 
-    organisation_service.opengin_service.get_entities = AsyncMock(
-        return_value=[mock_entity1, mock_entity2]
+    organisation_service.opengin_service.get_entities_by_ids = AsyncMock(
+        return_value=({entity.id: entity for entity in [mock_entity1, mock_entity2]}, {})
     )
 
     result = await organisation_service.fetch_cabinet_flow(
@@ -2,9 +2,10 @@ import pytest
 from unittest.mock import AsyncMock, patch
 from src.models.organisation_schemas import Entity, Relation
 from src.models.person_schemas import PersonResponse
-from src.exception.exceptions import BadRequestError, InternalServerError, NotFoundError
+from src.exception.exceptions import BadRequestError, GatewayTimeoutError, InternalServerError, NotFoundError
 from datetime import date
 from src.enums import KindMinorEnum
+from test.conftest import async_iter
 
 # --- Tests for is_president_during ---
 
@@ -605,11 +606,13 @@ async def test_fetch_all_presidents_success(person_service, mock_opengin_service
         Relation(relatedEntityId="p1", startTime="2022-06-01T00:00:00Z", endTime="")
     ]
 
-    mock_opengin_service.get_entities.side_effect = [
-        [Entity(id="g_org", created="2020-05-01T00:00:00Z", name="org_gzt")],
-        [Entity(id="g_per", created="2022-08-01T00:00:00Z", name="per_gzt")],
-        [Entity(id="p1", name="President One")] # president name fetch
-    ]
+    gazettes = {
+        KindMinorEnum.EXTGZT_ORGANISATION.value: [Entity(id="g_org", created="2020-05-01T00:00:00Z", name="org_gzt")],
+        KindMinorEnum.EXTGZT_PERSON.value: [Entity(id="g_per", created="2022-08-01T00:00:00Z", name="per_gzt")],
+    }
+    mock_opengin_service.iter_entities.side_effect = lambda entity: async_iter(gazettes[entity.kind.minor])
+    # president name fetch
+    mock_opengin_service.get_entities_by_ids.return_value = ({"p1": Entity(id="p1", name="President One")}, {})
 
     with patch("src.services.person_service.Util.decode_protobuf_attribute_name", side_effect=lambda x: x):
         result = await person_service.fetch_all_presidents()
@@ -648,11 +651,7 @@ async def test_fetch_all_presidents_no_gazettes(person_service, mock_opengin_ser
         Relation(relatedEntityId="p1", startTime="2020-01-01T00:00:00Z", endTime="")
     ]
 
-    mock_opengin_service.get_entities.side_effect = [
-        [],  # No organization gazettes
-        [],  # No person gazettes
-        [Entity(id="p1", name="President One")] 
-    ]
+    mock_opengin_service.get_entities_by_ids.return_value = ({"p1": Entity(id="p1", name="President One")}, {})
 
     with patch("src.services.person_service.Util.decode_protobuf_attribute_name", side_effect=lambda x: x):
         result = await person_service.fetch_all_presidents()
@@ -676,11 +675,13 @@ async def test_fetch_all_presidents_sorting_with_multiple_terms(person_service,
         Relation(relatedEntityId="p_multi", startTime="2022-01-01T00:00:00Z", endTime="")
     ]
 
-    mock_opengin_service.get_entities.side_effect = [
-        [], [], # no gazettes for either
-        [Entity(id="p_old", name="Old President")],
-        [Entity(id="p_multi", name="Multi-term President")]
-    ]
+    mock_opengin_service.get_entities_by_ids.return_value = (
+        {
+            "p_old": Entity(id="p_old", name="Old President"),
+            "p_multi": Entity(id="p_multi", name="Multi-term President"),
+        },
+        {},
+    )
 
     with patch("src.services.person_service.Util.decode_protobuf_attribute_name", side_effect=lambda x: x):
         result = await person_service.fetch_all_presidents()
@@ -692,6 +693,52 @@ async def test_fetch_all_presidents_sorting_with_multiple_terms(person_service,
         assert presidents[1]["id"] == "p_old"
 
 
+@pytest.mark.asyncio
+async def test_fetch_all_presidents_merges_gazettes_and_skips_failed_streams(person_service, mock_opengin_service):
+    mock_opengin_service.fetch_relation.return_value = [
+        Relation(relatedEntityId="p1", startTime="2020-01-01T00:00:00Z", endTime="")
+    ]
+
+    async def failing_stream():
+        yield Entity(id="g_partial", created="2021-01-01T00:00:00Z", name="partial_gzt")
+        raise InternalServerError("stream broke")
+
+    gazettes = {
+        KindMinorEnum.EXTGZT_ORGANISATION.value: lambda: async_iter([
+            Entity(id="g1", created="2020-05-01T00:00:00Z", name="gzt_1"),
+            Entity(id="g1", created="2020-05-01T00:00:00Z", name="gzt_1"),
+            Entity(id="g2", created="2020-05-01T10:00:00Z", name="gzt_2"),
+        ]),
+        KindMinorEnum.EXTGZT_PERSON.value: failing_stream,
+    }
+    mock_opengin_service.iter_entities.side_effect = lambda entity: gazettes[entity.kind.minor]()
+    mock_opengin_service.get_entities_by_ids.return_value = ({"p1": Entity(id="p1", name="President One")}, {})
+
+    with patch("src.services.person_service.Util.decode_protobuf_attribute_name", side_effect=lambda x: x), \
+         patch("src.services.person_service.mark_partial") as mark_partial:
+        result = await person_service.fetch_all_presidents()
+
+    # the partially read person gazettes are dropped as a whole
+    assert result["presidents"][0]["terms"][0]["gazettes_published"] == [
+        {"date": "2020-05-01", "ids": ["gzt_1", "gzt_2"]}
+    ]
+    mark_partial.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_fetch_all_presidents_deadline_is_a_gateway_timeout(person_service, mock_opengin_service):
+    mock_opengin_service.fetch_relation.return_value = [
+        Relation(relatedEntityId="p1", startTime="2020-01-01T00:00:00Z", endTime="")
+    ]
+    mock_opengin_service.get_entities_by_ids.side_effect = GatewayTimeoutError("deadline exceeded")
+
+    with pytest.raises(GatewayTimeoutError):
+        await person_service.fetch_all_presidents()
+
+    mock_opengin_service.fetch_relation.side_effect = GatewayTimeoutError("deadline exceeded")
+
+    with pytest.raises(GatewayTimeoutError):
+        await person_service.fetch_all_presidents()
+
 @pytest.mark.asyncio
 async def test_fetch_all_presidents_internal_error(person_service, mock_opengin_service):
     mock_opengin_service.fetch_relation.side_effect = Exception("Database down")
@@ -0,0 +1,161 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from starlette.requests import Request
+from starlette.responses import Response
+from src.enums import PriorityEnum
+from src.utils.cache import TTLCache
+from src.utils.deadline import remaining_time
+from src.utils.priority import current_priority
+from src.utils.response_cache import ResponseCache, mark_partial
+
+ROUTES = {"/v1/person/all-presidents": {"soft_ttl": 60, "hard_ttl": 600}}
+
+
+def make_request(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+def make_cache() -> ResponseCache:
+    return ResponseCache(TTLCache("responses", max_entries=10, ttl=600), routes=ROUTES)
+
+async def serve(cache, fn, path="/v1/person/all-presidents"):
+    response = Response()
+    value = await cache.serve(make_request(path), response, fn)
+    return value, response
+
+@pytest.mark.asyncio
+async def test_response_is_served_from_cache_within_the_soft_ttl():
+    cache = make_cache()
+    fn = AsyncMock(return_value={"presidents": []})
+
+    with patch("src.utils.response_cache.time.time", return_value=100):
+        _, first = await serve(cache, fn)
+    with patch("src.utils.response_cache.time.time", return_value=130):
+        value, second = await serve(cache, fn)
+
+    assert value == {"presidents": []}
+    assert first.headers["X-Cache-Status"] == "miss"
+    assert second.headers["X-Cache-Status"] == "hit"
+    assert second.headers["Age"] == "30"
+    fn.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_stale_response_is_served_while_refreshed_in_the_background():
+    cache = make_cache()
+    calls = []
+
+    async def fetch():
+        calls.append((current_priority(), remaining_time()))
+        return {"presidents": [len(calls)]}
+
+    with patch("src.utils.response_cache.time.time", return_value=100):
+        await serve(cache, fetch)
+    with patch("src.utils.response_cache.time.time", return_value=200):
+        value, response = await serve(cache, fetch)
+        await asyncio.sleep(0.01)
+        refreshed, _ = await serve(cache, fetch)
+
+    assert value == {"presidents": [1]}
+    assert response.headers["X-Cache-Status"] == "stale"
+    assert response.headers["Age"] == "100"
+    assert refreshed == {"presidents": [2]}
+    priority, deadline = calls[1]
+    assert priority == PriorityEnum.BACKGROUND
+    assert deadline is not None
+    assert cache.stats()["refreshes"] == 1
+
+@pytest.mark.asyncio
+async def test_refresh_is_single_flight():
+    cache = make_cache()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await release.wait()
+        return {"presidents": [calls]}
+
+    with patch("src.utils.response_cache.time.time", return_value=100):
+        await serve(cache, fetch)
+    with patch("src.utils.response_cache.time.time", return_value=200):
+        await asyncio.gather(*(serve(cache, fetch) for _ in range(5)))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.sleep(0.01)
+        value, response = await serve(cache, fetch)
+
+    assert calls == 2
+    assert value == {"presidents": [2]}
+    assert response.headers["X-Cache-Status"] == "hit"
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_the_stale_response():
+    cache = make_cache()
+    fn = AsyncMock(side_effect=[{"presidents": []}, RuntimeError("OpenGIN down")])
+
+    with patch("src.utils.response_cache.time.time", return_value=100):
+        await serve(cache, fn)
+    with patch("src.utils.response_cache.time.time", return_value=200):
+        await serve(cache, fn)
+        await asyncio.sleep(0.01)
+        value, response = await serve(cache, fn)
+
+    assert value == {"presidents": []}
+    assert response.headers["X-Cache-Status"] == "stale"
+    assert cache.stats()["refresh_failures"] == 1
+
+@pytest.mark.asyncio
+async def test_response_past_the_hard_ttl_is_recomputed():
+    cache = make_cache()
+    fn = AsyncMock(side_effect=[{"presidents": [1]}, {"presidents": [2]}])
+
+    with patch("src.utils.response_cache.time.time", return_value=100):
+        await serve(cache, fn)
+    with patch("src.utils.response_cache.time.time", return_value=701):
+        value, response = await serve(cache, fn)
+
+    assert value == {"presidents": [2]}
+    assert response.headers["X-Cache-Status"] == "miss"
+
+@pytest.mark.asyncio
+async def test_partial_response_is_served_but_not_cached():
+    cache = make_cache()
+    calls = 0
+
+    async def report_partial():
+        mark_partial()
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            # reported from a concurrent part of the computation, like a failed gazette stream
+            await asyncio.gather(report_partial())
+        return {"presidents": [calls]}
+
+    first, first_response = await serve(cache, fn)
+    second, second_response = await serve(cache, fn)
+    third, third_response = await serve(cache, fn)
+
+    assert first == {"presidents": [1]}
+    assert second == third == {"presidents": [2]}
+    assert first_response.headers["X-Cache-Status"] == "miss"
+    assert second_response.headers["X-Cache-Status"] == "miss"
+    assert third_response.headers["X-Cache-Status"] == "hit"
+    assert cache.stats()["partial"] == 1
+
+def test_mark_partial_outside_a_cached_computation_does_nothing():
+    mark_partial()
+
+@pytest.mark.asyncio
+async def test_routes_without_a_policy_are_not_cached():
+    cache = make_cache()
+    fn = AsyncMock(return_value={"history": []})
+
+    await serve(cache, fn, path="/v1/person/person-history/123")
+    _, response = await serve(cache, fn, path="/v1/person/person-history/123")
+
+    assert fn.await_count == 2
+    assert "X-Cache-Status" not in response.headers
@@ -1,21 +1,17 @@
+import asyncio
 import pytest
+from aiohttp import ClientConnectionError, ServerDisconnectedError
 from src.enums.relationEnum import RelationNameEnum, RelationDirectionEnum
 from src.models.organisation_schemas import Relation
 from test.conftest import MockResponse
 from src.models.organisation_schemas import Entity
-from src.exception.exceptions import BadRequestError
-from google.api_core.exceptions import InternalServerError
+from src.exception.exceptions import BadRequestError, InternalServerError
+from src.utils.retry import RetryBudget, RetryPolicy, retry_policy
 from unittest.mock import AsyncMock, patch
-from google.api_core.exceptions import RetryError
-
-# test retrying for get entity
-@pytest.mark.asyncio
-async def test_get_entity_retries_stops_on_timeout(mock_service, mock_session):
-    """Test that the method retries on InternalServerError and stops after timeout"""
-    entity = Entity(id="entity_123")
-
-    mock_session.post.side_effect = InternalServerError("Connection timeout")
 
+@pytest.fixture
+def fake_clock():
+    """Patch the retry sleep and make every time.monotonic() call advance the clock by one second"""
     with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
         time = 0
         def fake_monotonic():
@@ -23,186 +19,252 @@ async def test_get_entity_retries_stops_on_timeout(mock_service, mock_session):
             time += 1
             return time
         with patch("time.monotonic", fake_monotonic):
-            with pytest.raises(RetryError) as exc_info:
-                await mock_service.get_entities(entity)
+            yield mock_sleep
+
+@pytest.fixture
+def no_sleep():
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        with patch("time.monotonic", return_value=0):
+            yield mock_sleep
+
+# test retrying for get entity
+@pytest.mark.asyncio
+async def test_get_entity_retries_stops_on_timeout(mock_service, mock_session, fake_clock):
+    """Test that the method retries connection errors and stops after the retry timeout"""
+    entity = Entity(id="entity_123")
+
+    mock_session.post.side_effect = ClientConnectionError("Connection reset")
 
-    assert exc_info.value.args[0] == "Timeout of 10.0s exceeded"
+    with pytest.raises(InternalServerError):
+        await mock_service.get_entities(entity)
 
-    assert mock_session.post.call_count >= 1
-    assert mock_sleep.call_count >= 1
+    assert mock_session.post.call_count >= 2
+    assert fake_clock.call_count >= 1
+    assert retry_policy.stats()["operations"]["entities"]["gave_up"] == 1
 
 @pytest.mark.asyncio
-async def test_get_entity_no_retry_on_bad_request(mock_service, mock_session):
+async def test_get_entity_no_retry_on_bad_request(mock_service, mock_session, no_sleep):
     """Test that BadRequestError does NOT trigger retries"""
     entity = Entity(id="entity_123")
-    
+
     mock_session.post.side_effect = BadRequestError("Bad request error")
-    
-    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-        with patch('time.monotonic', return_value=0):
-            with pytest.raises(BadRequestError):
-                await mock_service.get_entities(entity)
-            
-            assert mock_session.post.call_count == 1
-            assert mock_sleep.call_count == 0
+
+    with pytest.raises(BadRequestError):
+        await mock_service.get_entities(entity)
+
+    assert mock_session.post.call_count == 1
+    assert no_sleep.call_count == 0
 
 @pytest.mark.asyncio
-async def test_get_entity_succeeds_after_retries(mock_service, mock_session):
+async def test_get_entity_no_retry_on_invalid_payload(mock_service, mock_session, no_sleep):
+    """Test that a response that fails validation is not retried"""
+    mock_session.post.return_value = MockResponse({"body": [{"id": ["not", "a", "string"]}]})
+
+    with pytest.raises(InternalServerError):
+        await mock_service.get_entities(Entity(id="entity_123"))
+
+    assert mock_session.post.call_count == 1
+    assert no_sleep.call_count == 0
+
+@pytest.mark.asyncio
+async def test_get_entity_succeeds_after_retries(mock_service, mock_session, no_sleep):
     """Test that the method eventually succeeds after retries"""
     entity = Entity(id="entity_123")
-    
+
     success_response = MockResponse({
         "body": [{"id": "entity_123", "name": "Test Entity"}]
     })
-    
-    mock_session.post.return_value = success_response
 
     mock_session.post.side_effect = [
-        InternalServerError("Network error"),
-        InternalServerError("Network error"),
+        ServerDisconnectedError(),
+        asyncio.TimeoutError(),
         success_response
     ]
-    
-    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-        with patch('time.monotonic', return_value=0):
-            result = await mock_service.get_entities(entity)
-            
-            assert result[0].id == "entity_123"
-            assert result[0].name == "Test Entity"
-            
-            assert mock_session.post.call_count == 3
-            assert mock_sleep.call_count == 2
+
+    result = await mock_service.get_entities(entity)
+
+    assert result[0].id == "entity_123"
+    assert result[0].name == "Test Entity"
+
+    assert mock_session.post.call_count == 3
+    assert no_sleep.call_count == 2
+    assert retry_policy.stats()["operations"]["entities"]["retries"] == 2
 
 # test retrying for fetch relation
 @pytest.mark.asyncio
-async def test_fetch_relation_retries_stops_on_timeout(mock_service, mock_session):
-    """Test that the method retries on InternalServerError and stops after timeout"""
+async def test_fetch_relation_retries_stops_on_timeout(mock_service, mock_session, fake_clock):
+    """Test that the method retries connection errors and stops after the retry timeout"""
     entity_id = "entity_123"
     relation = Relation(id="relation_123",direction=RelationDirectionEnum.OUTGOING.value)
 
-    mock_session.post.side_effect = InternalServerError("Connection timeout")
-
-    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-        time = 0
-        def fake_monotonic():
-            nonlocal time
-            time += 1
-            return time
-        with patch("time.monotonic", fake_monotonic):
-            with pytest.raises(RetryError) as exc_info:
-                await mock_service.fetch_relation(entity_id,relation=relation)
+    mock_session.post.side_effect = ClientConnectionError("Connection reset")
 
-    assert exc_info.value.args[0] == "Timeout of 10.0s exceeded"
+    with pytest.raises(InternalServerError):
+        await mock_service.fetch_relation(entity_id,relation=relation)
 
-    assert mock_session.post.call_count >= 1
-    assert mock_sleep.call_count >= 1
+    assert mock_session.post.call_count >= 2
+    assert fake_clock.call_count >= 1
 
 @pytest.mark.asyncio
-async def test_fetch_relation_no_retry_on_bad_request(mock_service, mock_session):
+async def test_fetch_relation_no_retry_on_bad_request(mock_service, mock_session, no_sleep):
     """Test that BadRequestError does NOT trigger retries"""
     entity_id = "entity_123"
     relation = Relation(id="relation_123",direction=RelationDirectionEnum.OUTGOING.value)
-    
+
     mock_session.post.side_effect = BadRequestError("Bad request error")
-    
-    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-        with patch('time.monotonic', return_value=0):
-            with pytest.raises(BadRequestError):
-                await mock_service.fetch_relation(entity_id, relation=relation)
-            
-            assert mock_session.post.call_count == 1
-            assert mock_sleep.call_count == 0
+
+    with pytest.raises(BadRequestError):
+        await mock_service.fetch_relation(entity_id, relation=relation)
+
+    assert mock_session.post.call_count == 1
+    assert no_sleep.call_count == 0
 
 @pytest.mark.asyncio
-async def test_fetch_relation_succeeds_after_retries(mock_service, mock_session):
+async def test_fetch_relation_succeeds_after_retries(mock_service, mock_session, no_sleep):
     """Test that the method eventually succeeds after retries"""
     entity_id = "entity_123"
     relation = Relation(id="relation_123",direction=RelationDirectionEnum.OUTGOING.value)
-    
+
     success_response = MockResponse([Relation(id="relation_123",name=RelationNameEnum.AS_MINISTER.value,direction=RelationDirectionEnum.OUTGOING.value)])
-    
-    mock_session.post.return_value = success_response
 
     mock_session.post.side_effect = [
-        InternalServerError("Network error"),
-        InternalServerError("Network error"),
+        MockResponse({}, status=503),
+        MockResponse({}, status=502),
         success_response
     ]
-    
-    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-        with patch('time.monotonic', return_value=0):
-            result = await mock_service.fetch_relation(entity_id,relation=relation)
-            
-            result_first_datum = result[0]
-
-            assert result_first_datum.id == "relation_123"
-            assert result_first_datum.name == RelationNameEnum.AS_MINISTER.value
-            assert result_first_datum.direction == RelationDirectionEnum.OUTGOING.value
-            
-            assert mock_session.post.call_count == 3
-            assert mock_sleep.call_count == 2
+
+    result = await mock_service.fetch_relation(entity_id,relation=relation)
+
+    result_first_datum = result[0]
+
+    assert result_first_datum.id == "relation_123"
+    assert result_first_datum.name == RelationNameEnum.AS_MINISTER.value
+    assert result_first_datum.direction == RelationDirectionEnum.OUTGOING.value
+
+    assert mock_session.post.call_count == 3
+    assert no_sleep.call_count == 2
 
 # test retrying for get metadata
 @pytest.mark.asyncio
-async def test_get_metadata_retries_stops_on_timeout(mock_service, mock_session):
-    """Test that the method retries on InternalServerError and stops after timeout"""
+async def test_get_metadata_retries_stops_on_timeout(mock_service, mock_session, fake_clock):
+    """Test that the method retries gateway errors and stops after the retry timeout"""
     category_id = "category_123"
 
-    mock_session.get.side_effect = InternalServerError("Connection timeout")
+    mock_session.get.return_value = MockResponse({}, status=504)
 
-    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-        time = 0
-        def fake_monotonic():
-            nonlocal time
-            time += 1
-            return time
-        with patch("time.monotonic", fake_monotonic):
-            with pytest.raises(RetryError) as exc_info:
-                await mock_service.get_metadata(category_id)
-
-    assert exc_info.value.args[0] == "Timeout of 10.0s exceeded"
+    with pytest.raises(InternalServerError):
+        await mock_service.get_metadata(category_id)
 
-    assert mock_session.get.call_count >= 1
-    assert mock_sleep.call_count >= 1
+    assert mock_session.get.call_count >= 2
+    assert fake_clock.call_count >= 1
 
 @pytest.mark.asyncio
-async def test_get_metadata_no_retry_on_bad_request(mock_service, mock_session):
+async def test_get_metadata_no_retry_on_bad_request(mock_service, mock_session, no_sleep):
     """Test that BadRequestError does NOT trigger retries"""
     category_id = "category_123"
-    
+
     mock_session.get.side_effect = BadRequestError("Bad request error")
-    
-    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-        with patch('time.monotonic', return_value=0):
-            with pytest.raises(BadRequestError):
-                await mock_service.get_metadata(category_id)
-            
-            assert mock_session.get.call_count == 1
-            assert mock_sleep.call_count == 0
+
+    with pytest.raises(BadRequestError):
+        await mock_service.get_metadata(category_id)
+
+    assert mock_session.get.call_count == 1
+    assert no_sleep.call_count == 0
 
 @pytest.mark.asyncio
-async def test_get_metadata_succeeds_after_retries(mock_service, mock_session):
+async def test_get_metadata_no_retry_on_server_error(mock_service, mock_session, no_sleep):
+    """Test that a 500 response is not treated as transient"""
+    mock_session.get.return_value = MockResponse({}, status=500)
+
+    with pytest.raises(InternalServerError):
+        await mock_service.get_metadata("category_123")
+
+    assert mock_session.get.call_count == 1
+    assert no_sleep.call_count == 0
+
+@pytest.mark.asyncio
+async def test_get_metadata_succeeds_after_retries(mock_service, mock_session, no_sleep):
     """Test that the method eventually succeeds after retries"""
     category_id = "category_123"
-    
+
     success_response = MockResponse({"key1": "value1", "key2": "value2"})
-    
-    mock_session.get.return_value = success_response
 
     mock_session.get.side_effect = [
-        InternalServerError("Network error"),
-        InternalServerError("Network error"),
+        ClientConnectionError("Connection reset"),
+        ClientConnectionError("Connection reset"),
         success_response
     ]
-    
-    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-        with patch('time.monotonic', return_value=0):
-            result = await mock_service.get_metadata(category_id)
-            
-            assert result["key1"] == "value1"
-            assert result["key2"] == "value2"   
-            
-            assert mock_session.get.call_count == 3
-            assert mock_sleep.call_count == 2
-            
 
+    result = await mock_service.get_metadata(category_id)
+
+    assert result["key1"] == "value1"
+    assert result["key2"] == "value2"
+
+    assert mock_session.get.call_count == 3
+    assert no_sleep.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_metadata_honours_retry_after(mock_service, mock_session, no_sleep):
+    """Test that a 429 response is retried after the delay from its Retry-After header"""
+    mock_session.get.side_effect = [
+        MockResponse({}, status=429, headers={"Retry-After": "3"}),
+        MockResponse({"key1": "value1"})
+    ]
+
+    result = await mock_service.get_metadata("category_123")
+
+    assert result == {"key1": "value1"}
+    no_sleep.assert_awaited_once_with(3.0)
+
+@pytest.mark.asyncio
+async def test_get_metadata_gives_up_when_retry_after_exceeds_timeout(mock_service, mock_session, no_sleep):
+    mock_session.get.return_value = MockResponse({}, status=429, headers={"Retry-After": "120"})
+
+    with pytest.raises(InternalServerError):
+        await mock_service.get_metadata("category_123")
+
+    assert mock_session.get.call_count == 1
+    assert no_sleep.call_count == 0
+
+# RetryPolicy
+def create_policy(ratio=0.1, max_tokens=10):
+    return RetryPolicy(initial=1.0, maximum=6.0, multiplier=2.0, timeout=10.0, budget=RetryBudget(ratio=ratio, max_tokens=max_tokens))
+
+def test_backoff_uses_full_jitter():
+    policy = create_policy()
+
+    with patch("random.uniform", side_effect=lambda low, high: high) as mock_uniform:
+        assert [policy.backoff(attempt) for attempt in range(5)] == [1.0, 2.0, 4.0, 6.0, 6.0]
+
+    mock_uniform.assert_called_with(0, 6.0)
+
+@pytest.mark.asyncio
+async def test_retry_budget_limits_retries(no_sleep):
+    policy = create_policy(ratio=0.5, max_tokens=1)
+    fn = AsyncMock(side_effect=ClientConnectionError("Connection reset"))
+
+    with pytest.raises(ClientConnectionError):
+        await policy.run("entities", fn)
+
+    # the single token allows one retry, then the budget is exhausted
+    assert fn.call_count == 2
+    assert policy.stats()["operations"]["entities"] == {"calls": 1, "retries": 1, "budget_exhausted": 1, "gave_up": 0}
+
+    fn.reset_mock()
+    with pytest.raises(ClientConnectionError):
+        await policy.run("entities", fn)
+
+    assert fn.call_count == 1
+
+def test_transient_cause_follows_the_exception_chain():
+    try:
+        try:
+            raise ServerDisconnectedError()
+        except Exception as e:
+            raise InternalServerError("An unexpected error occurred") from e
+    except InternalServerError as e:
+        wrapped = e
+
+    assert isinstance(RetryPolicy.transient_cause(wrapped), ServerDisconnectedError)
+    assert RetryPolicy.transient_cause(InternalServerError("An unexpected error occurred")) is None
+    assert RetryPolicy.transient_cause(ValueError("bug")) is None
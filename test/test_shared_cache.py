@@ -0,0 +1,159 @@
+import sqlite3
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from src.models.organisation_schemas import Entity, Kind, Relation
+from src.models.projection import EntityProjection
+from src.utils.shared_cache import SharedCache, decode_value, encode_value
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+# Tests for the value encoding
+def test_entities_round_trip_through_the_encoding():
+    entities = [Entity(id="entity_123", name="Test Entity", kind=Kind(major="Organisation", minor="minister"))]
+
+    assert decode_value(encode_value(entities)) == entities
+
+def test_projected_entities_round_trip_into_their_projection():
+    projection = EntityProjection.of("name", "kind.minor")
+    projected = [projection.project(Entity(id="entity_123", name="Test Entity", kind=Kind(major="Organisation", minor="minister")))]
+
+    decoded = decode_value(encode_value(projected))
+
+    assert type(decoded[0]) is projection.model
+    assert decoded[0].model_dump() == projected[0].model_dump()
+
+def test_plain_data_round_trips_through_the_encoding():
+    dataset = {"columns": ["year"], "rows": [[2020]]}
+
+    assert decode_value(encode_value(dataset)) == dataset
+    assert decode_value(encode_value([])) == []
+
+def test_unknown_models_are_not_encoded():
+    with pytest.raises(TypeError):
+        encode_value([EntityProjection.of("name")])
+
+# Tests for SharedCache
+def test_shared_cache_serves_entries_to_other_workers(cache_path):
+    worker_a = SharedCache("relations", max_entries=10, ttl=60, path=cache_path)
+    worker_b = SharedCache("relations", max_entries=10, ttl=60, path=cache_path)
+    worker_a.set("president_1:AS_MINISTER", [Relation(relatedEntityId="minister_1", name="AS_MINISTER")])
+
+    assert worker_b.get("president_1:AS_MINISTER") == [Relation(relatedEntityId="minister_1", name="AS_MINISTER")]
+    assert worker_b.stats()["hits"] == 1
+    assert worker_a.stats()["hits"] == 0
+
+def test_shared_cache_entries_are_separate_per_cache_name(cache_path):
+    SharedCache("entities", max_entries=10, ttl=60, path=cache_path).set("key", {"a": 1})
+
+    assert SharedCache("datasets", max_entries=10, ttl=60, path=cache_path).get("key") is None
+
+def test_shared_cache_entry_expires_after_ttl(cache_path):
+    cache = SharedCache("test", max_entries=10, ttl=60, path=cache_path)
+
+    with patch("src.utils.shared_cache.time.time", return_value=100):
+        cache.set("key", {"a": 1})
+    with patch("src.utils.shared_cache.time.time", return_value=159):
+        assert cache.get("key") == {"a": 1}
+    with patch("src.utils.shared_cache.time.time", return_value=161):
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+def test_shared_cache_evicts_least_recently_used(cache_path):
+    cache = SharedCache("test", max_entries=2, ttl=600, path=cache_path, touch_interval=0)
+
+    with patch("src.utils.shared_cache.time.time", return_value=100):
+        cache.set("a", 1)
+    with patch("src.utils.shared_cache.time.time", return_value=101):
+        cache.set("b", 2)
+    with patch("src.utils.shared_cache.time.time", return_value=102):
+        cache.get("a")
+    with patch("src.utils.shared_cache.time.time", return_value=103):
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    assert cache.stats()["evictions"] == 1
+
+def test_shared_cache_evicts_every_evict_interval_writes(cache_path):
+    cache = SharedCache("test", max_entries=2, ttl=600, path=cache_path, evict_interval=3)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert len(cache) == 2
+
+    cache.set("d", 4)
+    cache.set("e", 5)
+    assert len(cache) == 4
+
+def test_shared_cache_locked_database_is_a_miss_without_waiting(cache_path):
+    cache = SharedCache("test", max_entries=10, ttl=60, path=cache_path, busy_timeout=0.05)
+    cache.set("key", 1)
+
+    # another worker holding the write lock
+    other_worker = sqlite3.connect(cache_path, isolation_level=None)
+    other_worker.execute("BEGIN EXCLUSIVE")
+    try:
+        started_at = time.monotonic()
+        cache.set("key", 2)
+        assert time.monotonic() - started_at < 1
+    finally:
+        other_worker.execute("ROLLBACK")
+        other_worker.close()
+
+    assert cache.get("key") == 1
+    assert cache.stats()["errors"] > 0
+
+@pytest.mark.asyncio
+async def test_shared_cache_async_access_runs_off_the_event_loop(cache_path):
+    cache = SharedCache("test", max_entries=10, ttl=60, path=cache_path)
+    threads = set()
+    execute = cache._execute
+
+    def recording_execute(*args):
+        threads.add(threading.get_ident())
+        return execute(*args)
+
+    with patch.object(cache, "_execute", side_effect=recording_execute):
+        await cache.aset("key", {"a": 1})
+        assert await cache.aget("key") == {"a": 1}
+
+    assert threads and threading.get_ident() not in threads
+
+def test_shared_cache_clear_removes_entries_for_every_worker(cache_path):
+    worker_a = SharedCache("test", max_entries=10, ttl=60, path=cache_path)
+    worker_b = SharedCache("test", max_entries=10, ttl=60, path=cache_path)
+    worker_a.set("key", 1)
+
+    worker_b.clear()
+
+    assert worker_a.get("key") is None
+
+def test_shared_cache_error_is_a_miss(tmp_path):
+    # the database path is a directory, so it can never be opened
+    cache = SharedCache("test", max_entries=10, ttl=60, path=str(tmp_path))
+
+    cache.set("key", 1)
+
+    assert cache.get("key") is None
+    assert cache.stats()["errors"] > 0
+
+def test_shared_cache_delete_where_removes_matching_entries_for_every_worker(cache_path):
+    worker_a = SharedCache("entities", max_entries=10, ttl=60, path=cache_path)
+    worker_b = SharedCache("entities", max_entries=10, ttl=60, path=cache_path)
+    worker_a.set("dep_1", [Entity(id="dep_1")])
+    worker_a.set("dep_2", [Entity(id="dep_2")])
+
+    removed = worker_b.delete_where(lambda key, value: value[0].id == "dep_1")
+
+    assert removed == ["dep_1"]
+    assert worker_a.get("dep_1") is None
+    assert worker_a.get("dep_2") is not None
+    assert worker_a.top_keys(5) == [{"key": "dep_2", "hits": 1}]
+    assert worker_a.memory_bytes() > 0
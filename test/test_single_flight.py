@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from src.enums import PriorityEnum
+from src.utils.priority import request_priority
+from src.utils.single_flight import SingleFlight
+from src.exception.exceptions import InternalServerError
+
+# Tests for SingleFlight
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent callers with the same key share one execution"""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+
+    key = SingleFlight.make_key("POST", "http://opengin/v1/entities/search", {"id": "entity_123"})
+    waiters = [asyncio.create_task(single_flight.do(key, fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert single_flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 4}
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_every_waiter():
+    """Test that an upstream error is raised to all coalesced callers"""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise InternalServerError("An unexpected error occurred")
+
+    waiters = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, InternalServerError) for result in results)
+    assert single_flight.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_single_flight_runs_again_after_completion():
+    """Test that a finished call is not reused for later callers"""
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await single_flight.do("key", fetch) == 1
+    assert await single_flight.do("key", fetch) == 2
+    assert single_flight.coalesced == 0
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_caller_does_not_cancel_shared_call():
+    """Test that cancelling one caller leaves the shared call running for the others"""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "result"
+
+    first = asyncio.create_task(single_flight.do("key", fetch))
+    second = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+@pytest.mark.asyncio
+async def test_single_flight_does_not_coalesce_across_priorities():
+    """Test that an interactive caller does not wait on a call running at background priority"""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch(name):
+        calls.append(name)
+        await release.wait()
+        return name
+
+    with request_priority(PriorityEnum.BACKGROUND):
+        background = asyncio.create_task(single_flight.do("key", fetch, "background"))
+    interactive = asyncio.create_task(single_flight.do("key", fetch, "interactive"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(background, interactive) == ["background", "interactive"]
+    assert calls == ["background", "interactive"]
+
+def test_make_key_is_independent_of_payload_order():
+    first = SingleFlight.make_key("post", "url", {"id": "1", "name": "x"})
+    second = SingleFlight.make_key("POST", "url", {"name": "x", "id": "1"})
+
+    assert first == second
@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.enums import PriorityEnum
+from src.services.warmup_service import WarmupService
+from src.utils.priority import current_priority
+from src.utils.readiness import readiness
+from src.utils.response_cache import response_cache
+
+PRESIDENTS = {
+    "presidents": [
+        {"id": "president_2", "name": "Current", "terms": [{"start": "2024-09-23", "end": None, "gazettes_published": []}]},
+        {"id": "president_1", "name": "Former", "terms": [{"start": "2019-11-18", "end": "2022-07-14", "gazettes_published": []}]},
+    ]
+}
+
+
+@pytest.fixture
+def warmup_service():
+    service = WarmupService(MagicMock())
+    service.person_service.fetch_all_presidents = AsyncMock(return_value=PRESIDENTS)
+    service.organisation_service.active_portfolio_list = AsyncMock(return_value={})
+    service.organisation_service.fetch_prime_minister = AsyncMock(return_value={})
+    service.data_service.fetch_data_catalog = AsyncMock(return_value={})
+    return service
+
+@pytest.mark.asyncio
+async def test_warmup_preloads_the_hot_views_and_marks_ready(warmup_service):
+    with patch("src.services.warmup_service.date") as mock_date:
+        mock_date.today.return_value.isoformat.return_value = "2026-01-01"
+        await warmup_service.run()
+
+    warmup_service.organisation_service.active_portfolio_list.assert_awaited_once_with("president_2", "2026-01-01")
+    warmup_service.organisation_service.fetch_prime_minister.assert_awaited_once_with("2026-01-01")
+    warmup_service.data_service.fetch_data_catalog.assert_awaited_once_with()
+    assert readiness.ready
+    assert set(readiness.stats()["warmup_steps"]) == {"presidents", "prime_minister", "data_catalog", "current_cabinet"}
+
+@pytest.mark.asyncio
+async def test_failed_step_does_not_stop_the_warmup(warmup_service):
+    warmup_service.organisation_service.fetch_prime_minister.side_effect = RuntimeError("OpenGIN down")
+
+    await warmup_service.run()
+
+    steps = readiness.stats()["warmup_steps"]
+    assert steps["prime_minister"]["ok"] is False
+    assert steps["prime_minister"]["error"] == "OpenGIN down"
+    assert steps["current_cabinet"]["ok"] is True
+    assert readiness.ready
+
+@pytest.mark.asyncio
+async def test_cabinet_is_skipped_without_a_president_in_office(warmup_service):
+    warmup_service.person_service.fetch_all_presidents.side_effect = RuntimeError("OpenGIN down")
+
+    await warmup_service.run()
+
+    warmup_service.organisation_service.active_portfolio_list.assert_not_awaited()
+    assert readiness.ready
+
+@pytest.mark.asyncio
+async def test_background_warmup_runs_at_background_priority(warmup_service):
+    seen = []
+    warmup_service.data_service.fetch_data_catalog = AsyncMock(side_effect=lambda: seen.append(current_priority()))
+
+    await warmup_service.run(PriorityEnum.BACKGROUND)
+
+    assert seen == [PriorityEnum.BACKGROUND]
+
+@pytest.mark.asyncio
+async def test_warmup_fills_the_all_presidents_response_cache(warmup_service):
+    await warmup_service.run()
+
+    assert response_cache.cache.get("/v1/person/all-presidents")["value"] == PRESIDENTS